@@ -0,0 +1,103 @@
+"""Partition post_metrics by month
+
+Revision ID: 1b6e0d7f4c25
+Revises: f3a8c1d92b47
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '1b6e0d7f4c25'
+down_revision = 'f3a8c1d92b47'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    'post_id, platform, likes, comments, shares, saves, impressions, reach, '
+    'click_through_rate, engagement_rate, id, created_at, updated_at'
+)
+
+
+def _metrics_columns(collected_at_nullable):
+    return [
+        sa.Column('post_id', sa.String(length=100), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+        sa.Column('likes', sa.Integer(), nullable=True),
+        sa.Column('comments', sa.Integer(), nullable=True),
+        sa.Column('shares', sa.Integer(), nullable=True),
+        sa.Column('saves', sa.Integer(), nullable=True),
+        sa.Column('impressions', sa.Integer(), nullable=True),
+        sa.Column('reach', sa.Integer(), nullable=True),
+        sa.Column('click_through_rate', sa.Float(), nullable=True),
+        sa.Column('engagement_rate', sa.Float(), nullable=True),
+        sa.Column('collected_at', sa.DateTime(), nullable=collected_at_nullable),
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.rename_table('post_metrics', 'post_metrics_unpartitioned')
+    op.execute('ALTER TABLE post_metrics_unpartitioned RENAME CONSTRAINT post_metrics_pkey TO post_metrics_unpartitioned_pkey')
+
+    op.create_table(
+        'post_metrics',
+        *_metrics_columns(collected_at_nullable=False),
+        sa.PrimaryKeyConstraint('collected_at', 'id'),
+        postgresql_partition_by='RANGE (collected_at)',
+    )
+    op.execute('CREATE TABLE post_metrics_default PARTITION OF post_metrics DEFAULT')
+    # One partition per month of existing data, through two months ahead
+    op.execute("""
+        DO $$
+        DECLARE partition_month date;
+        BEGIN
+            FOR partition_month IN
+                SELECT generate_series(
+                    date_trunc('month', coalesce(
+                        (SELECT min(coalesce(collected_at, created_at)) FROM post_metrics_unpartitioned),
+                        now()
+                    )),
+                    date_trunc('month', now()) + interval '2 months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF post_metrics FOR VALUES FROM (%L) TO (%L)',
+                    'post_metrics_' || to_char(partition_month, 'YYYY_MM'),
+                    partition_month,
+                    partition_month + interval '1 month'
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"""
+        INSERT INTO post_metrics ({COLUMNS}, collected_at)
+        SELECT {COLUMNS}, coalesce(collected_at, created_at, now())
+        FROM post_metrics_unpartitioned
+    """)
+    op.drop_table('post_metrics_unpartitioned')
+
+    op.execute('CREATE INDEX ix_post_metrics_post_id_collected_at ON post_metrics (post_id, collected_at DESC)')
+
+
+def downgrade() -> None:
+    op.rename_table('post_metrics', 'post_metrics_partitioned')
+    op.create_table(
+        'post_metrics_unpartitioned',
+        *_metrics_columns(collected_at_nullable=True),
+        sa.PrimaryKeyConstraint('id', name='post_metrics_unpartitioned_pkey'),
+    )
+    op.execute(f"""
+        INSERT INTO post_metrics_unpartitioned ({COLUMNS}, collected_at)
+        SELECT {COLUMNS}, collected_at FROM post_metrics_partitioned
+    """)
+    # Dropping the parent drops every partition with it
+    op.drop_table('post_metrics_partitioned')
+    op.rename_table('post_metrics_unpartitioned', 'post_metrics')
+    op.execute('ALTER TABLE post_metrics RENAME CONSTRAINT post_metrics_unpartitioned_pkey TO post_metrics_pkey')
@@ -0,0 +1,37 @@
+"""Content pipeline idempotency keys and rendered images
+
+Revision ID: 5d2c8e9a1f60
+Revises: 1b6e0d7f4c25
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2c8e9a1f60'
+down_revision = '1b6e0d7f4c25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('generated_content', sa.Column('idempotency_key', sa.String(length=100), nullable=True))
+    op.add_column('generated_content', sa.Column('image_path', sa.String(length=500), nullable=True))
+    # Build the unique index without blocking writes, then adopt it as the constraint
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_generated_content_idempotency_key', 'generated_content', ['idempotency_key'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+    op.execute(
+        'ALTER TABLE generated_content ADD CONSTRAINT uq_generated_content_idempotency_key '
+        'UNIQUE USING INDEX uq_generated_content_idempotency_key'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_generated_content_idempotency_key', 'generated_content', type_='unique')
+    op.drop_column('generated_content', 'image_path')
+    op.drop_column('generated_content', 'idempotency_key')
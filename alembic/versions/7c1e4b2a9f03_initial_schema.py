@@ -0,0 +1,130 @@
+"""Initial schema
+
+Revision ID: 7c1e4b2a9f03
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4b2a9f03'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _base_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'trend_opportunities',
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=True),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('metadata', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        *_base_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_trend_opportunities_status_score', 'trend_opportunities', ['status', 'score'])
+
+    op.create_table(
+        'content_packages',
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('scheduled_date', sa.DateTime(), nullable=True),
+        *_base_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'generated_content',
+        sa.Column('trend_opportunity_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('content_type', sa.String(length=50), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('package_id', postgresql.UUID(as_uuid=False), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['package_id'], ['content_packages.id']),
+        sa.ForeignKeyConstraint(['trend_opportunity_id'], ['trend_opportunities.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'content_calendar',
+        sa.Column('scheduled_date', sa.DateTime(), nullable=False),
+        sa.Column('content_theme', sa.String(length=50), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('content_pillar', sa.String(length=50), nullable=True),
+        sa.Column('package_id', postgresql.UUID(as_uuid=False), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['package_id'], ['content_packages.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'post_metrics',
+        sa.Column('post_id', sa.String(length=100), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+        sa.Column('likes', sa.Integer(), nullable=True),
+        sa.Column('comments', sa.Integer(), nullable=True),
+        sa.Column('shares', sa.Integer(), nullable=True),
+        sa.Column('saves', sa.Integer(), nullable=True),
+        sa.Column('impressions', sa.Integer(), nullable=True),
+        sa.Column('reach', sa.Integer(), nullable=True),
+        sa.Column('click_through_rate', sa.Float(), nullable=True),
+        sa.Column('engagement_rate', sa.Float(), nullable=True),
+        sa.Column('collected_at', sa.DateTime(), nullable=True),
+        *_base_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'comments',
+        sa.Column('post_id', sa.String(length=100), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+        sa.Column('author', sa.String(length=100), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('category', sa.String(length=20), nullable=False),
+        sa.Column('sentiment', sa.Float(), nullable=True),
+        *_base_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'response_suggestions',
+        sa.Column('comment_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('suggested_response', sa.Text(), nullable=False),
+        sa.Column('response_type', sa.String(length=20), nullable=False),
+        sa.Column('confidence_score', sa.Float(), nullable=False),
+        sa.Column('template_used', sa.String(length=50), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['comment_id'], ['comments.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('response_suggestions')
+    op.drop_table('comments')
+    op.drop_table('post_metrics')
+    op.drop_table('content_calendar')
+    op.drop_table('generated_content')
+    op.drop_table('content_packages')
+    op.drop_index('ix_trend_opportunities_status_score', table_name='trend_opportunities')
+    op.drop_table('trend_opportunities')
@@ -0,0 +1,41 @@
+"""Content listing indexes
+
+Revision ID: a4d93e61c2b8
+Revises: 7c1e4b2a9f03
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d93e61c2b8'
+down_revision = '7c1e4b2a9f03'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_generated_content_status_created_at', ['status', 'created_at', 'id']),
+    ('ix_generated_content_created_at', ['created_at', 'id']),
+    ('ix_generated_content_trend_opportunity_id', ['trend_opportunity_id']),
+]
+
+
+def upgrade() -> None:
+    # Build without blocking writes; CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name, 'generated_content', columns,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(
+                name, table_name='generated_content',
+                postgresql_concurrently=True, if_exists=True,
+            )
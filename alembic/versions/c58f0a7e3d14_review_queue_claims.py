@@ -0,0 +1,39 @@
+"""Review queue claims
+
+Revision ID: c58f0a7e3d14
+Revises: a4d93e61c2b8
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c58f0a7e3d14'
+down_revision = 'a4d93e61c2b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('generated_content', sa.Column('claimed_by', sa.String(length=100), nullable=True))
+    op.add_column('generated_content', sa.Column('claim_expires_at', sa.DateTime(), nullable=True))
+
+    # Partial index: claiming scans only rows awaiting review, in queue order
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_generated_content_review_queue', 'generated_content', ['created_at', 'id'],
+            postgresql_where=sa.text("status = 'generated'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_generated_content_review_queue', table_name='generated_content',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('generated_content', 'claim_expires_at')
+    op.drop_column('generated_content', 'claimed_by')
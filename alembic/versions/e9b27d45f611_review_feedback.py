@@ -0,0 +1,28 @@
+"""Review feedback
+
+Revision ID: e9b27d45f611
+Revises: c58f0a7e3d14
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b27d45f611'
+down_revision = 'c58f0a7e3d14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('generated_content', sa.Column('reviewed_by', sa.String(length=100), nullable=True))
+    op.add_column('generated_content', sa.Column('reviewed_at', sa.DateTime(), nullable=True))
+    op.add_column('generated_content', sa.Column('review_feedback', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('generated_content', 'review_feedback')
+    op.drop_column('generated_content', 'reviewed_at')
+    op.drop_column('generated_content', 'reviewed_by')
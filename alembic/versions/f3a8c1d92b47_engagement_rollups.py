@@ -0,0 +1,78 @@
+"""Engagement rollups
+
+Revision ID: f3a8c1d92b47
+Revises: e9b27d45f611
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8c1d92b47'
+down_revision = 'e9b27d45f611'
+branch_labels = None
+depends_on = None
+
+ROLLUPS = (('post_metrics_hourly', 'hour'), ('post_metrics_daily', 'day'))
+COUNTERS = ('likes', 'comments', 'shares', 'saves', 'impressions', 'reach')
+
+
+def _rollup_columns():
+    return [
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+        sa.Column('post_id', sa.String(length=100), nullable=False),
+        sa.Column('content_id', postgresql.UUID(as_uuid=False), nullable=True),
+        sa.Column('content_type', sa.String(length=50), nullable=True),
+        *[sa.Column(counter, sa.Integer(), nullable=False) for counter in COUNTERS],
+        sa.Column('engagement_rate', sa.Float(), nullable=False),
+        sa.Column('snapshots', sa.Integer(), nullable=False),
+        sa.Column('last_collected_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('bucket_start', 'platform', 'post_id'),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'published_posts',
+        sa.Column('content_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+        sa.Column('post_id', sa.String(length=100), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=True),
+        sa.Column('published_at', sa.DateTime(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['content_id'], ['generated_content.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('platform', 'post_id', name='uq_published_posts_platform_post_id'),
+    )
+    op.create_index('ix_published_posts_content_id', 'published_posts', ['content_id'])
+
+    for table, granularity in ROLLUPS:
+        op.create_table(table, *_rollup_columns())
+        # Backfill from existing snapshots: newest per post per bucket
+        bucket = f"date_trunc('{granularity}', collected_at)"
+        counters = ', '.join(f'coalesce({counter}, 0)' for counter in COUNTERS)
+        op.execute(f"""
+            INSERT INTO {table} (bucket_start, platform, post_id, {', '.join(COUNTERS)},
+                                 engagement_rate, snapshots, last_collected_at)
+            SELECT DISTINCT ON ({bucket}, platform, post_id)
+                   {bucket}, platform, post_id, {counters},
+                   coalesce(engagement_rate, 0),
+                   count(*) OVER (PARTITION BY {bucket}, platform, post_id),
+                   collected_at
+            FROM post_metrics
+            WHERE collected_at IS NOT NULL
+            ORDER BY {bucket}, platform, post_id, collected_at DESC
+        """)
+
+
+def downgrade() -> None:
+    for table, _ in reversed(ROLLUPS):
+        op.drop_table(table)
+    op.drop_index('ix_published_posts_content_id', table_name='published_posts')
+    op.drop_table('published_posts')
@@ -4,11 +4,12 @@ Main API router for v1 endpoints.
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import trends, content, review, analytics
+from app.api.v1.endpoints import trends, content, review, analytics, profiles
 
 api_router = APIRouter()
 
 api_router.include_router(trends.router, prefix="/trends", tags=["trends"])
 api_router.include_router(content.router, prefix="/content", tags=["content"])
 api_router.include_router(review.router, prefix="/review", tags=["review"])
-api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
\ No newline at end of file
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
\ No newline at end of file
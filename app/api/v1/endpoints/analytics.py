@@ -2,42 +2,111 @@
 Analytics and performance tracking API endpoints.
 """
 
-from fastapi import APIRouter, Depends
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.response_cache import METRICS, cache_response
+from app.schemas.analytics import (
+    ContentPerformance,
+    MetricsIngestRequest,
+    MetricsIngestResponse,
+    PerformanceBatchRequest,
+    PerformanceBatchResponse,
+)
+from app.services.content_performance import ContentPerformanceService
+from app.services.metrics_ingestion import MetricsIngestionService
+from app.services.metrics_rollup import MetricsRollupService, parse_timeframe
 
 router = APIRouter()
 
 
+def _window(timeframe: str) -> timedelta:
+    try:
+        return parse_timeframe(timeframe)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/dashboard")
+@cache_response(ttl=settings.ANALYTICS_CACHE_TTL_SECONDS, tags=[METRICS])
 async def get_analytics_dashboard(
     timeframe: str = "7d",
+    platform: Optional[str] = None,
+    content_type: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get analytics dashboard data."""
-    return {
-        "total_posts": 0,
-        "total_engagement": 0,
-        "average_engagement_rate": 0.0,
-        "top_performing_content": [],
-        "engagement_trends": []
-    }
+    """
+    Get analytics dashboard data for a trailing timeframe such as 24h, 7d or 4w.
+
+    Reads the hourly rollups for windows up to 48h and the daily rollups
+    beyond that, never the raw metrics snapshots.
+    """
+    return await MetricsRollupService(db).dashboard(_window(timeframe), platform, content_type)
 
 
-@router.get("/performance/{content_id}")
+@router.get("/top-content")
+@cache_response(ttl=settings.ANALYTICS_CACHE_TTL_SECONDS, tags=[METRICS])
+async def get_top_content(
+    timeframe: str = "7d",
+    limit: int = Query(10, ge=1, le=100),
+    sort: str = Query("engagement_rate", pattern="^(engagement_rate|engagement)$"),
+    platform: Optional[str] = None,
+    content_type: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the best performing posts in a timeframe, from the rollups."""
+    return await MetricsRollupService(db).top_content(_window(timeframe), limit, sort, platform, content_type)
+
+
+@router.get("/performance/{content_id}", response_model=ContentPerformance)
 async def get_content_performance(
-    content_id: str,
+    content_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get performance metrics for specific content."""
+    """
+    Get the latest metrics for a content piece, summed over its published posts.
+
+    Unpublished content reports zeros. Served from a cache that metrics
+    ingestion keeps current.
+    """
+    performance = await ContentPerformanceService(db).get(str(content_id))
+    if performance is None:
+        raise HTTPException(status_code=404, detail="Content not found")
+    return performance
+
+
+@router.post("/performance/batch", response_model=PerformanceBatchResponse)
+async def get_content_performance_batch(
+    request: PerformanceBatchRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the latest metrics for many content pieces with at most one query."""
+    content_ids = [str(content_id) for content_id in request.content_ids]
+    found = await ContentPerformanceService(db).get_many(content_ids)
     return {
-        "content_id": content_id,
-        "metrics": {
-            "likes": 0,
-            "comments": 0,
-            "shares": 0,
-            "saves": 0,
-            "engagement_rate": 0.0
-        }
-    }
\ No newline at end of file
+        "items": [found[content_id] for content_id in content_ids if content_id in found],
+        "missing": [content_id for content_id in content_ids if content_id not in found],
+    }
+
+
+@router.post("/metrics", response_model=MetricsIngestResponse)
+async def ingest_metrics(
+    request: MetricsIngestRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Ingest a batch of collected metrics snapshots.
+
+    Unchanged snapshots are skipped; the rest are bulk inserted and folded
+    into the engagement rollups in one transaction. Reports throughput.
+    """
+    result = await MetricsIngestionService(db).ingest(
+        snapshot.model_dump() for snapshot in request.snapshots
+    )
+    return asdict(result)
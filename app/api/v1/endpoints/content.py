@@ -2,19 +2,43 @@
 Content generation and management API endpoints.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import FileResponse
+from sqlalchemy import literal, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 import tempfile
 import os
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.response_cache import CONTENT, REVIEW, cache_response, invalidate
+from app.core.responses import ORJSONResponse, validate_rows
 from app.services.content_generator import ContentGeneratorService
+from app.services.dedup_index import DuplicateContentError, DuplicateMatch
 from app.services.image_generator import ImageGeneratorService
+from app.services.review_queue import (
+    BulkResult,
+    ContentNotFoundError,
+    ReviewConflictError,
+    ReviewQueueService,
+)
 from app.models.trend_opportunity import TrendOpportunity
 from app.models.generated_content import GeneratedContent
-from app.schemas.content import ContentGenerationRequest, ContentResponse
+from app.schemas.content import (
+    BulkItemResult,
+    BulkReviewRequest,
+    BulkReviewResponse,
+    BulkStatusRequest,
+    ContentGenerationRequest,
+    ContentListItem,
+    ContentPackageResponse,
+    ContentPage,
+    ContentResponse,
+    ContentVariantsRequest,
+)
 
 router = APIRouter()
 
@@ -32,19 +56,94 @@ async def generate_content(
     
     # Generate content
     content_service = ContentGeneratorService()
-    generated_content = await content_service.generate_content(
-        trend, 
-        request.content_type
-    )
+    try:
+        generated_content = await content_service.generate_content(
+            trend, 
+            request.content_type,
+            allow_duplicate=request.allow_duplicate,
+            platform=request.platform,
+        )
+    except DuplicateContentError as e:
+        existing = None
+        if settings.DEDUP_ACTION == "merge":
+            existing = await _find_existing_content(db, e.match)
+        if existing is None:
+            raise _duplicate_conflict(e)
+        return ContentResponse.from_orm(existing)
     
     # Save to database
     db.add(generated_content)
     await db.commit()
+    await invalidate(CONTENT, REVIEW)
     await db.refresh(generated_content)
     
     return ContentResponse.from_orm(generated_content)
 
 
+@router.post("/generate-variants", response_model=ContentPackageResponse)
+async def generate_content_variants(
+    request: ContentVariantsRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Generate one variant per platform from a single LLM call, grouped in a package."""
+    trend = await db.get(TrendOpportunity, request.trend_opportunity_id)
+    if not trend:
+        raise HTTPException(status_code=404, detail="Trend opportunity not found")
+    
+    content_service = ContentGeneratorService()
+    try:
+        package = await content_service.generate_variants(
+            trend,
+            request.platforms,
+            request.content_type,
+            allow_duplicate=request.allow_duplicate,
+        )
+    except DuplicateContentError as e:
+        raise _duplicate_conflict(e)
+    
+    # Package and its variants are inserted in one flush
+    variants = list(package.generated_content)
+    db.add(package)
+    await db.commit()
+    await invalidate(CONTENT, REVIEW)
+    
+    return ContentPackageResponse(
+        id=package.id,
+        title=package.title,
+        description=package.description,
+        status=package.status,
+        content=[ContentResponse.from_orm(c) for c in variants],
+        created_at=package.created_at,
+        updated_at=package.updated_at,
+    )
+
+
+def _duplicate_conflict(e: DuplicateContentError) -> HTTPException:
+    """Build the 409 response for a skipped near-duplicate."""
+    return HTTPException(
+        status_code=409,
+        detail={
+            "message": str(e),
+            "duplicate_of": {"kind": e.match.kind, "id": e.match.id},
+            "similarity": e.match.similarity,
+        },
+    )
+
+
+async def _find_existing_content(db: AsyncSession, match: DuplicateMatch):
+    """Load the content a duplicate match points at, if it still exists."""
+    if match.kind == "content":
+        return await db.get(GeneratedContent, match.id)
+    
+    result = await db.execute(
+        select(GeneratedContent)
+        .where(GeneratedContent.trend_opportunity_id == match.id)
+        .order_by(GeneratedContent.created_at.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 @router.post("/generate-image/{content_id}")
 async def generate_image(
     content_id: str,
@@ -71,35 +170,84 @@ async def generate_image(
         )
 
 
-@router.get("/", response_model=List[ContentResponse])
+# Columns returned by the listing; text is opt-in so pages don't pull large blobs
+LISTING_COLUMNS: Tuple[InstrumentedAttribute[Any], ...] = (
+    GeneratedContent.id,
+    GeneratedContent.trend_opportunity_id,
+    GeneratedContent.content_type,
+    GeneratedContent.platform,
+    GeneratedContent.status,
+    GeneratedContent.package_id,
+    GeneratedContent.created_at,
+    GeneratedContent.updated_at,
+)
+
+
+@router.get("/", response_model=ContentPage)
+@cache_response(ttl=settings.CONTENT_LIST_CACHE_TTL_SECONDS, tags=[CONTENT])
 async def get_content(
-    status: str = None,
-    limit: int = 10,
+    status: Optional[str] = None,
+    platform: Optional[str] = None,
+    content_type: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_text: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get generated content."""
-    query = db.query(GeneratedContent)
+    """
+    Get generated content, newest first.
+    
+    Pass next_cursor from the previous page as cursor to continue. Pages
+    seek on (created_at, id), so deep pages cost the same as the first.
+    """
+    columns = LISTING_COLUMNS + ((GeneratedContent.text,) if include_text else ())
+    query = select(*columns).order_by(
+        GeneratedContent.created_at.desc(),
+        GeneratedContent.id.desc(),
+    )
     
     if status:
-        query = query.filter(GeneratedContent.status == status)
+        query = query.where(GeneratedContent.status == status)
+    if platform:
+        query = query.where(GeneratedContent.platform == platform)
+    if content_type:
+        query = query.where(GeneratedContent.content_type == content_type)
+    if cursor:
+        try:
+            created_at, row_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Typed binds, so Postgres compares against the uuid/timestamp columns' own types
+        query = query.where(
+            tuple_(GeneratedContent.created_at, GeneratedContent.id) < tuple_(
+                literal(created_at, GeneratedContent.created_at.type),
+                literal(row_id, GeneratedContent.id.type),
+            )
+        )
     
-    content = await query.limit(limit).all()
-    return [ContentResponse.from_orm(c) for c in content]
+    # One extra row tells us whether there is a next page
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    items = validate_rows(ContentListItem, rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
 
 
 @router.put("/{content_id}/approve")
 async def approve_content(
     content_id: str,
+    reviewer: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Approve content for publishing."""
-    content = await db.get(GeneratedContent, content_id)
-    if not content:
-        raise HTTPException(status_code=404, detail="Content not found")
-    
-    content.status = "approved"
-    await db.commit()
+    """
+    Approve content for publishing.
     
+    Only pending content can be approved. If another reviewer holds an
+    active claim on it, or it was already decided, this returns 409.
+    """
+    await _decide(db, content_id, "approved", reviewer)
     return {"message": "Content approved"}
 
 
@@ -107,15 +255,80 @@ async def approve_content(
 async def reject_content(
     content_id: str,
     feedback: str = "",
+    reviewer: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Reject content with feedback."""
-    content = await db.get(GeneratedContent, content_id)
-    if not content:
+    """Reject content with feedback. Same claim rules as approve."""
+    await _decide(db, content_id, "rejected", reviewer, feedback)
+    return {"message": "Content rejected", "feedback": feedback}
+
+
+@router.post("/bulk/approve", response_model=BulkReviewResponse)
+async def bulk_approve_content(
+    request: BulkReviewRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Approve many items in one statement; per-item claim rules as approve."""
+    results = await ReviewQueueService(db).bulk_decide(
+        "approved", **_bulk_target(request), reviewer=request.reviewer, feedback=request.feedback,
+    )
+    return _bulk_response(results)
+
+
+@router.post("/bulk/reject", response_model=BulkReviewResponse)
+async def bulk_reject_content(
+    request: BulkReviewRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Reject many items in one statement, storing the feedback on each."""
+    results = await ReviewQueueService(db).bulk_decide(
+        "rejected", **_bulk_target(request), reviewer=request.reviewer, feedback=request.feedback,
+    )
+    return _bulk_response(results)
+
+
+@router.post("/bulk/status", response_model=BulkReviewResponse)
+async def bulk_set_content_status(
+    request: BulkStatusRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Move many items to a status, e.g. requeue rejected content as generated."""
+    try:
+        results = await ReviewQueueService(db).bulk_set_status(
+            request.status, **_bulk_target(request),
+            from_status=request.from_status, reviewer=request.reviewer,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _bulk_response(results)
+
+
+def _bulk_target(request: BulkReviewRequest) -> dict:
+    return {
+        "ids": [str(content_id) for content_id in request.ids or []],
+        "filters": request.filter.model_dump(exclude_none=True) if request.filter else None,
+    }
+
+
+def _bulk_response(results: List[BulkResult]) -> BulkReviewResponse:
+    updated = sum(1 for result in results if result.updated)
+    return BulkReviewResponse(
+        updated=updated,
+        skipped=len(results) - updated,
+        results=[BulkItemResult.model_validate(result) for result in results],
+    )
+
+
+async def _decide(
+    db: AsyncSession,
+    content_id: str,
+    status: str,
+    reviewer: Optional[str],
+    feedback: Optional[str] = None,
+):
+    try:
+        await ReviewQueueService(db).decide(content_id, status, reviewer, feedback)
+    except ContentNotFoundError:
         raise HTTPException(status_code=404, detail="Content not found")
-    
-    content.status = "rejected"
-    # TODO: Store feedback for learning
-    await db.commit()
-    
-    return {"message": "Content rejected", "feedback": feedback}
\ No newline at end of file
+    except ReviewConflictError as e:
+        raise HTTPException(status_code=409, detail=f"Content {e.reason}")
@@ -0,0 +1,35 @@
+"""
+Profile capture API endpoints (admin only).
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.profiling import capture_path, is_admin, list_captures
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """The X-Admin-Token header must carry PROFILING_ADMIN_TOKEN."""
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@router.get("/", dependencies=[Depends(require_admin)])
+async def get_profiles():
+    """List stored captures, newest first."""
+    return list_captures()
+
+
+@router.get("/{name}", dependencies=[Depends(require_admin)])
+async def download_profile(name: str):
+    """
+    Download a capture in collapsed-stack format; open it in speedscope or
+    feed it to flamegraph.pl.
+    """
+    path = capture_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
@@ -2,34 +2,75 @@
 Content review and approval API endpoints.
 """
 
+from datetime import datetime
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.schemas.content import ContentResponse
+from app.core.response_cache import CONTENT, REVIEW, cache_response
+from app.core.responses import model_list_response
+from app.models.generated_content import GeneratedContent
+from app.schemas.content import ContentResponse, ReviewClaimRequest, ReviewReleaseRequest
+from app.services.review_queue import ReviewQueueService, pending_filter
 
 router = APIRouter()
 
 
 @router.get("/queue", response_model=List[ContentResponse])
 async def get_review_queue(
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get content pending review."""
-    # TODO: Implement review queue logic
-    return []
+    """Peek at the oldest unclaimed content pending review, without claiming it."""
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(GeneratedContent)
+        .where(
+            pending_filter(),
+            or_(GeneratedContent.claim_expires_at.is_(None), GeneratedContent.claim_expires_at < now),
+        )
+        .order_by(GeneratedContent.created_at, GeneratedContent.id)
+        .limit(limit)
+    )
+    return model_list_response(ContentResponse, result.scalars())
+
+
+@router.post("/queue/claim", response_model=List[ContentResponse])
+async def claim_review_items(
+    request: ReviewClaimRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Claim a batch of pending content for a reviewer.
+
+    Items stay leased to the reviewer until approved, rejected, released or
+    the lease expires. Claiming again renews the reviewer's current items.
+    """
+    return model_list_response(ContentResponse, await ReviewQueueService(db).claim(request.reviewer, request.limit))
+
+
+@router.post("/queue/release")
+async def release_review_items(
+    request: ReviewReleaseRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Return a reviewer's claimed items to the queue."""
+    released = await ReviewQueueService(db).release(request.reviewer, request.content_ids)
+    return {"released": released}
 
 
 @router.get("/dashboard")
+@cache_response(ttl=settings.REVIEW_DASHBOARD_CACHE_TTL_SECONDS, tags=[REVIEW, CONTENT])
 async def get_review_dashboard(
     db: AsyncSession = Depends(get_db)
 ):
     """Get review dashboard data."""
     return {
-        "pending_reviews": 0,
+        "pending_reviews": await ReviewQueueService(db).pending_count(),
         "approved_today": 0,
         "rejected_today": 0,
         "average_review_time": 0
-    }
\ No newline at end of file
+    }
@@ -2,33 +2,85 @@
 Trend monitoring API endpoints.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from uuid import uuid4
+from fastapi import APIRouter, Depends, Query
+from redis.exceptions import RedisError
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.services.trend_monitor import TrendMonitorService
+from app.core.redis import get_redis
+from app.models.trend_opportunity import TrendOpportunity
+from app.core.response_cache import TRENDS, cache_response
+from app.core.responses import model_list_response
+from app.services.trend_monitor import REFRESH_LOCK_KEY
 from app.schemas.trend_opportunity import TrendOpportunityResponse
+from app.worker import celery_app
 
 router = APIRouter()
 
+MONITOR_TASK = "app.tasks.trend_monitoring.monitor_trends_task"
+
 
 @router.get("/", response_model=List[TrendOpportunityResponse])
+@cache_response(ttl=settings.TREND_CACHE_TTL_SECONDS, tags=[TRENDS])
 async def get_trends(
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    status: Optional[str] = None,
+    source: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get current trend opportunities."""
-    trend_service = TrendMonitorService()
-    opportunities = await trend_service.monitor_trends()
-    return opportunities[:limit]
+    """
+    Get the top-scored trend opportunities stored by background monitoring.
 
+    source matches exactly or as a prefix, e.g. "reddit" matches
+    "reddit/r/Entrepreneur".
+    """
+    query = select(TrendOpportunity).order_by(
+        TrendOpportunity.score.desc(),
+        TrendOpportunity.created_at.desc(),
+        TrendOpportunity.id,
+    )
+    if status:
+        query = query.where(TrendOpportunity.status == status)
+    if source:
+        query = query.where(or_(
+            TrendOpportunity.source == source,
+            TrendOpportunity.source.startswith(f"{source}/", autoescape=True),
+        ))
 
-@router.post("/monitor")
-async def trigger_trend_monitoring(
-    db: AsyncSession = Depends(get_db)
-):
-    """Manually trigger trend monitoring."""
-    trend_service = TrendMonitorService()
-    opportunities = await trend_service.monitor_trends()
-    return {"message": f"Found {len(opportunities)} new opportunities"}
\ No newline at end of file
+    result = await db.execute(query.offset(offset).limit(limit))
+    return model_list_response(TrendOpportunityResponse, result.scalars())
+
+
+@router.post("/monitor", status_code=202)
+async def trigger_trend_monitoring():
+    """Queue a background trend monitoring run, unless one is already pending."""
+    task_id = str(uuid4())
+    try:
+        redis = get_redis()
+        if not await redis.set(REFRESH_LOCK_KEY, task_id, nx=True, ex=settings.TREND_REFRESH_LOCK_SECONDS):
+            pending = await redis.get(REFRESH_LOCK_KEY)
+            if pending:
+                return {"message": "Trend monitoring already queued", "task_id": pending.decode()}
+    except RedisError:
+        pass  # Better a duplicate run than none
+
+    # The task id doubles as the lock token the run releases the lock with
+    celery_app.send_task(MONITOR_TASK, kwargs={"lock_token": task_id}, task_id=task_id)
+    return {"message": "Trend monitoring queued", "task_id": task_id}
+
+
+@router.get("/monitor/{task_id}")
+async def get_trend_monitoring_status(task_id: str):
+    """Get the state and, once finished, the summary of a monitoring run."""
+    result = celery_app.AsyncResult(task_id)
+    response = {"task_id": task_id, "status": result.state}
+    if result.successful():
+        response["result"] = result.result
+    elif result.failed():
+        response["error"] = str(result.result)
+    return response
@@ -0,0 +1,142 @@
+"""
+Short-TTL read cache with an in-process tier in front of Redis.
+"""
+
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from app.core.redis import get_redis
+from app.core.telemetry import count_cache
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    JSON-serializable values cached under a namespace.
+
+    The local tier absorbs repeat reads in one process; Redis shares entries
+    across API workers. invalidate() clears Redis and this process's local
+    tier; local entries in other processes expire within local_ttl. Redis
+    errors degrade to the local tier only.
+    """
+
+    def __init__(self, namespace: str, ttl: float, local_ttl: float, max_local_entries: int = 256):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_local_entries = max_local_entries
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._keys_key = f"cache:{namespace}:keys"
+
+    async def get(self, key: str) -> Optional[Any]:
+        hit = self._local.get(key)
+        if hit is not None:
+            if hit[0] > time.monotonic():
+                self._local.move_to_end(key)
+                count_cache(self.namespace, "local_hit")
+                return hit[1]
+            del self._local[key]
+
+        try:
+            raw = await get_redis().get(self._redis_key(key))
+        except RedisError as e:
+            logger.warning("Cache %s unavailable: %s", self.namespace, e)
+            count_cache(self.namespace, "miss")
+            return None
+        if raw is None:
+            count_cache(self.namespace, "miss")
+            return None
+        count_cache(self.namespace, "hit")
+        value = json.loads(raw)
+        self._remember(key, value)
+        return value
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values for the keys that are present, with one MGET for local misses."""
+        found, missing = {}, []
+        now = time.monotonic()
+        for key in dict.fromkeys(keys):
+            hit = self._local.get(key)
+            if hit is not None and hit[0] > now:
+                self._local.move_to_end(key)
+                found[key] = hit[1]
+                count_cache(self.namespace, "local_hit")
+            else:
+                self._local.pop(key, None)
+                missing.append(key)
+        if not missing:
+            return found
+
+        try:
+            raws = await get_redis().mget([self._redis_key(key) for key in missing])
+        except RedisError as e:
+            logger.warning("Cache %s unavailable: %s", self.namespace, e)
+            raws = [None] * len(missing)
+        for key, raw in zip(missing, raws):
+            if raw is None:
+                count_cache(self.namespace, "miss")
+                continue
+            count_cache(self.namespace, "hit")
+            found[key] = json.loads(raw)
+            self._remember(key, found[key])
+        return found
+
+    async def set(self, key: str, value: Any):
+        await self.set_many({key: value})
+
+    async def set_many(self, values: Dict[str, Any]):
+        if not values:
+            return
+        for key, value in values.items():
+            self._remember(key, value)
+        ttl = max(1, math.ceil(self.ttl))
+        try:
+            async with get_redis().pipeline(transaction=True) as pipe:
+                for key, value in values.items():
+                    pipe.set(self._redis_key(key), json.dumps(value), ex=ttl)
+                # Track keys so invalidate() needs no SCAN
+                pipe.sadd(self._keys_key, *values)
+                pipe.expire(self._keys_key, ttl)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Cache %s unavailable: %s", self.namespace, e)
+
+    async def delete(self, keys: Iterable[str]):
+        """Drop individual keys from Redis and this process's local tier."""
+        keys = list(keys)
+        if not keys:
+            return
+        for key in keys:
+            self._local.pop(key, None)
+        try:
+            async with get_redis().pipeline(transaction=True) as pipe:
+                pipe.delete(*(self._redis_key(key) for key in keys))
+                pipe.srem(self._keys_key, *keys)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Could not invalidate cache %s: %s", self.namespace, e)
+
+    async def invalidate(self):
+        self._local.clear()
+        try:
+            redis = get_redis()
+            keys = await redis.smembers(self._keys_key)
+            await redis.delete(self._keys_key, *(self._redis_key(k.decode()) for k in keys))
+        except RedisError as e:
+            logger.warning("Could not invalidate cache %s: %s", self.namespace, e)
+
+    def _remember(self, key: str, value: Any):
+        self._local[key] = (time.monotonic() + self.local_ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
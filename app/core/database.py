@@ -2,17 +2,103 @@
 Database configuration and session management.
 """
 
+import bisect
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.telemetry import histogram_lines, instrument_engine, register_collector
+
+
+DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+
+
+class PoolWaitStats:
+    """Histogram of how long checkouts waited for a pooled connection."""
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+
+    def observe(self, waited_ms: float):
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, waited_ms)] += 1
+        self.total_ms += waited_ms
+        self.max_ms = max(self.max_ms, waited_ms)
+        self.checkouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, count in zip((*self.BUCKETS_MS, "+Inf"), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms_total": round(self.total_ms, 3),
+            "wait_ms_max": round(self.max_ms, 3),
+            "wait_ms_buckets": buckets,
+        }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait times in pool_wait_stats."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_wait_stats.timeouts += 1
+            raise
+        pool_wait_stats.observe((time.perf_counter() - started) * 1000)
+        return connection
+
+
+def engine_options(profile: str = settings.DB_POOL_PROFILE, url: str = DATABASE_URL) -> Dict[str, Any]:
+    """create_async_engine keyword arguments for the "api" or "worker" profile."""
+    worker = profile == "worker"
+    options: Dict[str, Any] = {
+        "echo": settings.DEBUG,
+        "poolclass": MonitoredQueuePool,
+        "pool_size": settings.DB_WORKER_POOL_SIZE if worker else settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_WORKER_MAX_OVERFLOW if worker else settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    if make_url(url).get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "command_timeout": (
+                settings.DB_WORKER_COMMAND_TIMEOUT_SECONDS if worker else settings.DB_COMMAND_TIMEOUT_SECONDS
+            ),
+            # SQLAlchemy's own prepared statement cache, and asyncpg's
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {"application_name": f"content-pipeline-{profile}"},
+        }
+    return options
 
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=settings.DEBUG,
-)
+engine = create_async_engine(DATABASE_URL, **engine_options())
+instrument_engine(engine.sync_engine)
 
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -22,27 +108,48 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-class Base(DeclarativeBase):
-    """Base class for all database models."""
-    pass
+POOL_GAUGES = ("size", "checked_in", "checked_out", "overflow")
 
 
-async def init_db():
-    """Initialize database tables."""
-    async with engine.begin() as conn:
-        # Import all models to ensure they are registered
-        from app.models import (
-            trend_opportunity,
-            generated_content,
-            content_package,
-            post_metrics,
-            comment,
-            response_suggestion,
-            content_calendar,
+def pool_stats() -> Dict[str, Any]:
+    """
+    Current pool occupancy plus the checkout wait histogram. Occupancy is
+    left out for pools that don't keep connections, e.g. NullPool in tests.
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {"profile": settings.DB_POOL_PROFILE, "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
         )
-        
-        # Create all tables
-        await conn.run_sync(Base.metadata.create_all)
+    return {**stats, **pool_wait_stats.snapshot()}
+
+
+@register_collector
+def pool_metrics():
+    """pool_stats() as Prometheus gauges and a checkout wait histogram."""
+    stats = pool_stats()
+    lines = []
+    for name in POOL_GAUGES:
+        if name in stats:
+            lines += [f"# TYPE db_pool_{name} gauge", f"db_pool_{name} {stats[name]}"]
+    lines += ["# TYPE db_pool_checkout_timeouts_total counter", f"db_pool_checkout_timeouts_total {stats['timeouts']}"]
+    lines += ["# TYPE db_pool_wait_seconds histogram"]
+    lines += histogram_lines(
+        "db_pool_wait_seconds", (), (),
+        [bound / 1000 for bound in PoolWaitStats.BUCKETS_MS],
+        pool_wait_stats.counts,
+        pool_wait_stats.total_ms / 1000,
+    )
+    return lines
+
+
+class Base(DeclarativeBase):
+    """Base class for all database models."""
+    pass
 
 
 async def get_db() -> AsyncSession:
@@ -51,4 +158,4 @@ async def get_db() -> AsyncSession:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
@@ -0,0 +1,157 @@
+"""
+Shared outbound HTTP client with per-host rate limiting.
+"""
+
+import asyncio
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HostRateLimiter:
+    """
+    Spaces requests to one host and honours its quota headers.
+
+    Understands X-RateLimit-Remaining / X-RateLimit-Reset (seconds until
+    reset, or an epoch timestamp) and Retry-After on 429 responses. Once the
+    quota is spent, requests wait until the window resets.
+    """
+
+    def __init__(self, min_interval: float = settings.HTTP_MIN_REQUEST_INTERVAL_SECONDS):
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+        self._remaining: Optional[float] = None
+        self._reset_at = 0.0
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            if self._remaining is not None and self._remaining < 1 and self._reset_at > now:
+                wait = max(wait, self._reset_at - now)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_at = time.monotonic() + self.min_interval
+            if self._remaining is not None:
+                self._remaining -= 1
+
+    def update(self, response: httpx.Response):
+        """Record the quota the upstream reported on a response."""
+        headers = response.headers
+        now = time.monotonic()
+        remaining = _parse_float(headers.get("x-ratelimit-remaining"))
+        reset = _parse_float(headers.get("x-ratelimit-reset"))
+        if remaining is not None:
+            self._remaining = remaining
+        if reset is not None:
+            # Some APIs send an epoch timestamp rather than a delay
+            delay = reset - time.time() if reset > 1e9 else reset
+            self._reset_at = now + max(delay, 0.0)
+        if response.status_code == 429:
+            self._remaining = 0
+            self._reset_at = max(self._reset_at, now + _retry_after(headers.get("retry-after")))
+        elif remaining is None and self._remaining is not None and self._reset_at <= now:
+            # Quota window passed without fresh headers
+            self._remaining = None
+
+
+class HttpClient:
+    """One pooled AsyncClient and its per-host rate limiters."""
+
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            http2=settings.HTTP_HTTP2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS),
+            headers={"User-Agent": settings.HTTP_USER_AGENT},
+            follow_redirects=True,
+        )
+        self._limiters: Dict[str, HostRateLimiter] = {}
+
+    def limiter(self, host: str) -> HostRateLimiter:
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = HostRateLimiter()
+        return limiter
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        max_retries: int = settings.HTTP_MAX_RETRIES,
+        **kwargs,
+    ) -> httpx.Response:
+        """Send a request through the host's limiter, retrying on 429."""
+        limiter = self.limiter(httpx.URL(url).host)
+        for attempt in range(max_retries + 1):
+            await limiter.acquire()
+            response = await self.client.request(method, url, **kwargs)
+            limiter.update(response)
+            if response.status_code != 429 or attempt == max_retries:
+                return response
+            await response.aclose()
+        return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+# Like Redis connections, pooled connections belong to the loop that opened them
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HttpClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> HttpClient:
+    """Return the shared HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = HttpClient()
+    return client
+
+
+async def close_http_client():
+    """Close the running loop's HTTP client, if one was opened."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _retry_after(value: Optional[str], default: float = 1.0) -> float:
+    if not value:
+        return default
+    seconds = _parse_float(value)
+    if seconds is not None:
+        return max(seconds, 0.0)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
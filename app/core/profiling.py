@@ -0,0 +1,198 @@
+"""
+Opt-in sampling profiler for single requests and Celery tasks.
+"""
+
+import hmac
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_SUFFIX = ".collapsed"
+PROFILE_HEADER = "x-profile"
+_CAPTURE_NAME = re.compile(r"^[\w.-]+\.collapsed$")
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+class StackSampler:
+    """
+    Samples every thread's Python stack at a fixed interval, from a
+    background thread, into collapsed-stack counts ("thread;outer;inner N").
+
+    Work the request hands to threads (renders, blocking loaders) shows up
+    under those threads' names. Async requests share the event loop thread,
+    so other requests in flight are sampled too.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        self.seconds = time.perf_counter() - self.started
+        return self.counts
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+
+# One capture at a time: overlapping samplers would each see the other's work
+_capture_lock = threading.Lock()
+
+
+def start_capture() -> Optional[StackSampler]:
+    """Start sampling, or return None if another capture is already running."""
+    if not _capture_lock.acquire(blocking=False):
+        return None
+    try:
+        return StackSampler(settings.PROFILING_INTERVAL_MS / 1000).start()
+    except Exception:
+        _capture_lock.release()
+        raise
+
+
+def finish_capture(sampler: StackSampler, name: str) -> Optional[Path]:
+    """Stop sampling and write the capture, keeping only the newest captures."""
+    try:
+        counts = sampler.stop()
+    finally:
+        _capture_lock.release()
+    if not counts:
+        return None
+    directory = Path(settings.PROFILING_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text("".join(f"{stack} {count}\n" for stack, count in counts.most_common()))
+    logger.info("Wrote profile %s: %d samples over %.2fs", name, sampler.samples, sampler.seconds)
+    _prune(directory)
+    return path
+
+
+def capture_name(kind: str, label: str) -> str:
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    slug = _UNSAFE.sub("_", label).strip("_")[:80] or "root"
+    return f"{stamp}-{kind}-{slug}{CAPTURE_SUFFIX}"
+
+
+def _prune(directory: Path):
+    captures = sorted(directory.glob(f"*{CAPTURE_SUFFIX}"), key=lambda path: path.name)
+    for path in captures[:-settings.PROFILING_MAX_CAPTURES or None]:
+        path.unlink(missing_ok=True)
+
+
+def list_captures() -> List[Dict[str, Any]]:
+    """Stored captures, newest first."""
+    directory = Path(settings.PROFILING_DIR)
+    if not directory.is_dir():
+        return []
+    captures = []
+    for path in sorted(directory.glob(f"*{CAPTURE_SUFFIX}"), key=lambda path: path.name, reverse=True):
+        stat = path.stat()
+        captures.append({
+            "name": path.name,
+            "bytes": stat.st_size,
+            "created_at": datetime.utcfromtimestamp(stat.st_mtime).isoformat(),
+        })
+    return captures
+
+
+def capture_path(name: str) -> Optional[Path]:
+    """Path of a stored capture; None for unknown or malformed names."""
+    if not _CAPTURE_NAME.match(name):
+        return None
+    path = Path(settings.PROFILING_DIR) / name
+    return path if path.is_file() else None
+
+
+def is_admin(token: Optional[str]) -> bool:
+    expected = settings.PROFILING_ADMIN_TOKEN
+    return bool(expected and token and hmac.compare_digest(token.encode(), expected.encode()))
+
+
+def should_profile_task() -> bool:
+    rate = settings.PROFILING_TASK_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request when it carries the admin token in an X-Profile
+    header, or at PROFILING_SAMPLE_RATE for paths under PROFILING_PATHS.
+    The capture's name is returned in an X-Profile-Capture header.
+
+    With no token configured and a zero sample rate, requests pass straight
+    through without any checks.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (settings.PROFILING_ADMIN_TOKEN or settings.PROFILING_SAMPLE_RATE > 0):
+            await self.app(scope, receive, send)
+            return
+        if not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        sampler = start_capture()
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        name = capture_name("http", f"{scope['method']}-{scope['path']}")
+
+        async def send_with_capture(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("x-profile-capture", name)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_capture)
+        finally:
+            finish_capture(sampler, name)
+
+    @staticmethod
+    def _wanted(scope) -> bool:
+        if is_admin(Headers(scope=scope).get(PROFILE_HEADER)):
+            return True
+        rate = settings.PROFILING_SAMPLE_RATE
+        return (
+            rate > 0
+            and any(scope["path"].startswith(prefix) for prefix in settings.PROFILING_PATHS)
+            and random.random() < rate
+        )
@@ -0,0 +1,36 @@
+"""
+Shared Redis client management.
+"""
+
+import asyncio
+import weakref
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+
+# Connections are bound to the event loop that opened them, and Celery tasks
+# run each task in a fresh loop, so keep one client per running loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = weakref.WeakKeyDictionary()
+
+
+def get_redis() -> Redis:
+    """Return the Redis client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_redis():
+    """Close the running loop's Redis client, if one was opened."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
@@ -0,0 +1,290 @@
+"""
+HTTP response cache for GET routes, shared through Redis.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+from starlette.routing import Match
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.telemetry import count_cache
+
+logger = logging.getLogger(__name__)
+
+# Cache tags; writes invalidate every cached response carrying the tag
+CONTENT = "content"
+REVIEW = "review"
+METRICS = "metrics"
+TRENDS = "trends"
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long a route's responses are fresh, then servable while refreshing."""
+    ttl: float
+    stale_ttl: float
+    tags: Tuple[str, ...]
+
+
+def cache_response(ttl: float, tags: Sequence[str] = (), stale_ttl: Optional[float] = None):
+    """Mark a GET endpoint as cacheable by ResponseCacheMiddleware."""
+    policy = CachePolicy(
+        ttl=ttl,
+        stale_ttl=settings.RESPONSE_CACHE_STALE_SECONDS if stale_ttl is None else stale_ttl,
+        tags=tuple(tags),
+    )
+
+    def decorate(endpoint):
+        endpoint.__response_cache__ = policy
+        return endpoint
+    return decorate
+
+
+class ResponseCacheStore:
+    """
+    Cached responses and tag versions.
+
+    Invalidating a tag bumps its version rather than deleting keys; entries
+    remember the versions they were rendered under and are ignored once any
+    differs. Redis is shared by every API and worker process. When it is
+    unreachable, an in-process LRU and local tag versions stand in.
+    """
+
+    def __init__(self, max_local_entries: int = settings.RESPONSE_CACHE_MAX_LOCAL_ENTRIES):
+        self.max_local_entries = max_local_entries
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._local_tags: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await get_redis().get(f"httpcache:entry:{key}")
+            return json.loads(raw) if raw is not None else None
+        except RedisError as e:
+            logger.warning("Response cache unavailable, using local LRU: %s", e)
+        hit = self._local.get(key)
+        if hit is None or hit[0] <= time.monotonic():
+            self._local.pop(key, None)
+            return None
+        self._local.move_to_end(key)
+        return hit[1]
+
+    async def set(self, key: str, entry: Dict[str, Any], ttl: float):
+        self._local[key] = (time.monotonic() + ttl, entry)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+        try:
+            await get_redis().set(f"httpcache:entry:{key}", json.dumps(entry), ex=max(1, int(ttl)))
+        except RedisError as e:
+            logger.warning("Response cache unavailable, using local LRU: %s", e)
+
+    async def tag_versions(self, tags: Sequence[str]) -> Dict[str, int]:
+        if not tags:
+            return {}
+        try:
+            values = await get_redis().mget([f"httpcache:tag:{tag}" for tag in tags])
+            return {tag: int(value or 0) for tag, value in zip(tags, values)}
+        except RedisError:
+            return {tag: self._local_tags.get(tag, 0) for tag in tags}
+
+    async def invalidate(self, *tags: str):
+        for tag in tags:
+            self._local_tags[tag] = self._local_tags.get(tag, 0) + 1
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(f"httpcache:tag:{tag}")
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Could not invalidate response cache tags %s: %s", tags, e)
+
+    async def try_lock(self, key: str, seconds: float) -> bool:
+        """Claim the refresh of an entry, so one process revalidates it."""
+        try:
+            return bool(await get_redis().set(f"httpcache:lock:{key}", 1, nx=True, ex=max(1, int(seconds))))
+        except RedisError:
+            return True
+
+
+response_cache = ResponseCacheStore()
+
+
+async def invalidate(*tags: str):
+    """Drop cached responses tagged with any of the tags, in every process."""
+    await response_cache.invalidate(*tags)
+
+
+class ResponseCacheMiddleware:
+    """
+    Serves GET routes marked with @cache_response from the cache.
+
+    Keys are the path plus the sorted query string. Fresh entries are sent
+    as-is and stale ones, within stale_ttl, are sent while a background
+    request refreshes them. Cached and fresh responses carry an ETag, and
+    a matching If-None-Match gets a 304. Only 200 JSON responses are
+    stored. Install it inside CORSMiddleware so hits still get CORS headers.
+    """
+
+    def __init__(self, app, store: Optional[ResponseCacheStore] = None):
+        self.app = app
+        self.store = store or response_cache
+        self._policies: Dict[str, Optional[CachePolicy]] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not settings.RESPONSE_CACHE_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        policy = self._policy(scope)
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._key(scope)
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        entry = await self.store.get(key)
+        versions = await self.store.tag_versions(policy.tags)
+
+        if entry is not None and entry["tags"] == versions:
+            age = time.time() - entry["stored_at"]
+            if age < policy.ttl:
+                await self._send_entry(entry, if_none_match, send, "HIT", age)
+                return
+            if age < policy.ttl + policy.stale_ttl:
+                self._refresh_in_background(scope, key, policy)
+                await self._send_entry(entry, if_none_match, send, "STALE", age)
+                return
+
+        start, body = await self._render(scope, receive)
+        entry = self._entry(start, body, versions)
+        if entry is None:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+        await self.store.set(key, entry, policy.ttl + policy.stale_ttl)
+        await self._send_entry(entry, if_none_match, send, "MISS", 0.0)
+
+    def _policy(self, scope) -> Optional[CachePolicy]:
+        path = scope["path"]
+        if path not in self._policies:
+            if len(self._policies) > 4096:
+                self._policies.clear()
+            policy = None
+            for route in scope["app"].router.routes:
+                match, _ = route.matches(scope)
+                if match == Match.FULL:
+                    policy = getattr(getattr(route, "endpoint", None), "__response_cache__", None)
+                    break
+            self._policies[path] = policy
+        return self._policies[path]
+
+    @staticmethod
+    def _key(scope) -> str:
+        query = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+        raw = f"{scope['path']}?{urlencode(query)}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    async def _render(self, scope, receive) -> Tuple[Dict[str, Any], bytes]:
+        """Run the route and buffer its response."""
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        return start, b"".join(chunks)
+
+    @staticmethod
+    def _entry(start: Dict[str, Any], body: bytes, versions: Dict[str, int]) -> Optional[Dict[str, Any]]:
+        headers = Headers(raw=start.get("headers", []))
+        if (
+            start.get("status") != 200
+            or not headers.get("content-type", "").startswith("application/json")
+            or len(body) > settings.RESPONSE_CACHE_MAX_BODY_BYTES
+        ):
+            return None
+        return {
+            "body": body.decode("utf-8"),
+            "content_type": headers["content-type"],
+            "etag": f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            "stored_at": time.time(),
+            "tags": versions,
+        }
+
+    @staticmethod
+    async def _send_entry(entry: Dict[str, Any], if_none_match: Optional[str], send, state: str, age: float):
+        count_cache("http", state.lower())
+        headers = [
+            (b"etag", entry["etag"].encode("latin-1")),
+            # Browsers may keep the body but must revalidate, which is a cheap 304
+            (b"cache-control", b"no-cache"),
+            (b"age", str(int(age)).encode("latin-1")),
+            (b"x-cache", state.encode("latin-1")),
+        ]
+        if if_none_match and _etag_matches(if_none_match, entry["etag"]):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        body = entry["body"].encode("utf-8")
+        headers += [
+            (b"content-type", entry["content_type"].encode("latin-1")),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _refresh_in_background(self, scope, key: str, policy: CachePolicy):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(scope, key, policy))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, scope, key: str, policy: CachePolicy):
+        try:
+            if not await self.store.try_lock(key, policy.ttl):
+                return  # another process is refreshing it
+            versions = await self.store.tag_versions(policy.tags)
+            headers = [(name, value) for name, value in scope["headers"] if name != b"if-none-match"]
+            start, body = await self._render(dict(scope, headers=headers), _empty_receive())
+            entry = self._entry(start, body, versions)
+            if entry is not None:
+                await self.store.set(key, entry, policy.ttl + policy.stale_ttl)
+        except Exception:
+            logger.exception("Background refresh of %s failed", scope["path"])
+        finally:
+            self._refreshing.discard(key)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _empty_receive():
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.disconnect"}
+    return receive
@@ -0,0 +1,52 @@
+"""
+Fast JSON responses for list endpoints.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.telemetry import span
+
+
+def _default(value: Any):
+    # Models become plain dicts; orjson encodes the datetimes, UUIDs etc. in them natively
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded by orjson, accepting pydantic models anywhere in
+    the content.
+
+    Endpoints that return one directly skip FastAPI's response_model
+    re-validation and jsonable_encoder pass; response_model then only
+    documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span("encode"):
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """A cached TypeAdapter for List[model]; building one compiles a validator."""
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+def validate_rows(model: Type[BaseModel], rows: Iterable[Any]) -> List[BaseModel]:
+    """Validate ORM objects or result rows into models in one call, read by attribute."""
+    rows = list(rows)
+    with span("validate"):
+        return list_adapter(model).validate_python(rows, from_attributes=True)
+
+
+def model_list_response(model: Type[BaseModel], rows: Iterable[Any], status_code: int = 200) -> ORJSONResponse:
+    """Validate rows into models once and encode them with orjson."""
+    return ORJSONResponse(validate_rows(model, rows), status_code=status_code)
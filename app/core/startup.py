@@ -0,0 +1,142 @@
+"""
+Process startup: schema revision check and concurrent cache warming.
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Tuple
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+class SchemaRevisionError(RuntimeError):
+    """Raised when the database is not at the migration head this code expects."""
+
+
+def expected_heads() -> Tuple[str, ...]:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return tuple(sorted(ScriptDirectory.from_config(config).get_heads()))
+
+
+async def check_schema_revision():
+    """
+    Compare the database's Alembic revision with the code's migration head.
+
+    One query against alembic_version, instead of reflecting every table.
+    STARTUP_MIGRATION_CHECK picks what a mismatch does: "fail", "warn" or "off".
+    """
+    mode = settings.STARTUP_MIGRATION_CHECK
+    if mode == "off":
+        return
+    async with engine.connect() as conn:
+        current = await conn.run_sync(lambda sync_conn: MigrationContext.configure(sync_conn).get_current_heads())
+    expected = await asyncio.to_thread(expected_heads)
+    if tuple(sorted(current)) == expected:
+        return
+
+    message = (
+        f"Database schema is at {', '.join(current) or 'no revision'}, "
+        f"code expects {', '.join(expected)}; run `alembic upgrade head`"
+    )
+    if mode == "fail":
+        raise SchemaRevisionError(message)
+    logger.warning(message)
+
+
+async def warm_db_pool():
+    """Open pooled connections up front so first requests skip the connect handshake."""
+    async def touch():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(touch() for _ in range(settings.STARTUP_WARM_DB_CONNECTIONS)))
+
+
+def warm_images():
+    from app.services.image_generator import get_image_generator
+    get_image_generator().warm()
+
+
+def warm_prompts():
+    from app.services.prompt_templates import get_prompt_library
+    get_prompt_library().warm()
+
+
+def warm_brand_index():
+    from app.services.brand_index import get_brand_index
+    get_brand_index()
+
+
+def warm_dedup_index():
+    if settings.DEDUP_ENABLED:
+        from app.services.dedup_index import get_dedup_index
+        get_dedup_index()
+
+
+# Blocking loaders; run in threads so they overlap each other and the DB work
+SYNC_WARMERS: Dict[str, Callable[[], None]] = {
+    "fonts_and_templates": warm_images,
+    "prompt_templates": warm_prompts,
+    "brand_index": warm_brand_index,
+    "dedup_index": warm_dedup_index,
+}
+
+
+def warm_sync_caches() -> Dict[str, float]:
+    """Run the blocking warmers in this thread, e.g. in a freshly forked worker."""
+    timings = {}
+    for name, warmer in SYNC_WARMERS.items():
+        started = time.perf_counter()
+        try:
+            warmer()
+        except Exception as e:
+            logger.warning("Warming %s failed: %s", name, e)
+        timings[name] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+async def startup():
+    """
+    Check the schema revision and warm process caches concurrently, then log
+    a timing breakdown. Only a failed revision check aborts startup; a
+    warmer that fails just leaves its cache to fill on first use.
+    """
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
+
+    async def timed(name: str, step: Awaitable, required: bool = False):
+        step_started = time.perf_counter()
+        try:
+            await step
+        except Exception as e:
+            if required:
+                raise
+            logger.warning("Warming %s failed: %s", name, e)
+        finally:
+            timings[name] = (time.perf_counter() - step_started) * 1000
+
+    await asyncio.wait_for(
+        asyncio.gather(
+            timed("schema_revision", check_schema_revision(), required=True),
+            timed("db_pool", warm_db_pool()),
+            *(timed(name, asyncio.to_thread(warmer)) for name, warmer in SYNC_WARMERS.items()),
+        ),
+        timeout=settings.STARTUP_TIMEOUT_SECONDS,
+    )
+
+    breakdown = " ".join(f"{name}={elapsed:.0f}ms" for name, elapsed in timings.items())
+    logger.info("Startup finished in %.0fms: %s", (time.perf_counter() - started) * 1000, breakdown)
+    return timings
@@ -0,0 +1,84 @@
+"""
+Running async code from Celery tasks.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Optional
+
+from celery import current_task
+from celery.exceptions import SoftTimeLimitExceeded
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.http import close_http_client
+from app.core.redis import close_redis
+
+
+class TaskLoop:
+    """
+    One event loop per worker process, run forever on a daemon thread.
+
+    Tasks on any pool thread submit coroutines to it and block on the result,
+    so the database pool, Redis connections and HTTP clients opened by one
+    task are reused by the next instead of being torn down with a per-task
+    loop. The loop is started lazily and again after a fork, since a child
+    process does not inherit the parent's thread.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name="task-loop", daemon=True).start()
+            return self._loop
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        future = asyncio.run_coroutine_threadsafe(_with_timeout(coro, timeout), self.loop())
+        try:
+            return future.result()
+        except SoftTimeLimitExceeded:
+            # Raised in this thread while it waits; the coroutine would
+            # otherwise keep running on the loop after the task gave up
+            future.cancel()
+            raise
+
+
+_task_loop = TaskLoop()
+
+
+async def _with_timeout(coro: Awaitable, timeout: Optional[float]) -> Any:
+    return await asyncio.wait_for(coro, timeout)
+
+
+async def _isolated(coro: Awaitable, timeout: Optional[float]) -> Any:
+    try:
+        return await _with_timeout(coro, timeout)
+    finally:
+        # Connections are bound to this task's event loop
+        await close_http_client()
+        await close_redis()
+        await engine.dispose()
+
+
+def run_async(coro: Awaitable) -> Any:
+    """
+    Run a task's coroutine to completion and return its result.
+
+    Uses the process's persistent loop unless CELERY_PERSISTENT_EVENT_LOOP is
+    off, in which case each call gets its own loop and closes its
+    connections afterwards (prefork pools only: the engine's pool is shared
+    by the process). The current task's hard time limit is also applied as
+    a timeout, as the threads pool cannot enforce Celery's own limits.
+    """
+    timeout = getattr(current_task, "time_limit", None)
+    if settings.CELERY_PERSISTENT_EVENT_LOOP:
+        return _task_loop.run(coro, timeout)
+    return asyncio.run(_isolated(coro, timeout))
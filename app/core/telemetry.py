@@ -0,0 +1,440 @@
+"""
+Request tracing and Prometheus metrics.
+
+Everything is recorded into in-process counters and histograms; the text
+exposition is only built when /metrics is scraped. Celery task run times
+are kept in Redis instead, since they happen in worker processes the API
+cannot see.
+"""
+
+import bisect
+import functools
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union, cast
+
+from redis import Redis
+from redis.exceptions import RedisError
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+CELERY_TASKS_KEY = "telemetry:celery_tasks"
+PIPELINE_KEY = "telemetry:pipeline"
+
+Labels = Tuple[str, ...]
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _labels(self, labels: Dict[str, str]) -> Labels:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def collect(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._labels(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = dict(self.values)
+        return self.header() + [
+            f"{self.name}{_label_text(self.labelnames, key)} {_number(value)}" for key, value in values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self.values[self._labels(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (+Inf last), sum]
+        self.series: Dict[Labels, List[Any]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self.series.items()}
+        lines = self.header()
+        for key, (counts, total) in series.items():
+            lines.extend(histogram_lines(self.name, self.labelnames, key, self.buckets, counts, total))
+        return lines
+
+
+def histogram_lines(
+    name: str,
+    labelnames: Sequence[str],
+    labels: Sequence[str],
+    buckets: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+) -> List[str]:
+    """Exposition lines for one histogram series from per-bucket (not cumulative) counts."""
+    lines, cumulative = [], 0
+    bounds = [f'le="{_number(bound)}"' for bound in buckets] + ['le="+Inf"']
+    for le, count in zip(bounds, counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_label_text(labelnames, labels, le)} {cumulative}")
+    lines.append(f"{name}_sum{_label_text(labelnames, labels)} {_number(total)}")
+    lines.append(f"{name}_count{_label_text(labelnames, labels)} {cumulative}")
+    return lines
+
+
+REGISTRY: List[_Metric] = []
+Collector = Callable[[], Union[Iterable[str], Awaitable[Iterable[str]]]]
+COLLECTORS: List[Collector] = []
+
+
+def register_collector(collector: Collector) -> Collector:
+    """Add a function (sync or async) that renders extra lines at scrape time."""
+    COLLECTORS.append(collector)
+    return collector
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status"),
+)
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests being handled.")
+stage_duration = Histogram("stage_duration_seconds", "Time spent in instrumented stages.", ("stage",))
+stages_in_flight = Gauge("stages_in_flight", "Instrumented stages currently running.", ("stage",))
+db_query_duration = Histogram("db_query_duration_seconds", "Database statement latency.", ("operation",))
+cache_requests = Counter("cache_requests_total", "Cache lookups by cache and result.", ("cache", "result"))
+
+# Per-request stage totals, for the Server-Timing header and slow request logs
+_trace: ContextVar[Optional[Dict[str, float]]] = ContextVar("telemetry_trace", default=None)
+
+
+def record_stage(stage: str, seconds: float):
+    """Count time spent in a stage, for the metrics and the current request's trace."""
+    stage_duration.observe(seconds, stage=stage)
+    trace = _trace.get()
+    if trace is not None:
+        trace[stage] = trace.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def span(stage: str):
+    """Time the enclosed block as a stage; usable in sync and async code."""
+    if not settings.TELEMETRY_ENABLED:
+        yield
+        return
+    stages_in_flight.inc(stage=stage)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages_in_flight.dec(stage=stage)
+        record_stage(stage, time.perf_counter() - started)
+
+
+def traced(stage: str):
+    """Decorator form of span() for sync and async functions."""
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count_cache(cache: str, result: str):
+    if settings.TELEMETRY_ENABLED:
+        cache_requests.inc(cache=cache, result=result)
+
+
+def instrument_engine(engine):
+    """Time every statement an engine runs, by leading SQL keyword."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("telemetry_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("telemetry_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        db_query_duration.observe(elapsed, operation=operation)
+        trace = _trace.get()
+        if trace is not None:
+            trace["db"] = trace.get("db", 0.0) + elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("telemetry_started"):
+            connection.info["telemetry_started"].pop()
+
+
+class TelemetryMiddleware:
+    """
+    Times each HTTP request by route template and tracks requests in flight.
+
+    Stage totals recorded during the request (llm, render, db, encode...)
+    go out in a Server-Timing header, and requests slower than
+    TELEMETRY_SLOW_REQUEST_SECONDS are logged with the same breakdown.
+    Install it outermost so it covers the other middleware too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.TELEMETRY_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        trace: Dict[str, float] = {}
+        token = _trace.set(trace)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trace:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("server-timing", server_timing(trace, time.perf_counter() - started))
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            _trace.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe(elapsed, method=scope["method"], route=route_path, status=str(status))
+            if elapsed >= settings.TELEMETRY_SLOW_REQUEST_SECONDS:
+                logger.warning(
+                    "Slow request %s %s took %.0fms: %s",
+                    scope["method"], scope["path"], elapsed * 1000,
+                    " ".join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in trace.items()) or "no stages",
+                )
+
+
+def server_timing(trace: Dict[str, float], total: float) -> str:
+    parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in trace.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+@register_collector
+def cache_hit_ratios() -> List[str]:
+    with cache_requests._lock:
+        values = dict(cache_requests.values)
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), count in values.items():
+        hits_and_total = totals.setdefault(cache, [0.0, 0.0])
+        if result != "miss":
+            hits_and_total[0] += count
+        hits_and_total[1] += count
+    lines = [
+        "# HELP cache_hit_ratio Share of cache lookups served from cache since process start.",
+        "# TYPE cache_hit_ratio gauge",
+    ]
+    lines += [
+        f'cache_hit_ratio{{cache="{_escape(cache)}"}} {_number(hits / total)}'
+        for cache, (hits, total) in totals.items() if total
+    ]
+    return lines
+
+
+# Celery task run times, aggregated in Redis across worker processes
+
+_sync_redis: Optional[Redis] = None
+
+
+def _redis() -> Redis:
+    global _sync_redis
+    if _sync_redis is None:
+        # redis-py 5.0 annotates from_url as returning None
+        _sync_redis = cast(Redis, Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        ))
+    return _sync_redis
+
+
+async def _read_hash(key: str) -> Dict[bytes, bytes]:
+    from app.core.redis import get_redis
+    # redis-py types hash reads as sync or async; the shared client is async
+    return await cast(Awaitable[Dict[bytes, bytes]], get_redis().hgetall(key))
+
+
+def record_task_run(task: str, state: str, seconds: float):
+    """
+    Add a finished task's run time to the shared histogram; called from
+    worker signals, on the pool's thread rather than the task event loop.
+    """
+    if not settings.TELEMETRY_ENABLED:
+        return
+    prefix = f"{task}|{state}"
+    index = bisect.bisect_left(TASK_BUCKETS, seconds)
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.hincrby(CELERY_TASKS_KEY, f"{prefix}|{index}", 1)
+        pipe.hincrbyfloat(CELERY_TASKS_KEY, f"{prefix}|sum", seconds)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning("Could not record task timing for %s: %s", task, e)
+
+
+@register_collector
+async def celery_task_durations() -> List[str]:
+    name = "celery_task_duration_seconds"
+    lines = [f"# HELP {name} Celery task run time by task and final state.", f"# TYPE {name} histogram"]
+    try:
+        fields = await _read_hash(CELERY_TASKS_KEY)
+    except RedisError as e:
+        logger.warning("Could not read task timings: %s", e)
+        return lines
+
+    series: Dict[Labels, List[Any]] = {}
+    for field, value in fields.items():
+        task, state, slot = field.decode().rsplit("|", 2)
+        counts_and_sum = series.setdefault((task, state), [[0] * (len(TASK_BUCKETS) + 1), 0.0])
+        if slot == "sum":
+            counts_and_sum[1] = float(value)
+        else:
+            counts_and_sum[0][int(slot)] = int(value)
+    for labels, (counts, total) in sorted(series.items()):
+        lines.extend(histogram_lines(name, ("task", "state"), labels, TASK_BUCKETS, counts, total))
+    return lines
+
+
+async def record_pipeline(stage: str, counts: Dict[str, int], seconds: float):
+    """Add one pipeline stage run's item counts by result, and its run time."""
+    from app.core.redis import get_redis
+    if not settings.TELEMETRY_ENABLED:
+        return
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for result, count in counts.items():
+                if count:
+                    pipe.hincrby(PIPELINE_KEY, f"{stage}|{result}", count)
+            pipe.hincrbyfloat(PIPELINE_KEY, f"{stage}|seconds", seconds)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Could not record pipeline counts for %s: %s", stage, e)
+
+
+@register_collector
+async def pipeline_counters() -> List[str]:
+    lines = [
+        "# HELP pipeline_items_total Items handled by each content pipeline stage, by result.",
+        "# TYPE pipeline_items_total counter",
+    ]
+    seconds_lines = [
+        "# HELP pipeline_stage_seconds_total Time spent running each content pipeline stage.",
+        "# TYPE pipeline_stage_seconds_total counter",
+    ]
+    try:
+        fields = await _read_hash(PIPELINE_KEY)
+    except RedisError as e:
+        logger.warning("Could not read pipeline counts: %s", e)
+        return lines + seconds_lines
+    for field, value in sorted(fields.items()):
+        stage, result = field.decode().split("|", 1)
+        if result == "seconds":
+            seconds_lines.append(f'pipeline_stage_seconds_total{{stage="{_escape(stage)}"}} {_number(float(value))}')
+        else:
+            lines.append(
+                f'pipeline_items_total{{stage="{_escape(stage)}",result="{_escape(result)}"}} {int(value)}'
+            )
+    return lines + seconds_lines
+
+
+async def render_metrics() -> str:
+    """The Prometheus text exposition of every metric and collector."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    for collector in COLLECTORS:
+        try:
+            result = collector()
+            lines.extend(await result if isinstance(result, Awaitable) else result)
+        except Exception:
+            logger.exception("Metrics collector %s failed", getattr(collector, "__name__", collector))
+    return "\n".join(lines) + "\n"
@@ -3,22 +3,28 @@ Main FastAPI application entry point for Based Labs Automated Content Pipeline.
 """
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import pool_stats
+from app.core.http import close_http_client
+from app.core.profiling import ProfilingMiddleware
+from app.core.response_cache import ResponseCacheMiddleware
+from app.core.startup import startup
+from app.core.telemetry import TelemetryMiddleware, render_metrics
 from app.api.v1.api import api_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    # Startup
-    await init_db()
+    # Startup: schema revision check and cache warming; schema changes go through Alembic
+    await startup()
     yield
     # Shutdown
-    pass
+    await close_http_client()
 
 
 app = FastAPI(
@@ -28,6 +34,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Response cache; added first so CORS wraps it and cache hits get CORS headers too
+app.add_middleware(ResponseCacheMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -37,6 +46,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling; inside timing so profiled requests are still measured
+app.add_middleware(ProfilingMiddleware)
+
+# Request timing; added last so it is outermost and times the whole stack
+app.add_middleware(TelemetryMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -50,4 +65,16 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "version": "1.0.0"}
\ No newline at end of file
+    return {"status": "healthy", "version": "1.0.0"}
+
+
+@app.get("/health/db-pool")
+async def db_pool_health():
+    """Connection pool occupancy and checkout wait histogram for this process."""
+    return pool_stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of request, stage, DB, cache and task metrics."""
+    return PlainTextResponse(await render_metrics(), media_type="text/plain; version=0.0.4")
@@ -6,6 +6,8 @@ from app.models.trend_opportunity import TrendOpportunity
 from app.models.generated_content import GeneratedContent
 from app.models.content_package import ContentPackage
 from app.models.post_metrics import PostMetrics
+from app.models.published_post import PublishedPost
+from app.models.metrics_rollup import PostMetricsHourly, PostMetricsDaily
 from app.models.comment import Comment
 from app.models.response_suggestion import ResponseSuggestion
 from app.models.content_calendar import ContentCalendarEntry
@@ -15,6 +17,9 @@ __all__ = [
     "GeneratedContent", 
     "ContentPackage",
     "PostMetrics",
+    "PublishedPost",
+    "PostMetricsHourly",
+    "PostMetricsDaily",
     "Comment",
     "ResponseSuggestion",
     "ContentCalendarEntry",
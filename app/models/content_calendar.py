@@ -5,6 +5,7 @@ Content calendar model for planning and scheduling content.
 from datetime import datetime
 from sqlalchemy import String, DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import UUID
 
 from app.models.base import BaseModel
 
@@ -27,7 +28,7 @@ class ContentCalendarEntry(BaseModel):
     )  # planned, generated, approved, published
     content_pillar: Mapped[str] = mapped_column(String(50), nullable=True)
     package_id: Mapped[str] = mapped_column(
-        String(36), 
+        UUID(as_uuid=False), 
         ForeignKey("content_packages.id"),
         nullable=True
     )
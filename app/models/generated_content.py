@@ -2,8 +2,12 @@
 Generated content model for AI-created content pieces.
 """
 
-from sqlalchemy import String, Text, ForeignKey
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import DateTime, Index, String, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import text as sql_text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import UUID
 
 from app.models.base import BaseModel
 
@@ -12,9 +16,24 @@ class GeneratedContent(BaseModel):
     """Model for AI-generated content pieces."""
     
     __tablename__ = "generated_content"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id), with and without a status filter
+        Index("ix_generated_content_status_created_at", "status", "created_at", "id"),
+        Index("ix_generated_content_created_at", "created_at", "id"),
+        Index("ix_generated_content_trend_opportunity_id", "trend_opportunity_id"),
+        # Review queue claims only scan rows still awaiting review
+        Index(
+            "ix_generated_content_review_queue",
+            "created_at",
+            "id",
+            postgresql_where=sql_text("status = 'generated'"),
+        ),
+        # Pipeline retries and overlapping runs insert each (opportunity, platform) once
+        UniqueConstraint("idempotency_key", name="uq_generated_content_idempotency_key"),
+    )
     
     trend_opportunity_id: Mapped[str] = mapped_column(
-        String(36), 
+        UUID(as_uuid=False), 
         ForeignKey("trend_opportunities.id"),
         nullable=False
     )
@@ -30,11 +49,24 @@ class GeneratedContent(BaseModel):
         nullable=False
     )  # generated, approved, rejected, published
     package_id: Mapped[str] = mapped_column(
-        String(36), 
+        UUID(as_uuid=False), 
         ForeignKey("content_packages.id"),
         nullable=True
     )
     
+    # Review queue lease; see ReviewQueueService
+    claimed_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    claim_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    
+    # Latest review decision
+    reviewed_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    reviewed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    review_feedback: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # Set by the Celery pipeline; see ContentPipelineService
+    idempotency_key: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    image_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    
     # Relationships
     trend_opportunity = relationship("TrendOpportunity", back_populates="generated_content")
     content_package = relationship("ContentPackage", back_populates="generated_content")
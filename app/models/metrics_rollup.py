@@ -0,0 +1,52 @@
+"""
+Hourly and daily engagement rollups of post metrics snapshots.
+"""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class MetricsRollupMixin:
+    """
+    One row per post per time bucket, holding the latest snapshot seen in it.
+
+    Snapshot counters are cumulative, so the newest snapshot in a bucket is
+    the post's standing at the end of that bucket. Maintained by
+    MetricsRollupService as snapshots are recorded.
+    """
+    
+    granularity: str
+    
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    platform: Mapped[str] = mapped_column(String(20), primary_key=True)
+    post_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    content_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False), nullable=True)
+    content_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    likes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    comments: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    shares: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    saves: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    impressions: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reach: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    engagement_rate: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    snapshots: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_collected_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class PostMetricsHourly(MetricsRollupMixin, Base):
+    """Hourly engagement rollup."""
+    
+    __tablename__ = "post_metrics_hourly"
+    granularity = "hour"
+
+
+class PostMetricsDaily(MetricsRollupMixin, Base):
+    """Daily engagement rollup."""
+    
+    __tablename__ = "post_metrics_daily"
+    granularity = "day"
@@ -3,16 +3,28 @@ Post metrics model for tracking social media performance.
 """
 
 from datetime import datetime
-from sqlalchemy import String, Integer, Float, DateTime
+from sqlalchemy import DDL, String, Integer, Float, DateTime, Index, event
+from sqlalchemy import text as sql_text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import BaseModel
 
 
 class PostMetrics(BaseModel):
-    """Model for tracking social media post performance metrics."""
+    """
+    Model for tracking social media post performance metrics.
+    
+    One row per collection snapshot. The table is range-partitioned by
+    collected_at month; see MetricsRetentionService for partition upkeep,
+    downsampling and expiry.
+    """
     
     __tablename__ = "post_metrics"
+    __table_args__ = (
+        # Latest snapshot for a post, and per-post time window scans
+        Index("ix_post_metrics_post_id_collected_at", "post_id", sql_text("collected_at DESC")),
+        {"postgresql_partition_by": "RANGE (collected_at)"},
+    )
     
     post_id: Mapped[str] = mapped_column(String(100), nullable=False)
     platform: Mapped[str] = mapped_column(String(20), nullable=False)
@@ -24,4 +36,13 @@ class PostMetrics(BaseModel):
     reach: Mapped[int] = mapped_column(Integer, default=0)
     click_through_rate: Mapped[float] = mapped_column(Float, default=0.0)
     engagement_rate: Mapped[float] = mapped_column(Float, default=0.0)
-    collected_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    # Partition key, so it has to be part of the primary key
+    collected_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=datetime.utcnow)
+
+
+# Catch-all partition so inserts never fail before monthly partitions exist
+event.listen(
+    PostMetrics.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS post_metrics_default PARTITION OF post_metrics DEFAULT").execute_if(dialect="postgresql"),
+)
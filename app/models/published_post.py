@@ -0,0 +1,32 @@
+"""
+Published post model linking generated content to its social media post.
+"""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base import BaseModel
+
+
+class PublishedPost(BaseModel):
+    """Model mapping a generated content piece to the platform post it became."""
+    
+    __tablename__ = "published_posts"
+    __table_args__ = (
+        # Metrics snapshots identify posts by (platform, post_id)
+        UniqueConstraint("platform", "post_id", name="uq_published_posts_platform_post_id"),
+        Index("ix_published_posts_content_id", "content_id"),
+    )
+    
+    content_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("generated_content.id"),
+        nullable=False
+    )
+    platform: Mapped[str] = mapped_column(String(20), nullable=False)
+    post_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    published_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -4,6 +4,7 @@ Response suggestion model for community engagement assistance.
 
 from sqlalchemy import String, Text, Float, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import UUID
 
 from app.models.base import BaseModel
 
@@ -14,7 +15,7 @@ class ResponseSuggestion(BaseModel):
     __tablename__ = "response_suggestions"
     
     comment_id: Mapped[str] = mapped_column(
-        String(36), 
+        UUID(as_uuid=False), 
         ForeignKey("comments.id"),
         nullable=False
     )
@@ -3,7 +3,7 @@ Trend opportunity model for storing identified content opportunities.
 """
 
 from typing import Dict, Any
-from sqlalchemy import String, Float, Text, JSON
+from sqlalchemy import Index, String, Float, Text, JSON
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import BaseModel
@@ -13,13 +13,18 @@ class TrendOpportunity(BaseModel):
     """Model for trend opportunities identified by the monitoring system."""
     
     __tablename__ = "trend_opportunities"
+    __table_args__ = (
+        # GET /trends: top scores, optionally per status
+        Index("ix_trend_opportunities_status_score", "status", "score"),
+    )
     
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     source: Mapped[str] = mapped_column(String(100), nullable=False)
     url: Mapped[str] = mapped_column(String(500), nullable=True)
     score: Mapped[float] = mapped_column(Float, nullable=False)
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
+    # "metadata" is reserved by the declarative API, so map the column explicitly
+    trend_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSON, default=dict)
     status: Mapped[str] = mapped_column(
         String(20), 
         default="identified",
@@ -0,0 +1,88 @@
+"""
+Schemas for analytics and content performance.
+"""
+
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field, field_validator
+
+
+class EngagementMetrics(BaseModel):
+    """Schema for engagement counters from the latest metrics snapshot."""
+    likes: int = 0
+    comments: int = 0
+    shares: int = 0
+    saves: int = 0
+    impressions: int = 0
+    reach: int = 0
+    engagement_rate: float = 0.0
+
+
+class PublishedPostPerformance(BaseModel):
+    """Schema for one published post and its latest snapshot, if any."""
+    platform: str
+    post_id: str
+    url: Optional[str] = None
+    published_at: Optional[datetime] = None
+    collected_at: Optional[datetime] = None
+    metrics: EngagementMetrics
+
+
+class ContentPerformance(BaseModel):
+    """Schema for a content piece's performance, summed over its published posts."""
+    content_id: str
+    metrics: EngagementMetrics
+    posts: List[PublishedPostPerformance] = []
+    last_collected_at: Optional[datetime] = None
+
+
+class PerformanceBatchRequest(BaseModel):
+    """Schema for looking up performance of many content pieces at once."""
+    content_ids: List[UUID] = Field(..., min_length=1, max_length=200)
+
+
+class PerformanceBatchResponse(BaseModel):
+    """Schema for batch performance; unknown content ids are listed in missing."""
+    items: List[ContentPerformance]
+    missing: List[str] = []
+
+
+class MetricsSnapshot(BaseModel):
+    """Schema for one collected metrics snapshot of a platform post."""
+    post_id: str = Field(..., max_length=100)
+    platform: str = Field(..., max_length=20)
+    likes: int = Field(0, ge=0)
+    comments: int = Field(0, ge=0)
+    shares: int = Field(0, ge=0)
+    saves: int = Field(0, ge=0)
+    impressions: int = Field(0, ge=0)
+    reach: int = Field(0, ge=0)
+    click_through_rate: float = 0.0
+    engagement_rate: float = 0.0
+    collected_at: Optional[datetime] = None
+
+    @field_validator("collected_at")
+    @classmethod
+    def _naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Stored as UTC timestamps without time zone
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class MetricsIngestRequest(BaseModel):
+    """Schema for a batch of metrics snapshots from one collection cycle."""
+    snapshots: List[MetricsSnapshot] = Field(..., min_length=1, max_length=20000)
+
+
+class MetricsIngestResponse(BaseModel):
+    """Schema for the outcome and throughput of a metrics ingest."""
+    received: int
+    inserted: int
+    duplicates: int
+    rollup_rows: int
+    method: str
+    seconds: float
+    rows_per_second: float  # inserted rows
+    received_per_second: float
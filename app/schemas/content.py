@@ -3,15 +3,39 @@ Schemas for content generation and management.
 """
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Literal, Optional, get_args
+from uuid import UUID
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# Platforms with prompt guidance; variants for anything else are rejected
+Platform = Literal["instagram", "linkedin"]
+# Content types with prompt and image templates; also part of the prompt cache key
+ContentType = Literal["quote_minimal", "long_form", "carousel_series"]
 
 
 class ContentGenerationRequest(BaseModel):
     """Schema for content generation requests."""
     trend_opportunity_id: str
-    content_type: Optional[str] = None
-    platform: str = "instagram"
+    content_type: Optional[ContentType] = None
+    platform: Platform = "instagram"
+    allow_duplicate: bool = False
+
+
+class ContentVariantsRequest(BaseModel):
+    """Schema for generating per-platform variants in one completion."""
+    trend_opportunity_id: str
+    content_type: Optional[ContentType] = None
+    platforms: List[Platform] = Field(
+        default=["instagram", "linkedin"], min_length=1, max_length=len(get_args(Platform))
+    )
+    allow_duplicate: bool = False
+    
+    @field_validator("platforms", mode="before")
+    @classmethod
+    def _dedupe_platforms(cls, value):
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            value = list(dict.fromkeys(value))
+        return value
 
 
 class ContentResponse(BaseModel):
@@ -22,8 +46,107 @@ class ContentResponse(BaseModel):
     text: str
     platform: str
     status: str
+    package_id: Optional[str] = None
+    claimed_by: Optional[str] = None
+    claim_expires_at: Optional[datetime] = None
+    reviewed_by: Optional[str] = None
+    reviewed_at: Optional[datetime] = None
+    review_feedback: Optional[str] = None
+    image_path: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class ContentListItem(BaseModel):
+    """Schema for a content listing row; text is only set when requested."""
+    id: str
+    trend_opportunity_id: str
+    content_type: str
+    platform: str
+    status: str
+    package_id: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    text: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class ContentPage(BaseModel):
+    """Schema for one keyset-paginated page of content."""
+    items: List[ContentListItem]
+    next_cursor: Optional[str] = None
+
+
+class ReviewClaimRequest(BaseModel):
+    """Schema for claiming a batch of content to review."""
+    reviewer: str
+    limit: int = Field(default=10, ge=1)
+
+
+class ReviewReleaseRequest(BaseModel):
+    """Schema for returning claimed content to the review queue."""
+    reviewer: str
+    content_ids: Optional[List[str]] = None
+
+
+class ContentFilter(BaseModel):
+    """Schema for selecting content by attributes instead of ids."""
+    status: Optional[str] = None
+    platform: Optional[str] = None
+    content_type: Optional[str] = None
+    trend_opportunity_id: Optional[str] = None
+    package_id: Optional[str] = None
+
+
+class BulkReviewRequest(BaseModel):
+    """Schema for approving or rejecting many items at once."""
+    ids: Optional[List[UUID]] = Field(default=None, max_length=1000)
+    filter: Optional[ContentFilter] = None
+    reviewer: Optional[str] = None
+    feedback: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def _check_target(self):
+        if not self.ids and not (self.filter and self.filter.model_dump(exclude_none=True)):
+            raise ValueError("Provide ids or a non-empty filter")
+        return self
+
+
+class BulkStatusRequest(BulkReviewRequest):
+    """Schema for moving many items to a status."""
+    status: str
+    from_status: Optional[str] = None
+
+
+class BulkItemResult(BaseModel):
+    """Schema for the outcome of a bulk action on one item."""
+    id: str
+    updated: bool
+    status: Optional[str] = None
+    reason: Optional[str] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class BulkReviewResponse(BaseModel):
+    """Schema for bulk review action results."""
+    updated: int
+    skipped: int
+    results: List[BulkItemResult]
+
+
+class ContentPackageResponse(BaseModel):
+    """Schema for a content package and its sibling variants."""
+    id: str
+    title: str
+    description: Optional[str] = None
+    status: str
+    content: List[ContentResponse]
+    created_at: datetime
+    updated_at: datetime
\ No newline at end of file
@@ -4,7 +4,7 @@ Schemas for trend opportunity data.
 
 from datetime import datetime
 from typing import Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 
 
 class TrendOpportunityBase(BaseModel):
@@ -14,7 +14,10 @@ class TrendOpportunityBase(BaseModel):
     source: str
     url: Optional[str] = None
     score: float
-    metadata: Dict[str, Any] = {}
+    metadata: Dict[str, Any] = Field(
+        default={},
+        validation_alias=AliasChoices("trend_metadata", "metadata"),
+    )
 
 
 class TrendOpportunityCreate(TrendOpportunityBase):
@@ -25,6 +28,7 @@ class TrendOpportunityCreate(TrendOpportunityBase):
 class TrendOpportunityResponse(TrendOpportunityBase):
     """Schema for trend opportunity responses."""
     id: str
+    status: str
     created_at: datetime
     updated_at: datetime
     
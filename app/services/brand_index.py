@@ -0,0 +1,375 @@
+"""
+Precomputed brand-alignment index built from the Based Labs brand documents.
+
+The brand docs and voice steering file are split into sections and turned
+into TF-IDF vectors; their normalized centroid is the brand profile. The
+profile and IDF weights are saved as .npy files and memory-mapped on load,
+alongside a manifest recording the vocabulary and a version hash of the
+source documents. The index is rebuilt only when that hash changes.
+
+A rebuild never writes into files other processes have mapped: each build's
+arrays are named by version, and every file is staged and moved into place
+with os.replace, the manifest last.
+
+Scoring a batch of trends is one sparse matrix-vector product against the
+profile.
+
+Build offline with:
+    python -m app.services.brand_index
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_FORMAT = 2  # bump when tokenization, weighting or the file layout changes
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9']+")
+_HEADING_RE = re.compile(r"^#{1,6}\s", re.MULTILINE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_SUFFIXES = ("ing", "ers", "er", "ed", "es", "s")
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could
+do does for from had has have how i if in into is it its just like make more
+most much my no not of on one only or our out over so some such than that the
+their them then there these they this to too up us use very was we were what
+when where which who why will with would you your
+""".split())
+
+
+def _stem(token: str) -> str:
+    for suffix in _SUFFIXES:
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, lightly stemmed unigrams and bigrams without stopwords."""
+    words = [_stem(w) for w in _TOKEN_RE.findall(text.lower()) if w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def source_paths(
+    docs_dir: str = settings.BRAND_DOCS_DIR,
+    steering_dir: str = settings.PROMPT_STEERING_DIR,
+) -> List[Path]:
+    """Documents the brand profile is built from."""
+    paths = sorted(Path(docs_dir).glob("*.md"))
+    voice = Path(steering_dir) / "based-labs-voice.md"
+    if voice.exists():
+        paths.append(voice)
+    return paths
+
+
+def source_version(paths: Sequence[Path]) -> str:
+    """Content hash identifying one build of the index."""
+    digest = hashlib.sha256(f"format:{INDEX_FORMAT}".encode())
+    for path in paths:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+# Byte classes matching _TOKEN_RE, for tokenizing a whole batch at once
+_WORD_BYTES = np.zeros(256, dtype=bool)
+_LETTER_BYTES = np.zeros(256, dtype=bool)
+for _byte in b"abcdefghijklmnopqrstuvwxyz0123456789'":
+    _WORD_BYTES[_byte] = True
+for _byte in b"abcdefghijklmnopqrstuvwxyz":
+    _LETTER_BYTES[_byte] = True
+_HASH_PRIME = np.uint64(1099511628211)
+
+
+@dataclass
+class WordBatch:
+    """Every _TOKEN_RE match in a batch of texts, as arrays."""
+    words: List[str]  # distinct words, in hash order
+    word_ids: np.ndarray  # index into words for each match, in text order
+    docs: np.ndarray  # text each match came from
+
+
+def split_words(texts: Sequence[str]) -> WordBatch:
+    """
+    Find the words of every text in one pass over the joined batch.
+
+    Equivalent to _TOKEN_RE.findall on each lowercased text: a word runs
+    from the first letter of a run of [a-z0-9'] to the end of the run, and
+    needs two characters. Words are keyed by their bytes, read eight at a
+    time (exact up to eight characters, hashed beyond), so only distinct
+    words are ever turned back into Python strings.
+    """
+    encoded = [text.lower().encode("utf-8") for text in texts]
+    # Spaces between texts end every run; the tail pads the 8-byte reads
+    joined = b" ".join(encoded) + b" " * 8
+    data = np.frombuffer(joined, dtype=np.uint8)
+    doc_starts = np.cumsum([0] + [len(text) + 1 for text in encoded[:-1]])
+
+    edges = np.diff(_WORD_BYTES[data].view(np.int8), prepend=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    # Runs rarely open with a digit or apostrophe; step those to their first letter
+    pending = np.flatnonzero(~_LETTER_BYTES[data[starts]])
+    while len(pending):
+        starts[pending] += 1
+        pending = pending[(starts[pending] < ends[pending]) & ~_LETTER_BYTES[data[starts[pending]]]]
+    long_enough = ends - starts >= 2
+    starts, ends = starts[long_enough], ends[long_enough]
+
+    lengths = ends - starts
+    windows = np.lib.stride_tricks.as_strided(data, shape=(len(data) - 7, 8), strides=(1, 1))
+    keys = np.zeros(len(starts), dtype=np.uint64)
+    active = np.arange(len(starts))
+    offset = 0
+    with np.errstate(over="ignore"):
+        while len(active):
+            chunk = np.ascontiguousarray(windows[starts[active] + offset]).view("<u8").reshape(-1)
+            remaining = np.minimum(lengths[active] - offset, 8).astype(np.uint64)
+            # Zero the bytes past the word's end; shifting a uint64 by 64 is undefined, so by halves
+            mask = ~((~np.uint64(0) << (remaining * np.uint64(4))) << (remaining * np.uint64(4)))
+            keys[active] = keys[active] * _HASH_PRIME + (chunk & mask)
+            offset += 8
+            active = active[lengths[active] > offset]
+
+    unique, word_ids = np.unique(keys, return_inverse=True)
+    word_ids = word_ids.reshape(-1)
+    # Any occurrence will do to spell the word
+    spelled = np.empty(len(unique), dtype=np.int64)
+    spelled[word_ids] = np.arange(len(word_ids))
+    words = [joined[starts[i]:ends[i]].decode("ascii") for i in spelled]
+    words_per_doc = np.diff(np.searchsorted(starts, doc_starts), append=len(starts))
+    docs = np.repeat(np.arange(len(texts)), words_per_doc)
+    return WordBatch(words, word_ids, docs)
+
+
+class BrandIndex:
+    """Memory-mapped brand profile with batch cosine scoring."""
+
+    def __init__(self, vocab: Dict[str, int], idf: np.ndarray, profile: np.ndarray,
+                 default_idf: float, calibration: float, version: str):
+        self.vocab = vocab
+        self.idf = idf
+        self.profile = profile
+        self.default_idf = default_idf
+        self.calibration = calibration
+        self.version = version
+        self.bigrams = [
+            (first, second, term)
+            for first, _, second, term in (
+                (*name.partition(" "), term) for name, term in vocab.items()
+            )
+            if second
+        ]
+
+    def score_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Return brand alignment in [0, 1] for each text.
+
+        Cosine similarity between the text's TF-IDF vector and the brand
+        profile, scaled so a typical brand doc sentence scores 1.0. Tokens
+        are the same as tokenize() gives, but found, stemmed and counted for
+        the whole batch with array operations: Python only sees each
+        distinct word and stem once.
+        """
+        n = len(texts)
+        if not n:
+            return np.zeros(0)
+
+        batch = split_words(texts)
+        stem_ids: Dict[str, int] = {}
+        word_stem = np.fromiter(
+            (-1 if word in STOPWORDS else stem_ids.setdefault(_stem(word), len(stem_ids)) for word in batch.words),
+            dtype=np.int64,
+            count=len(batch.words),
+        )
+        stems = word_stem[batch.word_ids]
+        kept = stems >= 0
+        stems, docs = stems[kept], batch.docs[kept]
+
+        # Token keys: vocabulary terms are [0, V); out-of-vocabulary unigrams
+        # and bigrams get keys past V, distinct per stem or stem pair
+        n_terms, n_stems = len(self.vocab), max(len(stem_ids), 1)
+        unigram_terms = np.fromiter(
+            (self.vocab.get(stem, -1) for stem in stem_ids), dtype=np.int64, count=len(stem_ids)
+        )
+        unigram_keys = np.where(unigram_terms[stems] >= 0, unigram_terms[stems], n_terms + stems)
+
+        same_doc = docs[1:] == docs[:-1]
+        pairs = stems[:-1][same_doc] * n_stems + stems[1:][same_doc]
+        bigram_keys = n_terms + n_stems + pairs
+        known = sorted(
+            (stem_ids[first] * n_stems + stem_ids[second], term)
+            for first, second, term in self.bigrams
+            if first in stem_ids and second in stem_ids
+        )
+        if known:
+            known_pairs = np.array([pair for pair, _ in known], dtype=np.int64)
+            known_terms = np.array([term for _, term in known], dtype=np.int64)
+            # Only pairs opening with a bigram's first stem can be in the vocabulary
+            opens_bigram = np.zeros(n_stems, dtype=bool)
+            opens_bigram[known_pairs // n_stems] = True
+            candidates = np.flatnonzero(opens_bigram[pairs // n_stems])
+            slot = np.minimum(np.searchsorted(known_pairs, pairs[candidates]), len(known_pairs) - 1)
+            found = known_pairs[slot] == pairs[candidates]
+            bigram_keys[candidates[found]] = known_terms[slot[found]]
+
+        span = n_terms + n_stems + n_stems * n_stems
+        keys = np.concatenate([docs * span + unigram_keys, docs[:-1][same_doc] * span + bigram_keys])
+        unique, counts = np.unique(keys, return_counts=True)
+        rows, terms = np.divmod(unique, span)
+        counts = counts.astype(np.float64)
+
+        # Sparse dot product and norms, one bincount each over the whole batch
+        in_vocab = terms < n_terms
+        rows_in, terms_in = rows[in_vocab], terms[in_vocab]
+        weights = counts[in_vocab] * self.idf[terms_in]
+        dots = np.bincount(rows_in, weights=weights * self.profile[terms_in], minlength=n)
+        oov_norm_sq = np.bincount(rows[~in_vocab], weights=counts[~in_vocab] ** 2, minlength=n) * self.default_idf ** 2
+        norms = np.sqrt(np.bincount(rows_in, weights=weights ** 2, minlength=n) + oov_norm_sq)
+        cosine = np.divide(dots, norms, out=np.zeros(n), where=norms > 0)
+        return np.clip(cosine / self.calibration, 0.0, 1.0)
+
+    def score(self, text: str) -> float:
+        """Return brand alignment for a single text."""
+        return float(self.score_batch([text])[0])
+
+    @classmethod
+    def load(cls, index_dir: Path) -> "BrandIndex":
+        manifest = json.loads((index_dir / "manifest.json").read_text(encoding="utf-8"))
+        return cls(
+            vocab={term: i for i, term in enumerate(manifest["vocab"])},
+            idf=np.load(index_dir / manifest["idf"], mmap_mode="r"),
+            profile=np.load(index_dir / manifest["profile"], mmap_mode="r"),
+            default_idf=manifest["default_idf"],
+            calibration=manifest["calibration"],
+            version=manifest["version"],
+        )
+
+
+def build_index(paths: Sequence[Path], index_dir: Path) -> str:
+    """Build the index from source documents and write it to index_dir."""
+    sections: List[str] = []
+    for path in paths:
+        text = path.read_text(encoding="utf-8")
+        sections.extend(s for s in _HEADING_RE.split(text) if len(s.split()) >= 5)
+    if not sections:
+        raise ValueError("No brand document sections to index")
+
+    section_counts = [Counter(tokenize(s)) for s in sections]
+    doc_freq = Counter(term for counts in section_counts for term in counts)
+    vocab = sorted(doc_freq)
+    term_index = {term: i for i, term in enumerate(vocab)}
+
+    n = len(sections)
+    idf = np.array([math.log((1 + n) / (1 + doc_freq[t])) + 1 for t in vocab], dtype=np.float64)
+    default_idf = math.log(1 + n) + 1
+
+    matrix = np.zeros((n, len(vocab)), dtype=np.float64)
+    for row, counts in enumerate(section_counts):
+        for term, count in counts.items():
+            matrix[row, term_index[term]] = count
+    matrix *= idf
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    profile = matrix.mean(axis=0)
+    profile /= np.linalg.norm(profile)
+
+    # Calibrate on sentences, which are closer to trend length than sections
+    index = BrandIndex(term_index, idf, profile, default_idf, 1.0, "")
+    sentences = [
+        sentence for section in sections for sentence in _SENTENCE_RE.split(section)
+        if len(sentence.split()) >= 5
+    ]
+    calibration = float(np.median(index.score_batch(sentences))) or 1.0
+
+    version = source_version(paths)
+    idf_name, profile_name = f"idf-{version}.npy", f"profile-{version}.npy"
+    index_dir.mkdir(parents=True, exist_ok=True)
+    # Stage on the same filesystem, then rename: a process mapping the old
+    # arrays keeps its inode, and loaders see the old or the new manifest whole
+    with tempfile.TemporaryDirectory(dir=index_dir, prefix=".build-") as staging_dir:
+        staging = Path(staging_dir)
+        np.save(staging / idf_name, idf.astype(np.float32))
+        np.save(staging / profile_name, profile.astype(np.float32))
+        (staging / "manifest.json").write_text(json.dumps({
+            "version": version,
+            "format": INDEX_FORMAT,
+            "sources": [str(p) for p in paths],
+            "sections": n,
+            "default_idf": default_idf,
+            "calibration": calibration,
+            "idf": idf_name,
+            "profile": profile_name,
+            "vocab": vocab,
+        }), encoding="utf-8")
+        for name in (idf_name, profile_name, "manifest.json"):
+            os.replace(staging / name, index_dir / name)
+    _remove_stale_arrays(index_dir, keep={idf_name, profile_name})
+    return version
+
+
+def _remove_stale_arrays(index_dir: Path, keep: set):
+    # Unlinking is safe for processes that still map a file; it goes when they unmap
+    for path in index_dir.glob("*.npy"):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+
+
+_index: Optional[BrandIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_brand_index() -> Optional[BrandIndex]:
+    """
+    Return the process-wide brand index, building it if the source docs
+    changed since the last build. Returns None when there are no docs.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = _load_or_build()
+    return _index
+
+
+def _load_or_build() -> Optional[BrandIndex]:
+    paths = source_paths()
+    if not paths:
+        logger.warning("No brand documents found; brand alignment falls back to keywords")
+        return None
+
+    index_dir = Path(settings.BRAND_INDEX_DIR)
+    version = source_version(paths)
+    try:
+        index = BrandIndex.load(index_dir)
+        if index.version == version:
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+
+    logger.info("Building brand index %s from %d documents", version, len(paths))
+    build_index(paths, index_dir)
+    return BrandIndex.load(index_dir)
+
+
+if __name__ == "__main__":
+    paths = source_paths()
+    version = build_index(paths, Path(settings.BRAND_INDEX_DIR))
+    print(f"Built brand index {version} from {len(paths)} documents into {settings.BRAND_INDEX_DIR}")
@@ -2,57 +2,140 @@
 AI-powered content generation service with Based Labs brand voice.
 """
 
-from typing import Dict, Any, Optional
-import openai
-from openai import AsyncOpenAI
+import json
+import re
+from typing import Dict, Any, List, Optional, Sequence
 
 from app.core.config import settings
+from app.core.telemetry import span
 from app.models.trend_opportunity import TrendOpportunity
 from app.models.generated_content import GeneratedContent
+from app.models.content_package import ContentPackage
+from app.services.dedup_index import DuplicateContentError, get_dedup_index
+from app.services.llm_providers import LLMProvider, get_llm_provider
+from app.services.prompt_templates import get_prompt_library
 
 
 class ContentGeneratorService:
     """Service for generating content using AI with brand voice consistency."""
     
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, provider: Optional[LLMProvider] = None):
+        self.provider = provider or get_llm_provider()
         self.provocative_level = settings.BRAND_PROVOCATIVE_LEVEL
         
-        # Based Labs hook formulas
-        self.hook_formulas = [
-            "You're waiting for permission that will never come",
-            "This rule made sense in 1950. It's destroying you in 2025",
-            "Everyone does X, but here's why Y works better",
-            "If [system] can replace you, it's not your fault—it's the system you were trained for",
-        ]
+        # Compiled once per process; reloads when the steering files change
+        self.prompts = get_prompt_library()
+        self.dedup = get_dedup_index() if settings.DEDUP_ENABLED else None
+    
+    @property
+    def hook_formulas(self) -> List[str]:
+        """Based Labs hook formulas from the brand voice steering file."""
+        return self.prompts.hook_formulas
     
     async def generate_content(
         self, 
         opportunity: TrendOpportunity,
-        content_type: Optional[str] = None
+        content_type: Optional[str] = None,
+        allow_duplicate: bool = False,
+        platform: str = "instagram",
     ) -> GeneratedContent:
-        """Generate content from a trend opportunity."""
+        """
+        Generate content from a trend opportunity.
+        
+        Raises DuplicateContentError when a near-identical trend already has
+        content, or the generated text nearly matches existing content.
+        """
+        dedup = None if allow_duplicate else self.dedup
+        
+        # Skip the LLM call entirely for stories we've already covered
+        if dedup is not None:
+            match = dedup.find_generated_trend(opportunity)
+            if match:
+                raise DuplicateContentError(match)
         
         # Determine content type if not specified
         if not content_type:
             content_type = self._determine_content_type(opportunity)
         
         # Generate content using AI
-        content_text = await self._generate_text(opportunity, content_type)
+        content_text = await self._generate_text(opportunity, content_type, platform)
         
         # Validate content quality
         if not self._validate_content(content_text):
             # Regenerate if quality check fails
-            content_text = await self._generate_text(opportunity, content_type)
+            content_text = await self._generate_text(opportunity, content_type, platform)
+        
+        if dedup is not None:
+            match = dedup.find_similar_content(content_text)
+            if match:
+                raise DuplicateContentError(match)
         
         return GeneratedContent(
             trend_opportunity_id=opportunity.id,
             content_type=content_type,
             text=content_text,
-            platform="instagram",  # Default platform
+            platform=platform,
             status="generated",
         )
     
+    async def generate_variants(
+        self,
+        opportunity: TrendOpportunity,
+        platforms: Sequence[str],
+        content_type: Optional[str] = None,
+        allow_duplicate: bool = False,
+    ) -> ContentPackage:
+        """
+        Generate one variant per platform from a single completion.
+        
+        The brand voice system prompt is sent once and the model returns a
+        JSON object keyed by platform. Each variant is validated on its own;
+        only variants that are missing or fail validation are regenerated
+        with a single-platform call. Variants are returned as sibling
+        GeneratedContent rows grouped under a new ContentPackage.
+        """
+        platforms = list(dict.fromkeys(p.lower() for p in platforms))
+        dedup = None if allow_duplicate else self.dedup
+        
+        if dedup is not None:
+            match = dedup.find_generated_trend(opportunity)
+            if match:
+                raise DuplicateContentError(match)
+        
+        if not content_type:
+            content_type = self._determine_content_type(opportunity)
+        
+        variants: Dict[str, str] = {}
+        if len(platforms) > 1:
+            variants = await self._generate_variant_texts(opportunity, content_type, platforms)
+        
+        contents = []
+        for platform in platforms:
+            text = variants.get(platform, "")
+            if not self._validate_content(text):
+                text = await self._generate_text(opportunity, content_type, platform)
+            
+            if dedup is not None:
+                match = dedup.find_similar_content(text)
+                if match:
+                    raise DuplicateContentError(match)
+            
+            contents.append(GeneratedContent(
+                trend_opportunity_id=opportunity.id,
+                content_type=content_type,
+                text=text,
+                platform=platform,
+                status="generated",
+            ))
+        
+        package = ContentPackage(
+            title=opportunity.title[:255],
+            description=f"{content_type} variants for {', '.join(platforms)}",
+            status="draft",
+        )
+        package.generated_content = contents
+        return package
+    
     def _determine_content_type(self, opportunity: TrendOpportunity) -> str:
         """Determine content type based on opportunity characteristics."""
         # Simple logic based on description length
@@ -65,68 +148,77 @@ class ContentGeneratorService:
         else:
             return "carousel_series"
     
-    async def _generate_text(self, opportunity: TrendOpportunity, content_type: str) -> str:
-        """Generate text content using OpenAI."""
+    async def _generate_text(
+        self,
+        opportunity: TrendOpportunity,
+        content_type: str,
+        platform: Optional[str] = None,
+    ) -> str:
+        """Generate text content using the configured LLM provider."""
         
-        system_prompt = self._build_system_prompt(content_type)
+        system_prompt = self._build_system_prompt(content_type, (platform,) if platform else ())
         user_prompt = self._build_user_prompt(opportunity)
         
-        response = await self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.8,
-            max_tokens=500,
-        )
+        with span("llm.generate_text"):
+            return await self.provider.complete(
+                system_prompt,
+                user_prompt,
+                temperature=0.8,
+                max_tokens=500,
+            )
+    
+    async def _generate_variant_texts(
+        self,
+        opportunity: TrendOpportunity,
+        content_type: str,
+        platforms: List[str],
+    ) -> Dict[str, str]:
+        """Request all platform variants in one JSON-mode completion."""
+        system_prompt = self._build_system_prompt(content_type, tuple(platforms))
+        user_prompt = self._build_user_prompt(opportunity)
         
-        return response.choices[0].message.content.strip()
+        with span("llm.generate_variants"):
+            raw = await self.provider.complete(
+                system_prompt,
+                user_prompt,
+                temperature=0.8,
+                max_tokens=500 * len(platforms),
+                json_mode=True,
+            )
+        return self._parse_variants(raw)
     
-    def _build_system_prompt(self, content_type: str) -> str:
+    def _parse_variants(self, raw: str) -> Dict[str, str]:
+        """Extract {platform: text} from a variants JSON completion."""
+        try:
+            data = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            # Models without JSON mode sometimes wrap the object in prose
+            match = re.search(r"\{.*\}", raw or "", re.DOTALL)
+            try:
+                data = json.loads(match.group(0)) if match else {}
+            except json.JSONDecodeError:
+                data = {}
+        
+        variants = data.get("variants", data) if isinstance(data, dict) else {}
+        if not isinstance(variants, dict):
+            return {}
+        return {
+            str(platform).lower(): text.strip()
+            for platform, text in variants.items()
+            if isinstance(text, str)
+        }
+    
+    def _build_system_prompt(self, content_type: str, platforms: tuple = ()) -> str:
         """Build system prompt with Based Labs brand voice."""
-        base_prompt = f"""
-        You are a content creator for Based Labs, generating {content_type} content.
-        
-        Brand Voice:
-        - Provocative level: {self.provocative_level}/10
-        - Challenge systems and structures, not individuals
-        - Direct, confident, slightly rebellious, empathetic
-        - Focus on agency over permission, system inefficiencies, gatekeeping
-        
-        Content Requirements:
-        - Clear value proposition for the reader
-        - Specific next action or call-to-action
-        - Connection to Based Labs philosophy (agency, systems, decentralization)
-        
-        Hook Formulas to Use:
-        {chr(10).join(f'- {hook}' for hook in self.hook_formulas)}
-        """
-        
-        if content_type == "quote_minimal":
-            base_prompt += "\nKeep under 100 characters. Focus on a single powerful insight."
-        elif content_type == "long_form":
-            base_prompt += "\nKeep between 100-800 characters. Explain a framework or concept."
-        else:
-            base_prompt += "\nCreate multi-slide content over 800 characters."
-        
-        return base_prompt
+        return self.prompts.system_prompt(content_type, platforms).text
     
     def _build_user_prompt(self, opportunity: TrendOpportunity) -> str:
-        """Build user prompt from trend opportunity."""
-        return f"""
-        Create content based on this trend opportunity:
-        
-        Title: {opportunity.title}
-        Description: {opportunity.description}
-        Source: {opportunity.source}
-        
-        Focus on:
-        - What system or rule is causing friction?
-        - Who benefits from the current system?
-        - How could individuals work around this?
-        - What would a decentralized alternative look like?
-        """
+        """Build user prompt from trend opportunity, trimmed to the token budget."""
+        return self.prompts.user_prompt(
+            opportunity.title,
+            opportunity.description,
+            opportunity.source,
+        )
     
     def _validate_content(self, content: str) -> bool:
         """Validate content against Based Labs quality standards."""
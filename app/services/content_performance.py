@@ -0,0 +1,136 @@
+"""
+Latest-metrics lookups for content pieces, behind a write-through cache.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.generated_content import GeneratedContent
+from app.models.post_metrics import PostMetrics
+from app.models.published_post import PublishedPost
+from app.schemas.analytics import ContentPerformance, EngagementMetrics, PublishedPostPerformance
+
+
+COUNTERS = ("likes", "comments", "shares", "saves", "impressions", "reach")
+
+performance_cache = TTLCache(
+    "performance",
+    ttl=settings.PERFORMANCE_CACHE_TTL_SECONDS,
+    local_ttl=settings.PERFORMANCE_CACHE_LOCAL_TTL_SECONDS,
+    max_local_entries=settings.PERFORMANCE_CACHE_MAX_LOCAL_ENTRIES,
+)
+
+
+class ContentPerformanceService:
+    """
+    Performance of content pieces from their published posts' latest snapshots.
+
+    Misses for any number of ids are resolved with one query: each
+    published post is joined LATERAL to its newest snapshot, a LIMIT 1
+    probe of the (post_id, collected_at DESC) index, so only the posts
+    asked about are read however long their history. Ingestion calls
+    refresh() after committing, so cached entries are rewritten rather
+    than left to expire.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, content_id: str) -> Optional[Dict[str, Any]]:
+        """Performance for one content piece, or None if it does not exist."""
+        return (await self.get_many([content_id])).get(content_id)
+
+    async def get_many(self, content_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Performance keyed by content id; unknown ids are left out."""
+        content_ids = [str(content_id) for content_id in dict.fromkeys(content_ids)]
+        found = await performance_cache.get_many(content_ids)
+        missing = [content_id for content_id in content_ids if content_id not in found]
+        if missing:
+            loaded = await self._load(missing)
+            await performance_cache.set_many(loaded)
+            found.update(loaded)
+        return {content_id: found[content_id] for content_id in content_ids if content_id in found}
+
+    async def refresh(self, content_ids: Iterable[str]) -> None:
+        """Write through fresh values for content whose metrics just changed."""
+        content_ids = list(dict.fromkeys(content_ids))
+        if content_ids:
+            await performance_cache.set_many(await self._load(content_ids))
+
+    async def _load(self, content_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        latest = (
+            select(
+                PostMetrics.collected_at,
+                PostMetrics.engagement_rate,
+                *(getattr(PostMetrics, counter) for counter in COUNTERS),
+            )
+            .where(
+                PostMetrics.post_id == PublishedPost.post_id,
+                PostMetrics.platform == PublishedPost.platform,
+            )
+            .order_by(PostMetrics.collected_at.desc())
+            .limit(1)
+            .lateral("latest")
+        )
+        result = await self.db.execute(
+            select(
+                GeneratedContent.id.label("content_id"),
+                PublishedPost.platform,
+                PublishedPost.post_id,
+                PublishedPost.url,
+                PublishedPost.published_at,
+                latest.c.collected_at,
+                latest.c.engagement_rate,
+                *(latest.c[counter] for counter in COUNTERS),
+            )
+            .select_from(GeneratedContent)
+            .outerjoin(PublishedPost, PublishedPost.content_id == GeneratedContent.id)
+            .outerjoin(latest, true())
+            .where(GeneratedContent.id.in_(content_ids))
+            .order_by(GeneratedContent.id, PublishedPost.published_at)
+        )
+
+        rows: Dict[str, List[Any]] = {}
+        for row in result:
+            rows.setdefault(row.content_id, []).append(row)
+        return {
+            content_id: self._summarize(content_id, content_rows).model_dump(mode="json")
+            for content_id, content_rows in rows.items()
+        }
+
+    @staticmethod
+    def _summarize(content_id: str, rows: List[Any]) -> ContentPerformance:
+        posts = [
+            PublishedPostPerformance(
+                platform=row.platform,
+                post_id=row.post_id,
+                url=row.url,
+                published_at=row.published_at,
+                collected_at=row.collected_at,
+                metrics=EngagementMetrics(
+                    **{counter: getattr(row, counter) or 0 for counter in COUNTERS},
+                    engagement_rate=row.engagement_rate or 0.0,
+                ),
+            )
+            for row in rows
+            if row.post_id is not None
+        ]
+        measured = [post for post in posts if post.collected_at is not None]
+        totals = EngagementMetrics(
+            **{counter: sum(getattr(post.metrics, counter) for post in measured) for counter in COUNTERS},
+            engagement_rate=(
+                sum(post.metrics.engagement_rate for post in measured) / len(measured) if measured else 0.0
+            ),
+        )
+        return ContentPerformance(
+            content_id=content_id,
+            metrics=totals,
+            posts=posts,
+            last_collected_at=max(
+                (post.collected_at for post in measured if post.collected_at is not None), default=None
+            ),
+        )
@@ -0,0 +1,239 @@
+"""
+Stages of the automated trend -> content -> image pipeline.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.content_package import ContentPackage
+from app.models.generated_content import GeneratedContent
+from app.models.trend_opportunity import TrendOpportunity
+from app.services.content_generator import ContentGeneratorService
+from app.services.dedup_index import DuplicateContentError
+from app.services.image_generator import get_image_generator
+
+logger = logging.getLogger(__name__)
+
+IDENTIFIED = "identified"
+GENERATING = "generating"
+PROCESSED = "processed"
+
+
+def idempotency_key(opportunity_id: str, platform: str) -> str:
+    return f"{opportunity_id}:{platform}"
+
+
+@dataclass
+class BatchResult:
+    """Outcome of generating one batch of opportunities."""
+    generated: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    failed: int = 0
+    content_ids: List[str] = field(default_factory=list)
+
+
+class ContentPipelineService:
+    """
+    Claims opportunities for generation, generates their content and
+    renders images, each step safe to repeat.
+
+    Claiming flips opportunities from identified to generating in one
+    UPDATE, so overlapping runs never pick the same ones; a claim that is
+    never finished becomes claimable again after
+    PIPELINE_CLAIM_TIMEOUT_SECONDS. Each content row carries an
+    idempotency key of (opportunity, platform) under a unique constraint,
+    and an opportunity's rows commit together with its move to processed.
+    Renders go to a fixed path per content row and are skipped once stored.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        generator: Optional[ContentGeneratorService] = None,
+        platforms: Sequence[str] = settings.PIPELINE_PLATFORMS,
+    ):
+        self.db = db
+        self._generator = generator
+        self.platforms = list(dict.fromkeys(platform.lower() for platform in platforms))
+
+    @property
+    def generator(self) -> ContentGeneratorService:
+        if self._generator is None:
+            self._generator = ContentGeneratorService()
+        return self._generator
+
+    async def claim_opportunities(self, limit: int) -> List[str]:
+        """Mark up to limit of the best unprocessed opportunities as generating."""
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=settings.PIPELINE_CLAIM_TIMEOUT_SECONDS)
+        candidates = (
+            select(TrendOpportunity.id)
+            .where(or_(
+                TrendOpportunity.status == IDENTIFIED,
+                (TrendOpportunity.status == GENERATING) & (TrendOpportunity.updated_at < stale),
+            ))
+            .order_by(TrendOpportunity.score.desc(), TrendOpportunity.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(TrendOpportunity)
+            .where(TrendOpportunity.id.in_(candidates))
+            .values(status=GENERATING, updated_at=now)
+            .returning(TrendOpportunity.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = list(result.scalars())
+        await self.db.commit()
+        return claimed
+
+    async def generate_batch(self, opportunity_ids: Sequence[str]) -> BatchResult:
+        """
+        Generate content for claimed opportunities.
+
+        LLM calls run concurrently, up to PIPELINE_GENERATION_CONCURRENCY;
+        results are written one opportunity per transaction. Opportunities
+        that are no longer claimed, or already have every platform's row,
+        are skipped. A failed generation returns its opportunity to
+        identified for a later run.
+        """
+        batch = BatchResult()
+        opportunities = list((await self.db.scalars(
+            select(TrendOpportunity).where(
+                TrendOpportunity.id.in_(opportunity_ids),
+                TrendOpportunity.status == GENERATING,
+            )
+        )).all())
+        batch.skipped += len(set(opportunity_ids)) - len(opportunities)
+        existing = set((await self.db.scalars(
+            select(GeneratedContent.idempotency_key).where(
+                GeneratedContent.trend_opportunity_id.in_([o.id for o in opportunities]),
+                GeneratedContent.idempotency_key.is_not(None),
+            )
+        )).all())
+
+        pending = []
+        for opportunity in opportunities:
+            if all(idempotency_key(opportunity.id, platform) in existing for platform in self.platforms):
+                await self._finish(opportunity.id, PROCESSED)
+                batch.skipped += 1
+            else:
+                pending.append(opportunity)
+
+        semaphore = asyncio.Semaphore(settings.PIPELINE_GENERATION_CONCURRENCY)
+
+        async def generate(opportunity: TrendOpportunity):
+            async with semaphore:
+                return await self._generate(opportunity)
+
+        outcomes = await asyncio.gather(*(generate(o) for o in pending), return_exceptions=True)
+        # Plain ids: a conflicting insert rolls back, which expires the loaded opportunities
+        pending_ids = [opportunity.id for opportunity in pending]
+        for opportunity_id, outcome in zip(pending_ids, outcomes):
+            if isinstance(outcome, DuplicateContentError):
+                await self._finish(opportunity_id, PROCESSED)
+                batch.duplicates += 1
+            elif isinstance(outcome, Exception):
+                logger.warning("Generation failed for opportunity %s: %s", opportunity_id, outcome)
+                await self._finish(opportunity_id, IDENTIFIED)
+                batch.failed += 1
+            elif isinstance(outcome, BaseException):
+                # Cancelled: leave the remaining claims to time out rather than store anything
+                raise outcome
+            else:
+                content_ids = await self._store(opportunity_id, outcome, existing)
+                if content_ids is None:
+                    batch.duplicates += 1
+                else:
+                    batch.generated += len(content_ids)
+                    batch.content_ids.extend(content_ids)
+        return batch
+
+    async def _generate(self, opportunity: TrendOpportunity) -> Union[ContentPackage, GeneratedContent]:
+        if len(self.platforms) > 1:
+            return await self.generator.generate_variants(opportunity, self.platforms)
+        return await self.generator.generate_content(opportunity, platform=self.platforms[0])
+
+    async def _store(
+        self,
+        opportunity_id: str,
+        generated: Union[ContentPackage, GeneratedContent],
+        existing: set,
+    ) -> Optional[List[str]]:
+        """Insert the new rows and mark the opportunity processed in one transaction."""
+        contents = generated.generated_content if isinstance(generated, ContentPackage) else [generated]
+        for content in contents:
+            content.idempotency_key = idempotency_key(opportunity_id, content.platform)
+        if isinstance(generated, ContentPackage):
+            generated.generated_content = [c for c in contents if c.idempotency_key not in existing]
+            contents = generated.generated_content
+        elif contents[0].idempotency_key in existing:
+            contents = []
+        if contents:
+            self.db.add(generated)
+        try:
+            await self._finish(opportunity_id, PROCESSED, commit=False)
+            await self.db.commit()
+        except IntegrityError:
+            # Another run stored this opportunity first
+            await self.db.rollback()
+            await self._finish(opportunity_id, PROCESSED)
+            return None
+        return [content.id for content in contents]
+
+    async def _finish(self, opportunity_id: str, status: str, commit: bool = True):
+        await self.db.execute(
+            update(TrendOpportunity)
+            .where(TrendOpportunity.id == opportunity_id, TrendOpportunity.status == GENERATING)
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
+            await self.db.commit()
+
+    async def render_image(self, content_id: str) -> Optional[str]:
+        """
+        Render a content row's image to PIPELINE_IMAGE_DIR and record the path.
+
+        Returns "rendered", "skipped" when the stored image already exists,
+        or None for an unknown content id.
+        """
+        content = await self.db.get(GeneratedContent, content_id)
+        if content is None:
+            return None
+        if content.image_path and Path(content.image_path).is_file():
+            return "skipped"
+
+        path = Path(settings.PIPELINE_IMAGE_DIR) / f"{content_id}.png"
+        # Off the event loop, which worker tasks share
+        await asyncio.to_thread(_render_to, path, content.text, content.content_type, content.platform)
+
+        content.image_path = str(path)
+        await self.db.commit()
+        return "rendered"
+
+
+def _render_to(path: Path, text: str, content_type: str, platform: str):
+    generator = get_image_generator()
+    image = generator.generate_post(
+        {"main_text": text, "type": content_type, "platform": platform},
+        generator._map_content_type_to_template(content_type),
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so a retried or concurrent render never leaves a partial file
+    partial = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    image.save(partial, "PNG", optimize=True)
+    os.replace(partial, path)
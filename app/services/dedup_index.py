@@ -0,0 +1,406 @@
+"""
+Near-duplicate detection for trend opportunities and generated content.
+
+Texts are reduced to MinHash signatures over word unigrams and bigrams and
+bucketed by bands (locality-sensitive hashing), so a lookup only compares the
+handful of rows sharing a band with the probe. Band keys are kept in sorted
+NumPy arrays and searched with binary search, which keeps memory flat and
+lookups sub-millisecond at hundreds of thousands of rows.
+
+Signatures are appended to a fixed-record log on disk. The log is replayed on
+startup and tailed on lookup to pick up rows indexed by other processes.
+Committed rows are logged from a session hook; rows that predate the index
+are added with `python -m app.services.dedup_index`.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.generated_content import GeneratedContent
+from app.models.trend_opportunity import TrendOpportunity
+
+logger = logging.getLogger(__name__)
+
+KIND_TREND = b"T"
+KIND_CONTENT = b"C"
+KIND_GENERATED = b"G"  # trend opportunity that has generated content
+
+NUM_PERM = 32
+ROWS_PER_BAND = 4  # 4 x uint16 rows pack into one uint64 band key
+NUM_BANDS = NUM_PERM // ROWS_PER_BAND
+
+RECORD = np.dtype([("kind", "S1"), ("sig", "<u2", (NUM_PERM,)), ("id", "S36")])
+
+_rng = np.random.default_rng(0x5EED)  # fixed so every process hashes alike
+_HASH_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+_SHIFT = np.uint64(48)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    """An indexed row that is a near-duplicate of the probed text."""
+    kind: str  # trend, content
+    id: str
+    similarity: float
+
+
+class DuplicateContentError(Exception):
+    """Raised when generation would produce a near-duplicate."""
+
+    def __init__(self, match: DuplicateMatch):
+        self.match = match
+        super().__init__(
+            f"Near-duplicate of {match.kind} {match.id} "
+            f"(similarity {match.similarity:.2f})"
+        )
+
+
+def minhash(text: str) -> np.ndarray:
+    """Return the MinHash signature of text over word unigrams and bigrams."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = set(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    if not features:
+        return np.full(NUM_PERM, np.iinfo(np.uint16).max, dtype=np.uint16)
+
+    hashes = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little")
+            for f in features
+        ),
+        dtype=np.uint64,
+        count=len(features),
+    )
+    # Multiply-shift hashing, keeping the top 16 bits of each permutation
+    permuted = (hashes[:, None] * _HASH_A + _HASH_B) >> _SHIFT
+    return permuted.astype(np.uint16).min(axis=0)
+
+
+class _SignatureTable:
+    """Signatures for one kind of row, with a sorted key array per band."""
+
+    MERGE_THRESHOLD = 2048
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.signatures = np.empty((1024, NUM_PERM), dtype=np.uint16)
+        # Rows [0, merged) are in the sorted band arrays; later rows are scanned
+        self.merged = 0
+        self.sorted_keys = np.empty((NUM_BANDS, 0), dtype=np.uint64)
+        self.sorted_rows = np.empty((NUM_BANDS, 0), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: List[str], signatures: np.ndarray):
+        fresh = [i for i, row_id in enumerate(ids) if row_id not in self.positions]
+        if not fresh:
+            return
+        start = len(self.ids)
+        end = start + len(fresh)
+        if end > len(self.signatures):
+            grown = np.empty((max(end, len(self.signatures) * 2), NUM_PERM), dtype=np.uint16)
+            grown[:start] = self.signatures[:start]
+            self.signatures = grown
+        self.signatures[start:end] = signatures[fresh]
+        for offset, i in enumerate(fresh):
+            self.positions[ids[i]] = start + offset
+            self.ids.append(ids[i])
+
+        # Re-sort once the unsorted tail is large relative to the sorted part
+        if end - self.merged > max(self.MERGE_THRESHOLD, self.merged // 16):
+            self._merge()
+
+    def query(self, signature: np.ndarray, threshold: float) -> List[Tuple[str, float]]:
+        probe = self._band_keys(signature[None, :])[0]
+        candidates = []
+        for band in range(NUM_BANDS):
+            keys = self.sorted_keys[band]
+            lo = np.searchsorted(keys, probe[band], side="left")
+            hi = np.searchsorted(keys, probe[band], side="right")
+            if hi > lo:
+                candidates.append(self.sorted_rows[band, lo:hi])
+
+        total = len(self.ids)
+        if total > self.merged:
+            pending = self._band_keys(self.signatures[self.merged:total])
+            hits = np.nonzero((pending == probe).any(axis=1))[0]
+            candidates.append(hits + self.merged)
+
+        if not candidates:
+            return []
+        rows = np.unique(np.concatenate(candidates))
+        similarity = (self.signatures[rows] == signature).mean(axis=1)
+        keep = similarity >= threshold
+        order = np.argsort(-similarity[keep], kind="stable")
+        return [
+            (self.ids[row], float(score))
+            for row, score in zip(rows[keep][order], similarity[keep][order])
+        ]
+
+    def _merge(self):
+        total = len(self.ids)
+        keys = self._band_keys(self.signatures[:total]).T
+        order = np.argsort(keys, axis=1, kind="stable")
+        self.sorted_keys = np.take_along_axis(keys, order, axis=1)
+        self.sorted_rows = order
+        self.merged = total
+
+    @staticmethod
+    def _band_keys(signatures: np.ndarray) -> np.ndarray:
+        return np.ascontiguousarray(signatures).view(np.uint64)
+
+
+class MinHashIndex:
+    """MinHash LSH index over trends and generated content, backed by a record log."""
+
+    def __init__(self, path: str, threshold: float = 0.75):
+        self.path = Path(path)
+        self.threshold = threshold
+
+        # _lock guards the in-memory tables, _log_lock the log offset; lookups
+        # only ever wait on the former, never on file I/O
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._tables = {KIND_TREND: _SignatureTable(), KIND_CONTENT: _SignatureTable()}
+        self._generated: Set[str] = set()
+        self._offset = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._sync()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(table) for table in self._tables.values())
+
+    def add_trend(self, opportunity: TrendOpportunity):
+        """Index a trend opportunity by title and description."""
+        self.append(self.records_for(opportunity))
+
+    def add_content(self, content: GeneratedContent):
+        """Index generated content text and mark its trend as generated."""
+        self.append(self.records_for(content))
+
+    def records_for(self, obj) -> np.ndarray:
+        """Build the log records for a trend opportunity or generated content row."""
+        if isinstance(obj, TrendOpportunity):
+            records = np.zeros(1, dtype=RECORD)
+            records[0] = (KIND_TREND, self._trend_signature(obj), str(obj.id))
+            return records
+        records = np.zeros(2, dtype=RECORD)
+        records[0] = (KIND_CONTENT, minhash(obj.text), str(obj.id))
+        records[1]["kind"] = KIND_GENERATED
+        records[1]["id"] = str(obj.trend_opportunity_id)
+        return records
+
+    def similar_trends(self, opportunity: TrendOpportunity) -> List[DuplicateMatch]:
+        """Return other indexed trends close to this opportunity."""
+        return [
+            DuplicateMatch(kind="trend", id=row_id, similarity=score)
+            for row_id, score in self._query(KIND_TREND, self._trend_signature(opportunity))
+            if row_id != str(opportunity.id)
+        ]
+
+    def find_generated_trend(self, opportunity: TrendOpportunity) -> Optional[DuplicateMatch]:
+        """Return the closest similar trend that already has generated content."""
+        matches = self.similar_trends(opportunity)
+        with self._lock:
+            return next((match for match in matches if match.id in self._generated), None)
+
+    def find_similar_content(self, text: str) -> Optional[DuplicateMatch]:
+        """Return the closest indexed content above the similarity threshold."""
+        matches = self._query(KIND_CONTENT, minhash(text))
+        if not matches:
+            return None
+        row_id, score = matches[0]
+        return DuplicateMatch(kind="content", id=row_id, similarity=score)
+
+    def contains(self, kind: bytes, row_id: str) -> bool:
+        """Whether a trend or content row is already indexed."""
+        with self._lock:
+            return row_id in self._tables[kind].positions
+
+    def append(self, records: np.ndarray):
+        """Persist records to the log and apply them to the in-memory index."""
+        with self._log_lock:
+            with open(self.path, "ab") as log:
+                log.write(records.tobytes())
+            # Replays our records along with anything other processes appended
+            self._sync_locked()
+
+    def _query(self, kind: bytes, signature: np.ndarray) -> List[Tuple[str, float]]:
+        self._sync()
+        # add() may grow the signature array and re-sort the bands underneath us
+        with self._lock:
+            return self._tables[kind].query(signature, self.threshold)
+
+    def _sync(self):
+        """Replay records appended since the last read."""
+        try:
+            size = os.stat(self.path).st_size
+        except FileNotFoundError:
+            return
+        if size - self._offset >= RECORD.itemsize:
+            with self._log_lock:
+                self._sync_locked()
+
+    def _sync_locked(self):
+        try:
+            with open(self.path, "rb") as log:
+                log.seek(self._offset)
+                data = log.read()
+        except FileNotFoundError:
+            return
+        # Ignore a trailing partial record still being written
+        usable = len(data) - len(data) % RECORD.itemsize
+        if usable:
+            with self._lock:
+                self._replay(np.frombuffer(data[:usable], dtype=RECORD))
+            self._offset += usable
+
+    def _replay(self, records: np.ndarray):
+        for kind, table in self._tables.items():
+            rows = records[records["kind"] == kind]
+            if len(rows):
+                table.add([row_id.decode("ascii") for row_id in rows["id"]], rows["sig"])
+        generated = records[records["kind"] == KIND_GENERATED]["id"]
+        self._generated.update(row_id.decode("ascii") for row_id in generated)
+
+    @staticmethod
+    def _trend_signature(opportunity: TrendOpportunity) -> np.ndarray:
+        return minhash(f"{opportunity.title} {opportunity.description}")
+
+
+_index: Optional[MinHashIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_dedup_index() -> MinHashIndex:
+    """Return the process-wide duplicate index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = MinHashIndex(
+                    settings.DEDUP_INDEX_PATH,
+                    threshold=settings.DEDUP_SIMILARITY_THRESHOLD,
+                )
+    return _index
+
+
+async def backfill(session: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    Index trend opportunities and generated content committed before the
+    index existed, or while DEDUP_ENABLED was off. Rows already in the log
+    are skipped, so it is safe to re-run. Returns the number of rows added.
+    """
+    index = get_dedup_index()
+    added = 0
+
+    trends = await session.stream(
+        select(TrendOpportunity.id, TrendOpportunity.title, TrendOpportunity.description)
+        .execution_options(yield_per=batch_size)
+    )
+    async for rows in trends.partitions():
+        fresh = [row for row in rows if not index.contains(KIND_TREND, str(row.id))]
+        if fresh:
+            records = np.zeros(len(fresh), dtype=RECORD)
+            records["kind"] = KIND_TREND
+            records["sig"] = [minhash(f"{row.title} {row.description}") for row in fresh]
+            records["id"] = [str(row.id) for row in fresh]
+            await asyncio.to_thread(index.append, records)
+            added += len(fresh)
+
+    contents = await session.stream(
+        select(GeneratedContent.id, GeneratedContent.text, GeneratedContent.trend_opportunity_id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for rows in contents.partitions():
+        fresh = [row for row in rows if not index.contains(KIND_CONTENT, str(row.id))]
+        if fresh:
+            # One content record and one generated-trend marker per row, as records_for builds
+            records = np.zeros(2 * len(fresh), dtype=RECORD)
+            records["kind"][0::2] = KIND_CONTENT
+            records["sig"][0::2] = [minhash(row.text) for row in fresh]
+            records["id"][0::2] = [str(row.id) for row in fresh]
+            records["kind"][1::2] = KIND_GENERATED
+            records["id"][1::2] = [str(row.trend_opportunity_id) for row in fresh]
+            await asyncio.to_thread(index.append, records)
+            added += len(fresh)
+
+    return added
+
+
+# Index rows as they are committed; rolled-back inserts never reach the log.
+# Signatures are computed at flush time, while attributes are still loaded.
+
+@event.listens_for(Session, "after_flush")
+def _collect_new_rows(session: Session, flush_context):
+    if not settings.DEDUP_ENABLED:
+        return
+    rows = [
+        obj for obj in session.new
+        if isinstance(obj, (TrendOpportunity, GeneratedContent))
+    ]
+    if not rows:
+        return
+    index = get_dedup_index()
+    pending = session.info.setdefault("dedup_pending", [])
+    pending.extend(index.records_for(obj) for obj in rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _index_committed_rows(session: Session):
+    pending = session.info.pop("dedup_pending", None)
+    if not pending:
+        return
+    records = np.concatenate(pending)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # A plain Session outside any event loop
+        get_dedup_index().append(records)
+        return
+    # AsyncSession commits run on the event loop; keep the log write off it
+    loop.run_in_executor(None, get_dedup_index().append, records).add_done_callback(_log_append_failure)
+
+
+def _log_append_failure(future: "asyncio.Future[None]"):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Failed to index committed rows", exc_info=future.exception())
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_rows(session: Session, previous_transaction):
+    session.info.pop("dedup_pending", None)
+
+
+async def _main():
+    try:
+        async with AsyncSessionLocal() as session:
+            added = await backfill(session)
+    finally:
+        await engine.dispose()
+    print(f"Indexed {added} existing rows into {settings.DEDUP_INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from app.core.telemetry import span, traced
 from app.models.generated_content import GeneratedContent
 
 # Try to import advanced libraries (graceful fallback)
@@ -58,6 +59,7 @@ class BasedLabsImageGenerator:
         self.fonts_dir = Path(fonts_dir)
         self.templates = self._load_templates()
         self.font_cache = {}
+        self.background_cache: Dict[str, Image.Image] = {}
         
         # Create directories if they don't exist
         self.templates_dir.mkdir(exist_ok=True)
@@ -165,6 +167,7 @@ class BasedLabsImageGenerator:
         }
         return mapping.get(content_type, "long_form")
     
+    @traced("render.generate_post")
     def generate_post(self, content: Dict, template_name: Optional[str] = None) -> Image.Image:
         """
         Generate a professional social media post
@@ -183,13 +186,16 @@ class BasedLabsImageGenerator:
         template = self.templates[template_name]
         
         # Create base image
-        img = self._create_base_image(template)
+        with span("render.base_image"):
+            img = self._create_base_image(template)
         
         # Apply professional effects
-        img = self._apply_professional_effects(img)
+        with span("render.effects"):
+            img = self._apply_professional_effects(img)
         
         # Add text content
-        img = self._add_text_content(img, content, template)
+        with span("render.text"):
+            img = self._add_text_content(img, content, template)
         
         return img
     
@@ -210,13 +216,28 @@ class BasedLabsImageGenerator:
     
     def _create_base_image(self, template: Template) -> Image.Image:
         """Create base image with template background"""
-        bg_path = self.templates_dir / template.background_path
+        # Decode each background once; renders draw on a copy
+        if template.background_path not in self.background_cache:
+            bg_path = self.templates_dir / template.background_path
+            
+            if bg_path.exists():
+                background = Image.open(bg_path).convert("RGBA")
+            else:
+                # Create default Based Labs background
+                background = self._create_default_background()
+            self.background_cache[template.background_path] = background
         
-        if bg_path.exists():
-            return Image.open(bg_path).convert("RGBA")
-        else:
-            # Create default Based Labs background
-            return self._create_default_background()
+        return self.background_cache[template.background_path].copy()
+    
+    def warm(self):
+        """Decode template backgrounds and load every font size the layouts can try."""
+        min_size = 12
+        for template in self.templates.values():
+            self._create_base_image(template)
+            for area in template.text_areas.values():
+                for size in range(area.font_size, min_size - 1, -2):
+                    self._load_font(size)
+            self._load_font(min_size)
     
     def _create_default_background(self) -> Image.Image:
         """Create default Based Labs branded background"""
@@ -437,10 +458,7 @@ class ImageGeneratorService:
     """Service wrapper for the BasedLabsImageGenerator"""
     
     def __init__(self):
-        self.generator = BasedLabsImageGenerator(
-            templates_dir="templates",
-            fonts_dir="fonts"
-        )
+        self.generator = get_image_generator()
     
     async def generate_image_for_content(self, content: GeneratedContent) -> Image.Image:
         """Generate image for content with proper async handling"""
@@ -449,4 +467,18 @@ class ImageGeneratorService:
     async def save_image(self, image: Image.Image, output_path: str) -> str:
         """Save generated image to file"""
         image.save(output_path, "PNG", optimize=True)
-        return output_path
\ No newline at end of file
+        return output_path
+
+
+_generator: Optional[BasedLabsImageGenerator] = None
+
+
+def get_image_generator() -> BasedLabsImageGenerator:
+    """Return the process-wide generator, so fonts and backgrounds load once."""
+    global _generator
+    if _generator is None:
+        _generator = BasedLabsImageGenerator(
+            templates_dir="templates",
+            fonts_dir="fonts"
+        )
+    return _generator
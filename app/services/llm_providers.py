@@ -0,0 +1,191 @@
+"""
+LLM provider interface with OpenAI and deterministic local implementations.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+
+
+class LLMProviderError(Exception):
+    """Raised when a provider fails to return a completion."""
+
+
+class LLMProvider(ABC):
+    """Abstract base class for chat completion providers."""
+
+    name: str = "base"
+    model: str = ""
+
+    @abstractmethod
+    async def complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.8,
+        max_tokens: int = 500,
+        json_mode: bool = False,
+    ) -> str:
+        """
+        Return the completion text for a system and user prompt.
+
+        json_mode asks for a JSON object; the prompt must describe its shape.
+        """
+        pass
+
+
+class OpenAIProvider(LLMProvider):
+    """Chat completions served by the OpenAI API."""
+
+    name = "openai"
+
+    def __init__(self, model: str = settings.LLM_MODEL, api_key: str = settings.OPENAI_API_KEY):
+        self.model = model
+        self.client = AsyncOpenAI(api_key=api_key)
+
+    async def complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.8,
+        max_tokens: int = 500,
+        json_mode: bool = False,
+    ) -> str:
+        extra: Dict[str, Any] = {}
+        if json_mode and settings.LLM_JSON_RESPONSE_FORMAT:
+            # Only newer models accept response_format; older ones rely on the prompt
+            extra["response_format"] = {"type": "json_object"}
+
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra,
+        )
+        return response.choices[0].message.content.strip()
+
+
+class FakeLLMProvider(LLMProvider):
+    """
+    Offline stand-in that returns deterministic, validation-passing text.
+
+    The same prompts always produce the same text. Latency, jitter and
+    error rate are injected so the pipeline can be load-tested without
+    network access or API spend.
+    """
+
+    name = "fake"
+
+    HOOKS = [
+        "You're waiting for permission that will never come.",
+        "This rule made sense in 1950. It's destroying you in 2025.",
+        "Everyone follows the old playbook, but here's why building your own works better.",
+        "If a system can replace you, it's not your fault. It's the system you were trained for.",
+    ]
+    BODIES = [
+        "The gatekeepers behind {topic} benefit from you asking for approval. "
+        "The workaround is simple: start small, ship in public, and let results replace credentials.",
+        "{topic} shows how outdated rules create friction by design. "
+        "You don't need to fix the whole system, just route around it with tools you own.",
+        "Most people treat {topic} as a fixed constraint. "
+        "It's a design choice, and design choices can be iterated on by anyone willing to build.",
+    ]
+    CTAS = [
+        "What permission are you still waiting for?",
+        "Which outdated rule are you ready to ignore?",
+        "How are you building agency in your work?",
+        "What system needs redesigning in your industry?",
+    ]
+
+    def __init__(
+        self,
+        latency_ms: float = settings.FAKE_LLM_LATENCY_MS,
+        jitter_ms: float = settings.FAKE_LLM_JITTER_MS,
+        error_rate: float = settings.FAKE_LLM_ERROR_RATE,
+        seed: Optional[int] = settings.FAKE_LLM_SEED,
+    ):
+        self.model = "fake"
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    async def complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.8,
+        max_tokens: int = 500,
+        json_mode: bool = False,
+    ) -> str:
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise LLMProviderError("Injected fake provider failure")
+
+        if json_mode:
+            return self.render_variants(system_prompt, user_prompt)
+        return self.render(system_prompt, user_prompt)
+
+    def render_variants(self, system_prompt: str, user_prompt: str) -> str:
+        """Build a deterministic JSON object with one variant per requested platform."""
+        platforms = self._match(r"one variant per platform: (.+)\.", system_prompt) or "instagram"
+        variants = {
+            platform.strip(): self.render(f"{system_prompt}\0{platform.strip()}", user_prompt)
+            for platform in platforms.split(",")
+        }
+        return json.dumps({"variants": variants})
+
+    def render(self, system_prompt: str, user_prompt: str) -> str:
+        """Build the deterministic completion for a pair of prompts."""
+        digest = hashlib.sha256(f"{system_prompt}\0{user_prompt}".encode("utf-8")).digest()
+        hook = self.HOOKS[digest[0] % len(self.HOOKS)]
+        cta = self.CTAS[digest[1] % len(self.CTAS)]
+
+        content_type = self._match(r"generating (\w+) content", system_prompt) or "long_form"
+        if content_type == "quote_minimal":
+            return f"Stop waiting. Why ask? {cta}"[:99]
+
+        topic = self._match(r"Title: (.+)", user_prompt) or "this trend"
+        body = self.BODIES[digest[2] % len(self.BODIES)].format(topic=topic.strip()[:80])
+        text = f"{hook}\n\n{body}\n\n{cta}"
+        if content_type == "carousel_series":
+            slides = [
+                f"{index}/7 {self.BODIES[(digest[index] + index) % len(self.BODIES)].format(topic=topic.strip()[:80])}"
+                for index in range(1, 7)
+            ]
+            text = "\n\n".join([hook, *slides, f"7/7 {cta}"])
+        return text
+
+    @staticmethod
+    def _match(pattern: str, text: str) -> Optional[str]:
+        match = re.search(pattern, text)
+        return match.group(1) if match else None
+
+
+_PROVIDERS = {
+    "openai": OpenAIProvider,
+    "fake": FakeLLMProvider,
+}
+
+
+def get_llm_provider(name: Optional[str] = None) -> LLMProvider:
+    """Create the provider selected by LLM_PROVIDER."""
+    name = (name or settings.LLM_PROVIDER).lower()
+    if name not in _PROVIDERS:
+        raise ValueError(f"Unknown LLM provider: {name}")
+    return _PROVIDERS[name]()
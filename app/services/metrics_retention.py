@@ -0,0 +1,223 @@
+"""
+Partition upkeep, downsampling and expiry for post metrics snapshots.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.metrics_rollup import PostMetricsHourly
+
+logger = logging.getLogger(__name__)
+
+PARENT = "post_metrics"
+DEFAULT_PARTITION = "post_metrics_default"
+DOWNSAMPLED = "downsampled:day"
+# Longest a downsample waits for the parent's lock before giving up until the next run
+SWAP_LOCK_TIMEOUT = "5s"
+BOUNDS_CHECK = "partition_bounds"
+
+_PARTITION_NAME = re.compile(r"^post_metrics_(\d{4})_(\d{2})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT}_{month.year:04d}_{month.month:02d}"
+
+
+@dataclass
+class Partition:
+    """A monthly post_metrics partition."""
+    name: str
+    month: datetime
+    downsampled: bool = False
+
+    @property
+    def end(self) -> datetime:
+        return add_months(self.month, 1)
+
+
+@dataclass
+class RetentionSummary:
+    """What one retention run changed."""
+    created: List[str] = field(default_factory=list)
+    downsampled: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+    hourly_rollups_pruned: int = 0
+
+
+class MetricsRetentionService:
+    """
+    Keeps the monthly post_metrics partitions in shape.
+
+    Creates partitions ahead of time, compacts whole months older than the
+    downsample age to the last snapshot per post per day by swapping in a
+    compacted copy, and drops months past retention with DETACH and DROP
+    rather than row deletes. Rollups are unaffected: they already hold
+    the last snapshot per bucket.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def run(self, now: Optional[datetime] = None) -> RetentionSummary:
+        now = now or datetime.utcnow()
+        summary = RetentionSummary()
+        summary.created = await self.ensure_partitions(now)
+        summary.dropped = await self.drop_expired(now - timedelta(days=settings.METRICS_RETENTION_DAYS))
+        summary.downsampled = await self.downsample(now - timedelta(days=settings.METRICS_DOWNSAMPLE_AFTER_DAYS))
+        summary.hourly_rollups_pruned = await self.prune_hourly_rollups(
+            now - timedelta(days=settings.METRICS_HOURLY_ROLLUP_RETENTION_DAYS)
+        )
+        return summary
+
+    async def partitions(self) -> List[Partition]:
+        """Monthly partitions, oldest first; the default partition is left out."""
+        result = await self.db.execute(
+            text(
+                "SELECT c.relname, obj_description(c.oid, 'pg_class') "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:parent AS regclass)"
+            ),
+            {"parent": PARENT},
+        )
+        partitions = []
+        for name, comment in result:
+            match = _PARTITION_NAME.match(name)
+            if match:
+                month = datetime(int(match.group(1)), int(match.group(2)), 1)
+                partitions.append(Partition(name, month, comment == DOWNSAMPLED))
+        return sorted(partitions, key=lambda partition: partition.month)
+
+    async def ensure_partitions(self, now: datetime) -> List[str]:
+        """Create partitions for the current month and the configured months ahead."""
+        existing = {partition.month for partition in await self.partitions()}
+        created = []
+        for offset in range(settings.METRICS_PARTITION_MONTHS_AHEAD + 1):
+            month = add_months(month_start(now), offset)
+            if month not in existing:
+                await self._create_partition(month)
+                created.append(partition_name(month))
+        return created
+
+    async def _create_partition(self, month: datetime) -> None:
+        name, start, end = partition_name(month), month, add_months(month, 1)
+        await self._execute(f'CREATE TABLE "{name}" (LIKE {PARENT} INCLUDING DEFAULTS)')
+        # Rows for this month may already sit in the default partition; attaching
+        # would fail on them, so move them into the new table first
+        await self.db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                f"WHERE collected_at >= :start AND collected_at < :end RETURNING *) "
+                f'INSERT INTO "{name}" SELECT * FROM moved'
+            ),
+            {"start": start, "end": end},
+        )
+        await self._add_bounds_check(name, start, end)
+        await self._attach(name, start, end)
+        await self.db.commit()
+        logger.info("Created post_metrics partition %s", name)
+
+    async def downsample(self, before: datetime) -> List[str]:
+        """Compact every month that ended before the cutoff to daily snapshots."""
+        downsampled = []
+        for partition in await self.partitions():
+            if not partition.downsampled and partition.end <= before:
+                await self._downsample_partition(partition)
+                downsampled.append(partition.name)
+        return downsampled
+
+    async def _downsample_partition(self, partition: Partition) -> None:
+        name, compacted = partition.name, f"{partition.name}_daily"
+        # Hold off late writes to the month while it is copied; reads carry on
+        await self._execute(f'LOCK TABLE "{name}" IN SHARE MODE')
+        await self._execute(f'CREATE TABLE "{compacted}" (LIKE {PARENT} INCLUDING DEFAULTS)')
+        await self._execute(
+            f'INSERT INTO "{compacted}" '
+            f"SELECT DISTINCT ON (platform, post_id, date_trunc('day', collected_at)) * "
+            f'FROM "{name}" '
+            f"ORDER BY platform, post_id, date_trunc('day', collected_at), collected_at DESC"
+        )
+        # Everything ATTACH would otherwise build or scan under the parent's
+        # lock is done here first, on a table nobody else can see yet
+        await self._execute(
+            f'ALTER TABLE "{compacted}" ADD CONSTRAINT "{compacted}_pkey" PRIMARY KEY (collected_at, id)'
+        )
+        await self._execute(
+            f'CREATE INDEX "{compacted}_post_id_collected_at_idx" ON "{compacted}" (post_id, collected_at DESC)'
+        )
+        await self._add_bounds_check(compacted, partition.month, partition.end)
+
+        # The swap itself. DETACH ... CONCURRENTLY is not an option: it refuses
+        # parents with a default partition and can't share this transaction's
+        # lock on the month. Give up rather than queue reads behind the parent
+        # lock for long; the next run retries.
+        await self._execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+        await self._execute(f'ALTER TABLE {PARENT} DETACH PARTITION "{name}"')
+        await self._execute(f'DROP TABLE "{name}"')
+        await self._execute(f'ALTER TABLE "{compacted}" RENAME TO "{name}"')
+        await self._attach(name, partition.month, partition.end)
+        for suffix in ("pkey", "post_id_collected_at_idx"):
+            await self._execute(f'ALTER INDEX "{compacted}_{suffix}" RENAME TO "{name}_{suffix}"')
+        await self._execute(f"COMMENT ON TABLE \"{name}\" IS '{DOWNSAMPLED}'")
+        await self.db.commit()
+        logger.info("Downsampled post_metrics partition %s to daily snapshots", name)
+
+    async def drop_expired(self, before: datetime) -> List[str]:
+        """Drop every month that ended before the cutoff, plus stray default-partition rows."""
+        dropped = []
+        for partition in await self.partitions():
+            if partition.end <= before:
+                await self._execute(f'ALTER TABLE {PARENT} DETACH PARTITION "{partition.name}"')
+                await self._execute(f'DROP TABLE "{partition.name}"')
+                await self.db.commit()
+                dropped.append(partition.name)
+                logger.info("Dropped expired post_metrics partition %s", partition.name)
+
+        # Only out-of-range timestamps land here, so this stays small
+        await self.db.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE collected_at < :before"),
+            {"before": before},
+        )
+        await self.db.commit()
+        return dropped
+
+    async def prune_hourly_rollups(self, before: datetime) -> int:
+        """Delete hourly rollup buckets older than the cutoff; a primary key range scan."""
+        result = await self.db.execute(
+            delete(PostMetricsHourly)
+            .where(PostMetricsHourly.bucket_start < before)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def _add_bounds_check(self, name: str, start: datetime, end: datetime) -> None:
+        # A matching CHECK constraint lets ATTACH skip its validation scan
+        bounds = f"collected_at >= '{start.isoformat()}' AND collected_at < '{end.isoformat()}'"
+        await self._execute(f'ALTER TABLE "{name}" ADD CONSTRAINT {BOUNDS_CHECK} CHECK ({bounds})')
+
+    async def _attach(self, name: str, start: datetime, end: datetime) -> None:
+        """Attach a table that already carries its bounds check, then drop the check."""
+        await self._execute(
+            f'ALTER TABLE {PARENT} ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        await self._execute(f'ALTER TABLE "{name}" DROP CONSTRAINT {BOUNDS_CHECK}')
+
+    async def _execute(self, statement: str) -> None:
+        await self.db.execute(text(statement))
@@ -0,0 +1,278 @@
+"""
+Incrementally maintained engagement rollups, and the analytics reads built on them.
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+
+from sqlalchemy import String, bindparam, case, func, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.generated_content import GeneratedContent
+from app.models.metrics_rollup import MetricsRollupMixin, PostMetricsDaily, PostMetricsHourly
+from app.models.published_post import PublishedPost
+
+
+ROLLUPS: Tuple[Type[MetricsRollupMixin], ...] = (PostMetricsHourly, PostMetricsDaily)
+COUNTERS = ("likes", "comments", "shares", "saves", "impressions", "reach")
+HOURLY_MAX_WINDOW = timedelta(hours=48)
+
+_TIMEFRAME = re.compile(r"^(\d+)([hdw])$")
+_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_timeframe(timeframe: str) -> timedelta:
+    """Parse "24h", "7d" or "4w"; raises ValueError for anything else."""
+    match = _TIMEFRAME.match(timeframe.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid timeframe: {timeframe!r}")
+    window = timedelta(**{_UNITS[match.group(2)]: int(match.group(1))})
+    if window > timedelta(days=settings.ANALYTICS_MAX_TIMEFRAME_DAYS):
+        raise ValueError(f"Timeframe is longer than {settings.ANALYTICS_MAX_TIMEFRAME_DAYS} days")
+    return window
+
+
+def rollup_for(window: timedelta) -> Type[MetricsRollupMixin]:
+    """Hourly buckets for short windows, daily buckets otherwise."""
+    if window <= HOURLY_MAX_WINDOW:
+        return PostMetricsHourly
+    return PostMetricsDaily
+
+
+def bucket_start(collected_at: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its hour or day."""
+    if granularity == "hour":
+        return collected_at.replace(minute=0, second=0, microsecond=0)
+    return collected_at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def post_key_filter(platform_column, post_id_column, keys: Iterable[Tuple[str, str]]):
+    """
+    (platform, post_id) IN the given pairs, bound as two arrays, so a batch
+    of any size costs two parameters.
+    """
+    keys = list(keys)
+    pairs = select(
+        func.unnest(
+            bindparam("platforms", [platform for platform, _ in keys], type_=ARRAY(String)),
+            bindparam("post_ids", [post_id for _, post_id in keys], type_=ARRAY(String)),
+        ).table_valued("platform", "post_id").render_derived()
+    )
+    return tuple_(platform_column, post_id_column).in_(pairs)
+
+
+def _engagement(model):
+    return model.likes + model.comments + model.shares + model.saves
+
+
+class MetricsRollupService:
+    """
+    Folds post metrics snapshots into hourly and daily rollup tables.
+
+    Each batch is reduced in memory to the newest snapshot per post per
+    bucket, then upserted with one INSERT ... ON CONFLICT per table and
+    chunk, so the cost depends on the batch size, not on stored history.
+    Dashboard reads scan only the rollup buckets inside the requested
+    window.
+    """
+
+    def __init__(self, db: AsyncSession, batch_size: int = settings.METRICS_ROLLUP_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        # Content whose published posts received snapshots via apply(),
+        # for the caller to refresh cached performance after committing
+        self.content_ids: set = set()
+
+    async def apply(self, snapshots: Iterable[Any]) -> int:
+        """
+        Fold new snapshots (PostMetrics rows or mappings) into the rollups.
+
+        Runs inside the caller's transaction; the caller commits. Returns
+        the number of rollup rows written.
+        """
+        snapshots = [self._as_dict(snapshot) for snapshot in snapshots]
+        if not snapshots:
+            return 0
+        published = await self._published({(s["platform"], s["post_id"]) for s in snapshots})
+        self.content_ids.update(content_id for content_id, _ in published.values())
+
+        written = 0
+        for model in ROLLUPS:
+            rows = self._reduce(snapshots, model.granularity, published)
+            for start in range(0, len(rows), self.batch_size):
+                await self.db.execute(self._upsert(model, rows[start:start + self.batch_size]))
+            written += len(rows)
+        return written
+
+    @staticmethod
+    def _as_dict(snapshot: Any) -> Dict[str, Any]:
+        if isinstance(snapshot, Mapping):
+            return dict(snapshot)
+        return {field: getattr(snapshot, field) for field in ("platform", "post_id", "collected_at", "engagement_rate", *COUNTERS)}
+
+    async def _published(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Tuple[str, str]]:
+        """(platform, post_id) -> (content_id, content_type) for posts we published."""
+        result = await self.db.execute(
+            select(PublishedPost.platform, PublishedPost.post_id, GeneratedContent.id, GeneratedContent.content_type)
+            .join(GeneratedContent, GeneratedContent.id == PublishedPost.content_id)
+            .where(post_key_filter(PublishedPost.platform, PublishedPost.post_id, keys))
+        )
+        return {(row[0], row[1]): (row[2], row[3]) for row in result}
+
+    @staticmethod
+    def _reduce(
+        snapshots: List[Dict[str, Any]],
+        granularity: str,
+        published: Dict[Tuple[str, str], Tuple[str, str]],
+    ) -> List[Dict[str, Any]]:
+        """Newest snapshot per (bucket, platform, post), with the snapshot count."""
+        buckets: Dict[Tuple[datetime, str, str], Dict[str, Any]] = {}
+        for snapshot in snapshots:
+            collected_at = snapshot.get("collected_at") or datetime.utcnow()
+            key = (bucket_start(collected_at, granularity), snapshot["platform"], snapshot["post_id"])
+            current = buckets.get(key)
+            if current is not None and current["last_collected_at"] > collected_at:
+                current["snapshots"] += 1
+                continue
+            content_id, content_type = published.get(key[1:], (None, None))
+            buckets[key] = {
+                "bucket_start": key[0],
+                "platform": key[1],
+                "post_id": key[2],
+                "content_id": content_id,
+                "content_type": content_type,
+                **{counter: snapshot.get(counter) or 0 for counter in COUNTERS},
+                "engagement_rate": snapshot.get("engagement_rate") or 0.0,
+                "snapshots": current["snapshots"] + 1 if current else 1,
+                "last_collected_at": collected_at,
+            }
+        return list(buckets.values())
+
+    @staticmethod
+    def _upsert(model: Type[MetricsRollupMixin], rows: List[Dict[str, Any]]):
+        """Insert buckets; on conflict keep whichever side has the newer snapshot."""
+        stmt = insert(model).values(rows)
+        table, excluded = stmt.table.c, stmt.excluded
+        newer = excluded.last_collected_at >= table.last_collected_at
+
+        def latest(column: str):
+            return case((newer, excluded[column]), else_=table[column])
+
+        return stmt.on_conflict_do_update(
+            index_elements=[table.bucket_start, table.platform, table.post_id],
+            set_={
+                **{column: latest(column) for column in (*COUNTERS, "engagement_rate")},
+                "content_id": func.coalesce(excluded.content_id, table.content_id),
+                "content_type": func.coalesce(excluded.content_type, table.content_type),
+                "snapshots": table.snapshots + excluded.snapshots,
+                "last_collected_at": func.greatest(table.last_collected_at, excluded.last_collected_at),
+            },
+        )
+
+    async def dashboard(
+        self,
+        window: timedelta,
+        platform: Optional[str] = None,
+        content_type: Optional[str] = None,
+        top_limit: int = 5,
+    ) -> Dict[str, Any]:
+        """Totals, top content and per-bucket trends for the trailing window."""
+        model = rollup_for(window)
+        since = bucket_start(datetime.utcnow() - window, model.granularity)
+        latest = self._latest_per_post(model, since, platform, content_type)
+
+        totals = (await self.db.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(_engagement(latest.c)), 0),
+                func.coalesce(func.avg(latest.c.engagement_rate), 0.0),
+            ).select_from(latest)
+        )).one()
+
+        trends = await self.db.execute(
+            select(
+                model.bucket_start,
+                func.count(),
+                func.sum(_engagement(model)),
+                func.avg(model.engagement_rate),
+            )
+            .where(*self._window_clauses(model, since, platform, content_type))
+            .group_by(model.bucket_start)
+            .order_by(model.bucket_start)
+        )
+
+        return {
+            "timeframe_start": since.isoformat(),
+            "granularity": model.granularity,
+            "total_posts": totals[0],
+            "total_engagement": int(totals[1]),
+            "average_engagement_rate": float(totals[2]),
+            "top_performing_content": await self._top(latest, top_limit, "engagement_rate"),
+            "engagement_trends": [
+                {
+                    "bucket_start": row[0].isoformat(),
+                    "posts": row[1],
+                    "engagement": int(row[2] or 0),
+                    "average_engagement_rate": float(row[3] or 0.0),
+                }
+                for row in trends
+            ],
+        }
+
+    async def top_content(
+        self,
+        window: timedelta,
+        limit: int = 10,
+        sort: str = "engagement_rate",
+        platform: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Best performing posts in the window, by engagement rate or total engagement."""
+        model = rollup_for(window)
+        since = bucket_start(datetime.utcnow() - window, model.granularity)
+        return await self._top(self._latest_per_post(model, since, platform, content_type), limit, sort)
+
+    async def _top(self, latest, limit: int, sort: str) -> List[Dict[str, Any]]:
+        engagement = _engagement(latest.c).label("engagement")
+        primary = latest.c.engagement_rate if sort == "engagement_rate" else engagement
+        secondary = engagement if sort == "engagement_rate" else latest.c.engagement_rate
+        result = await self.db.execute(
+            select(latest, engagement)
+            .order_by(primary.desc(), secondary.desc(), latest.c.post_id)
+            .limit(limit)
+        )
+        return [
+            {
+                "content_id": row.content_id,
+                "content_type": row.content_type,
+                "platform": row.platform,
+                "post_id": row.post_id,
+                **{counter: row[counter] for counter in COUNTERS},
+                "engagement": int(row.engagement),
+                "engagement_rate": row.engagement_rate,
+                "last_collected_at": row.last_collected_at.isoformat(),
+            }
+            for row in result.mappings()
+        ]
+
+    def _latest_per_post(self, model, since: datetime, platform: Optional[str], content_type: Optional[str]):
+        """Each post's newest bucket in the window: its standing at the end of it."""
+        return (
+            select(model)
+            .where(*self._window_clauses(model, since, platform, content_type))
+            .order_by(model.platform, model.post_id, model.bucket_start.desc())
+            .distinct(model.platform, model.post_id)
+            .subquery("latest")
+        )
+
+    @staticmethod
+    def _window_clauses(model, since: datetime, platform: Optional[str], content_type: Optional[str]) -> List[Any]:
+        clauses = [model.bucket_start >= since]
+        if platform:
+            clauses.append(model.platform == platform)
+        if content_type:
+            clauses.append(model.content_type == content_type)
+        return clauses
@@ -0,0 +1,315 @@
+"""
+Compiled prompt templates with token accounting for content generation.
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from itertools import permutations
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# tiktoken needs its BPE files on first use; fall back to a character
+# estimate when they cannot be loaded (e.g. on an offline box)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+DEFAULT_HOOK_FORMULAS = [
+    "You're waiting for permission that will never come",
+    "This rule made sense in 1950. It's destroying you in 2025",
+    "Everyone does X, but here's why Y works better",
+    "If [system] can replace you, it's not your fault—it's the system you were trained for",
+]
+
+DEFAULT_TONE = "Direct, confident, slightly rebellious, empathetic"
+
+SYSTEM_PROMPT_TEMPLATE = """You are a content creator for Based Labs, generating {content_type} content.
+
+Brand Voice:
+- Provocative level: {provocative_level}/10
+- Challenge systems and structures, not individuals
+- {tone}
+- Focus on agency over permission, system inefficiencies, gatekeeping
+
+Content Requirements:
+- Clear value proposition for the reader
+- Specific next action or call-to-action
+- Connection to Based Labs philosophy (agency, systems, decentralization)
+
+Hook Formulas to Use:
+{hooks}
+"""
+
+LENGTH_GUIDANCE = {
+    "quote_minimal": "Keep under 100 characters. Focus on a single powerful insight.",
+    "long_form": "Keep between 100-800 characters. Explain a framework or concept.",
+}
+DEFAULT_LENGTH_GUIDANCE = "Create multi-slide content over 800 characters."
+
+PLATFORM_GUIDANCE = {
+    "instagram": "Instagram: lead with the hook, 50-300 characters, short punchy lines.",
+    "linkedin": "LinkedIn: 300-800 characters, explain the framework, end with a discussion question.",
+}
+
+VARIANTS_INSTRUCTIONS = """
+Write one variant per platform: {platforms}.
+Each variant must stand on its own and follow its platform guidance:
+{guidance}
+
+Respond with only a JSON object of the form:
+{{"variants": {{{example}}}}}
+"""
+
+USER_PROMPT_TEMPLATE = """Create content based on this trend opportunity:
+
+Title: {title}
+Description: {description}
+Source: {source}
+
+Focus on:
+- What system or rule is causing friction?
+- Who benefits from the current system?
+- How could individuals work around this?
+- What would a decentralized alternative look like?
+"""
+
+TRUNCATION_MARKER = " [...]"
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """A fully rendered prompt and its cached token count."""
+    content_type: str
+    text: str
+    token_count: int
+
+
+class TokenCounter:
+    """Counts and trims tokens for a model's encoding."""
+
+    def __init__(self, model: str = "gpt-4"):
+        self.model = model
+        self._encoding = self._load_encoding(model)
+
+    @staticmethod
+    def _load_encoding(model: str):
+        if not TIKTOKEN_AVAILABLE:
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # BPE download failed; use the character estimate
+            return None
+
+    def count(self, text: str) -> int:
+        """Return the number of tokens in text."""
+        if self._encoding is None:
+            return (len(text) + 3) // 4
+        return len(self._encoding.encode(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Trim text to at most max_tokens tokens, marking the cut."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+
+        marker_tokens = self.count(TRUNCATION_MARKER)
+        keep = max(max_tokens - marker_tokens, 0)
+        if self._encoding is None:
+            trimmed = text[:keep * 4].rsplit(" ", 1)[0]
+        else:
+            trimmed = self._encoding.decode(self._encoding.encode(text)[:keep])
+        return trimmed.rstrip() + TRUNCATION_MARKER
+
+
+class PromptLibrary:
+    """
+    Compiles system prompts once per content type and reloads them when
+    the brand voice steering file changes on disk.
+    """
+
+    def __init__(
+        self,
+        steering_dir: str = settings.PROMPT_STEERING_DIR,
+        provocative_level: int = settings.BRAND_PROVOCATIVE_LEVEL,
+        user_token_budget: int = settings.PROMPT_USER_TOKEN_BUDGET,
+        reload_interval: float = settings.PROMPT_RELOAD_INTERVAL_SECONDS,
+        model: str = settings.LLM_MODEL,
+    ):
+        self.voice_path = Path(steering_dir) / "based-labs-voice.md"
+        self.provocative_level = provocative_level
+        self.user_token_budget = user_token_budget
+        self.reload_interval = reload_interval
+        self.tokens = TokenCounter(model)
+
+        self.hook_formulas: List[str] = list(DEFAULT_HOOK_FORMULAS)
+        self.tone: str = DEFAULT_TONE
+
+        self._lock = threading.Lock()
+        self._compiled: Dict[str, CompiledPrompt] = {}
+        self._source_mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._user_overhead: Optional[int] = None
+
+        self._load_steering()
+
+    def system_prompt(self, content_type: str, platforms: Tuple[str, ...] = ()) -> CompiledPrompt:
+        """
+        Return the compiled system prompt for a content type.
+
+        One platform adds its guidance; several ask for a JSON object with
+        one variant per platform, so they can share a single completion.
+        """
+        self._maybe_reload()
+
+        key = f"{content_type}:{','.join(platforms)}"
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(key)
+                if compiled is None:
+                    compiled = self._compile(content_type, platforms)
+                    self._compiled[key] = compiled
+        return compiled
+
+    def user_prompt(self, title: str, description: str, source: str) -> str:
+        """Render the user prompt, trimming the description to the token budget."""
+        if self._user_overhead is None:
+            self._user_overhead = self.tokens.count(
+                USER_PROMPT_TEMPLATE.format(title="", description="", source="")
+            )
+
+        title = self.tokens.truncate(title or "", 64)
+        remaining = (
+            self.user_token_budget
+            - self._user_overhead
+            - self.tokens.count(title)
+            - self.tokens.count(source or "")
+        )
+        description = self.tokens.truncate(description or "", remaining)
+
+        return USER_PROMPT_TEMPLATE.format(
+            title=title,
+            description=description,
+            source=source or "",
+        )
+
+    def warm(self, content_types: Tuple[str, ...] = ("quote_minimal", "long_form", "carousel_series")):
+        """
+        Compile the prompts requests will look up, ahead of first use: each
+        content type for every platform alone, and for every ordering of
+        two or more platforms as a variants request. Also loads the token
+        encoder by measuring the user prompt's fixed overhead.
+        """
+        platform_keys: List[Tuple[str, ...]] = [
+            combination
+            for size in range(1, len(PLATFORM_GUIDANCE) + 1)
+            for combination in permutations(PLATFORM_GUIDANCE, size)
+        ]
+        for content_type in content_types:
+            for platforms in platform_keys:
+                self.system_prompt(content_type, platforms)
+        self.user_prompt("", "", "")
+
+    def _compile(self, content_type: str, platforms: Tuple[str, ...] = ()) -> CompiledPrompt:
+        hooks = "\n".join(f"- {hook}" for hook in self.hook_formulas)
+        text = SYSTEM_PROMPT_TEMPLATE.format(
+            content_type=content_type,
+            provocative_level=self.provocative_level,
+            tone=self.tone,
+            hooks=hooks,
+        )
+        text += "\n" + LENGTH_GUIDANCE.get(content_type, DEFAULT_LENGTH_GUIDANCE)
+
+        guidance = [PLATFORM_GUIDANCE[p] for p in platforms if p in PLATFORM_GUIDANCE]
+        if len(platforms) == 1:
+            text += "\n" + "\n".join(guidance)
+        elif len(platforms) > 1:
+            text += "\n" + VARIANTS_INSTRUCTIONS.format(
+                platforms=", ".join(platforms),
+                guidance="\n".join(f"- {line}" for line in guidance),
+                example=", ".join(f'"{p}": "..."' for p in platforms),
+            )
+        return CompiledPrompt(
+            content_type=content_type,
+            text=text,
+            token_count=self.tokens.count(text),
+        )
+
+    def _maybe_reload(self):
+        """Check the steering file mtime at most once per reload interval."""
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+
+        try:
+            mtime = os.stat(self.voice_path).st_mtime
+        except OSError:
+            mtime = None
+
+        if mtime != self._source_mtime:
+            with self._lock:
+                self._load_steering()
+                self._compiled.clear()
+
+    def _load_steering(self):
+        """Pull hook formulas and tone from the brand voice steering file."""
+        # Start from the defaults so sections removed from the file stop applying
+        self.hook_formulas = list(DEFAULT_HOOK_FORMULAS)
+        self.tone = DEFAULT_TONE
+
+        try:
+            self._source_mtime = os.stat(self.voice_path).st_mtime
+            source = self.voice_path.read_text(encoding="utf-8")
+        except OSError:
+            self._source_mtime = None
+            return
+
+        hooks = self._parse_section_bullets(source, "Hook Formulas")
+        if hooks:
+            self.hook_formulas = hooks
+
+        tone = re.search(r"^\*\*Tone\*\*:\s*(.+?)\.", source, re.MULTILINE)
+        if tone:
+            self.tone = tone.group(1).strip()
+
+    @staticmethod
+    def _parse_section_bullets(source: str, heading: str) -> List[str]:
+        """Return the quoted bullet items under a markdown heading."""
+        match = re.search(
+            rf"^#+\s*{re.escape(heading)}\s*$(.*?)(?=^#|\Z)",
+            source,
+            re.MULTILINE | re.DOTALL,
+        )
+        if not match:
+            return []
+
+        bullets = []
+        for line in match.group(1).splitlines():
+            line = line.strip()
+            if line.startswith("- "):
+                bullets.append(line[2:].strip().strip('"').rstrip("."))
+        return bullets
+
+
+_library: Optional[PromptLibrary] = None
+
+
+def get_prompt_library() -> PromptLibrary:
+    """Return the process-wide prompt library."""
+    global _library
+    if _library is None:
+        _library = PromptLibrary()
+    return _library
@@ -0,0 +1,328 @@
+"""
+Review queue with leased claims, so concurrent reviewers never get the same item.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, any_, bindparam, func, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.response_cache import CONTENT, REVIEW, invalidate
+from app.models.generated_content import GeneratedContent
+
+
+PENDING_STATUS = "generated"
+DECISIONS = ("approved", "rejected")
+STATUSES = (PENDING_STATUS, "approved", "rejected", "published")
+FILTER_FIELDS = ("status", "platform", "content_type", "trend_opportunity_id", "package_id")
+
+
+def pending_filter():
+    """
+    status = 'generated' with the value inlined, so prepared statements
+    still match the partial index predicate under generic plans.
+    """
+    return GeneratedContent.status == bindparam("pending_status", PENDING_STATUS, literal_execute=True)
+
+
+def _status_is(status: str):
+    """Status equality, inlined for the pending status so the partial index applies."""
+    return pending_filter() if status == PENDING_STATUS else GeneratedContent.status == status
+
+
+def _id_array(name: str, ids: List[str]):
+    """Bind ids as one uuid[] parameter, for id = ANY(:ids)."""
+    return bindparam(name, ids, type_=ARRAY(UUID(as_uuid=False)))
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk review action for one content id."""
+    id: str
+    updated: bool
+    status: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class ContentNotFoundError(Exception):
+    """Raised when the content being reviewed does not exist."""
+
+
+class ReviewConflictError(Exception):
+    """Raised when a review decision lost its claim or the item was already decided."""
+
+    def __init__(self, content_id: str, reason: str):
+        self.content_id = content_id
+        self.reason = reason
+        super().__init__(f"Content {content_id}: {reason}")
+
+
+class ReviewQueueService:
+    """
+    Claims batches of pending content for reviewers.
+
+    Claiming selects the oldest unclaimed rows with FOR UPDATE SKIP LOCKED
+    and stamps them with the reviewer and a lease expiry in the same
+    statement, so concurrent claims skip each other's rows instead of
+    blocking on them. Decisions are conditional updates that only apply
+    while the item is pending and not leased to someone else.
+    """
+
+    def __init__(self, db: AsyncSession, lease_seconds: int = settings.REVIEW_CLAIM_LEASE_SECONDS):
+        self.db = db
+        self.lease_seconds = lease_seconds
+
+    async def claim(self, reviewer: str, limit: int) -> List[GeneratedContent]:
+        """Claim up to limit pending items, renewing any the reviewer already holds."""
+        now = datetime.utcnow()
+        candidates = (
+            select(GeneratedContent.id)
+            .where(
+                pending_filter(),
+                or_(
+                    GeneratedContent.claim_expires_at.is_(None),
+                    GeneratedContent.claim_expires_at < now,
+                    GeneratedContent.claimed_by == reviewer,
+                ),
+            )
+            .order_by(GeneratedContent.created_at, GeneratedContent.id)
+            .limit(min(limit, settings.REVIEW_CLAIM_MAX_BATCH))
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(GeneratedContent)
+            .where(GeneratedContent.id.in_(candidates))
+            .values(claimed_by=reviewer, claim_expires_at=now + timedelta(seconds=self.lease_seconds))
+            .returning(GeneratedContent)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = list((await self.db.scalars(stmt)).all())
+        await self.db.commit()
+        return sorted(claimed, key=lambda content: (content.created_at, content.id))
+
+    async def release(self, reviewer: str, content_ids: Optional[List[str]] = None) -> int:
+        """Hand claimed items back to the queue; returns how many were released."""
+        stmt = update(GeneratedContent).where(
+            GeneratedContent.claimed_by == reviewer,
+            GeneratedContent.status == PENDING_STATUS,
+        )
+        if content_ids:
+            stmt = stmt.where(GeneratedContent.id.in_(content_ids))
+        result = await self.db.execute(
+            stmt.values(claimed_by=None, claim_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def decide(
+        self,
+        content_id: str,
+        status: str,
+        reviewer: Optional[str] = None,
+        feedback: Optional[str] = None,
+    ):
+        """
+        Approve or reject a pending item, recording reviewer and feedback.
+
+        Applies only if the item is still pending and its lease, if any, is
+        held by this reviewer or has expired. Raises ReviewConflictError
+        otherwise, and ContentNotFoundError for an unknown id.
+        """
+        if status not in DECISIONS:
+            raise ValueError(f"Unknown review decision: {status}")
+
+        now = datetime.utcnow()
+        result = await self.db.execute(
+            update(GeneratedContent)
+            .where(
+                GeneratedContent.id == content_id,
+                GeneratedContent.status == PENDING_STATUS,
+                self._lease_ok(reviewer, now),
+            )
+            .values(**self._decision_values(status, reviewer, feedback, now))
+            .returning(GeneratedContent.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar_one_or_none() is not None:
+            await self.db.commit()
+            await invalidate(CONTENT, REVIEW)
+            return
+        await self.db.rollback()
+
+        current = (await self.db.execute(
+            select(GeneratedContent.status, GeneratedContent.claimed_by)
+            .where(GeneratedContent.id == content_id)
+        )).one_or_none()
+        if current is None:
+            raise ContentNotFoundError(content_id)
+        raise ReviewConflictError(content_id, self._decision_conflict(current))
+
+    async def bulk_decide(
+        self,
+        status: str,
+        ids: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        reviewer: Optional[str] = None,
+        feedback: Optional[str] = None,
+    ) -> List[BulkResult]:
+        """
+        Approve or reject many items in one UPDATE ... RETURNING.
+
+        Same rules as decide(), applied per row; rows that don't qualify are
+        reported with a reason rather than failing the batch.
+        """
+        if status not in DECISIONS:
+            raise ValueError(f"Unknown review decision: {status}")
+        now = datetime.utcnow()
+        return await self._bulk_update(
+            ids,
+            filters,
+            conditions=[pending_filter(), self._lease_ok(reviewer, now)],
+            values=self._decision_values(status, reviewer, feedback, now),
+            explain=self._decision_conflict,
+        )
+
+    async def bulk_set_status(
+        self,
+        status: str,
+        ids: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        from_status: Optional[str] = None,
+        reviewer: Optional[str] = None,
+    ) -> List[BulkResult]:
+        """
+        Move many items to any status, e.g. requeue rejected content.
+
+        An administrative override: active claims are ignored and cleared.
+        With from_status, only rows currently in that status change.
+        """
+        if status not in STATUSES:
+            raise ValueError(f"Unknown content status: {status}")
+        now = datetime.utcnow()
+        conditions = [GeneratedContent.status != status]
+        if from_status:
+            conditions.append(_status_is(from_status))
+        values = {"status": status, "claimed_by": None, "claim_expires_at": None, "updated_at": now}
+        if status in DECISIONS:
+            values.update(reviewed_by=reviewer, reviewed_at=now)
+
+        def explain(row) -> str:
+            return f"already {row.status}" if row.status == status else f"status is {row.status}"
+
+        return await self._bulk_update(ids, filters, conditions, values, explain)
+
+    async def _bulk_update(
+        self,
+        ids: Optional[Sequence[str]],
+        filters: Optional[Dict[str, Any]],
+        conditions: List[Any],
+        values: Dict[str, Any],
+        explain: Callable[[Any], str],
+    ) -> List[BulkResult]:
+        if ids:
+            ids = list(dict.fromkeys(str(content_id) for content_id in ids))
+            target = GeneratedContent.id == any_(_id_array("ids", ids))
+        else:
+            # Filter mode: cap the batch and skip rows locked by in-flight decisions
+            target = GeneratedContent.id.in_(
+                select(GeneratedContent.id)
+                .where(*self._filter_clauses(filters or {}), *conditions)
+                .order_by(GeneratedContent.created_at, GeneratedContent.id)
+                .limit(settings.REVIEW_BULK_MAX_ROWS)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+
+        result = await self.db.execute(
+            update(GeneratedContent)
+            .where(target, *conditions)
+            .values(**values)
+            .returning(GeneratedContent.id, GeneratedContent.status)
+            .execution_options(synchronize_session=False)
+        )
+        updated = {row.id: row.status for row in result}
+
+        # Explain skipped ids; only costs a second statement when some were skipped
+        skipped = {}
+        missing = [content_id for content_id in ids or () if content_id not in updated]
+        if missing:
+            rows = await self.db.execute(
+                select(GeneratedContent.id, GeneratedContent.status, GeneratedContent.claimed_by)
+                .where(GeneratedContent.id == any_(_id_array("missing", missing)))
+            )
+            skipped = {row.id: row for row in rows}
+        await self.db.commit()
+        if updated:
+            await invalidate(CONTENT, REVIEW)
+
+        if not ids:
+            return [BulkResult(id=content_id, updated=True, status=status) for content_id, status in updated.items()]
+        results = []
+        for content_id in ids:
+            if content_id in updated:
+                results.append(BulkResult(id=content_id, updated=True, status=updated[content_id]))
+            elif content_id in skipped:
+                row = skipped[content_id]
+                results.append(BulkResult(id=content_id, updated=False, status=row.status, reason=explain(row)))
+            else:
+                results.append(BulkResult(id=content_id, updated=False, reason="not found"))
+        return results
+
+    @staticmethod
+    def _lease_ok(reviewer: Optional[str], now: datetime):
+        """Row is unclaimed, its lease expired, or it is leased to this reviewer."""
+        lease_ok = or_(
+            GeneratedContent.claim_expires_at.is_(None),
+            GeneratedContent.claim_expires_at < now,
+        )
+        if reviewer:
+            lease_ok = or_(
+                lease_ok,
+                and_(GeneratedContent.claimed_by == reviewer, GeneratedContent.claim_expires_at >= now),
+            )
+        return lease_ok
+
+    @staticmethod
+    def _decision_values(status: str, reviewer: Optional[str], feedback: Optional[str], now: datetime) -> Dict[str, Any]:
+        return {
+            "status": status,
+            "claimed_by": None,
+            "claim_expires_at": None,
+            "reviewed_by": reviewer,
+            "reviewed_at": now,
+            "review_feedback": feedback or None,
+            "updated_at": now,
+        }
+
+    @staticmethod
+    def _decision_conflict(row) -> str:
+        if row.status != PENDING_STATUS:
+            return f"already {row.status}"
+        return f"claimed by {row.claimed_by}" if row.claimed_by else "claim lost"
+
+    @staticmethod
+    def _filter_clauses(filters: Dict[str, Any]) -> List[Any]:
+        clauses = []
+        for field in FILTER_FIELDS:
+            if filters.get(field) is None:
+                continue
+            if field == "status":
+                clauses.append(_status_is(filters[field]))
+            else:
+                clauses.append(getattr(GeneratedContent, field) == filters[field])
+        if not clauses:
+            raise ValueError("Bulk updates need ids or at least one filter")
+        return clauses
+
+    async def pending_count(self) -> int:
+        """Number of items awaiting review, claimed or not."""
+        count = await self.db.scalar(
+            select(func.count()).select_from(GeneratedContent).where(pending_filter())
+        )
+        return count or 0
@@ -0,0 +1,160 @@
+"""
+Incremental trend ingestion: a persistent seen-set and per-source fetch state.
+"""
+
+import hashlib
+import re
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+SEEN_KEY = "trends:seen"
+STATE_KEY_PREFIX = "trends:source_state:"
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "ref", "ref_src", "mc_cid", "mc_eid"}
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so trivially different links to one story compare equal."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def item_keys(trend: Dict[str, Any]) -> List[str]:
+    """Return the hashed seen-set keys for a trend (canonical URL and title)."""
+    keys = []
+    url = canonicalize_url(trend.get("url") or "")
+    if url:
+        keys.append("u:" + hashlib.blake2b(url.encode("utf-8"), digest_size=8).hexdigest())
+    title = _NON_WORD_RE.sub(" ", (trend.get("title") or "").lower()).strip()
+    if title:
+        keys.append("t:" + hashlib.blake2b(title.encode("utf-8"), digest_size=8).hexdigest())
+    return keys
+
+
+class SeenSet:
+    """
+    Persistent set of trend keys already ingested, stored in a Redis sorted
+    set scored by first-seen time so entries older than the TTL expire.
+    """
+
+    def __init__(self, key: str = SEEN_KEY, ttl_days: int = settings.TREND_SEEN_TTL_DAYS):
+        self.key = key
+        self.ttl_seconds = ttl_days * 86400
+
+    async def filter_new(
+        self, trends: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], int, List[str]]:
+        """
+        Return (new trends, seen count, keys of the new trends).
+
+        A trend is seen if its canonical URL or normalized title was already
+        ingested. Nothing is marked here: pass the keys to mark_seen once the
+        run's opportunities are stored, so a failed run re-ingests them.
+        """
+        if not trends:
+            return [], 0, []
+
+        per_item = [item_keys(trend) for trend in trends]
+        all_keys = list(dict.fromkeys(key for keys in per_item for key in keys))
+        if not all_keys:
+            return list(trends), 0, []
+
+        scores = await get_redis().zmscore(self.key, all_keys)
+
+        seen_keys = {key for key, score in zip(all_keys, scores) if score is not None}
+        new_trends = []
+        batch_keys: Dict[str, None] = {}
+        for trend, keys in zip(trends, per_item):
+            # Also collapse repeats within this batch
+            if any(key in seen_keys or key in batch_keys for key in keys):
+                continue
+            batch_keys.update(dict.fromkeys(keys))
+            new_trends.append(trend)
+        return new_trends, len(trends) - len(new_trends), list(batch_keys)
+
+    async def mark_seen(self, keys: List[str]):
+        """Record keys as ingested and expire entries older than the TTL, in one round trip."""
+        if not keys:
+            return
+        now = time.time()
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.zadd(self.key, {key: now for key in keys}, nx=True)
+            pipe.zremrangebyscore(self.key, "-inf", now - self.ttl_seconds)
+            await pipe.execute()
+
+
+@dataclass
+class SourceState:
+    """Conditional-fetch state a source carries between runs."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    cursor: Optional[str] = None  # high-water mark, e.g. newest published_at seen
+    not_modified: bool = False  # set by the source when the upstream answered 304
+
+    def to_redis(self) -> Dict[str, str]:
+        return {
+            key: value
+            for key, value in asdict(self).items()
+            if key != "not_modified" and value is not None
+        }
+
+    @classmethod
+    def from_redis(cls, data: Dict[bytes, bytes]) -> "SourceState":
+        names = {f.name for f in fields(cls)} - {"not_modified"}
+        values: Dict[str, Any] = {
+            key.decode(): value.decode()
+            for key, value in data.items()
+            if key.decode() in names
+        }
+        return cls(**values)
+
+
+class SourceStateStore:
+    """Per-source ETag, Last-Modified and cursor, kept in Redis hashes."""
+
+    async def load(self, names: Iterable[str]) -> Dict[str, SourceState]:
+        names = list(names)
+        if not names:
+            return {}
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for name in names:
+                pipe.hgetall(STATE_KEY_PREFIX + name)
+            results = await pipe.execute()
+        return {name: SourceState.from_redis(data) for name, data in zip(names, results)}
+
+    async def save(self, states: Dict[str, SourceState]):
+        if not states:
+            return
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for name, state in states.items():
+                mapping = state.to_redis()
+                if mapping:
+                    pipe.hset(STATE_KEY_PREFIX + name, mapping=mapping)
+            await pipe.execute()
+
+
+def advance_cursor(state: SourceState, trends: List[Dict[str, Any]], field: str = "published_at"):
+    """Move the source's high-water mark to the newest item timestamp."""
+    stamps = [str(trend[field]) for trend in trends if trend.get(field)]
+    if stamps:
+        newest = max(stamps)
+        if state.cursor is None or newest > state.cursor:
+            state.cursor = newest
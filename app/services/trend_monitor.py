@@ -2,26 +2,93 @@
 Trend monitoring service for identifying content opportunities.
 """
 
-from typing import List, Dict, Any
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
 from abc import ABC, abstractmethod
 
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.response_cache import TRENDS, invalidate
 from app.models.trend_opportunity import TrendOpportunity
+from app.services.trend_scoring import TrendScoringEngine
+from app.services.trend_ingestion import SeenSet, SourceState, SourceStateStore, advance_cursor
+
+logger = logging.getLogger(__name__)
+
+# Redis key holding the id of the queued or running refresh task
+REFRESH_LOCK_KEY = "trends:refresh_task"
 
 
 class TrendSource(ABC):
     """Abstract base class for trend sources."""
     
+    # Overrides TREND_SOURCE_TIMEOUT_SECONDS for slow upstreams
+    timeout: Optional[float] = None
+    
+    # Assigned by the monitor before each fetch. Sources send its etag,
+    # last_modified and cursor upstream, update them from the response, and
+    # set not_modified (returning no items) when the feed is unchanged.
+    state: Optional[SourceState] = None
+    
+    @property
+    def name(self) -> str:
+        """Name used in fetch stats and logs."""
+        return type(self).__name__
+    
     @abstractmethod
     async def fetch_trends(self) -> List[Dict[str, Any]]:
         """Fetch trends from the source."""
         pass
 
 
+@dataclass
+class MonitorRun:
+    """Opportunities found by a monitoring run, and what to record once they're stored."""
+    opportunities: List[TrendOpportunity]
+    seen_keys: List[str] = field(default_factory=list)
+    source_states: Dict[str, SourceState] = field(default_factory=dict)
+
+
+@dataclass
+class SourceFetchStats:
+    """Timing and outcome of one source fetch in a monitoring run."""
+    source: str
+    duration_ms: float
+    items: int = 0
+    error: Optional[str] = None
+    timed_out: bool = False
+    not_modified: bool = False
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class TrendMonitorService:
     """Service for monitoring trends and identifying content opportunities."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        source_timeout: float = settings.TREND_SOURCE_TIMEOUT_SECONDS,
+        max_concurrency: int = settings.TREND_SOURCE_MAX_CONCURRENCY,
+        incremental: bool = settings.TREND_INCREMENTAL_INGESTION,
+        score_threshold: float = settings.TREND_SCORE_THRESHOLD,
+        top_k: int = settings.TREND_TOP_K,
+    ):
         self.sources: List[TrendSource] = []
+        self.source_timeout = source_timeout
+        self.max_concurrency = max_concurrency
+        self.seen_set = SeenSet() if incremental else None
+        self.state_store = SourceStateStore() if incremental else None
+        self.last_run_stats: List[SourceFetchStats] = []
+        self.last_run_summary: Dict[str, Any] = {}
+        self.score_threshold = score_threshold
+        self.top_k = top_k
         self.scoring_weights = {
             "brand_alignment": 0.4,
             "timeliness": 0.3,
@@ -33,35 +100,150 @@ class TrendMonitorService:
         """Add a trend source."""
         self.sources.append(source)
     
-    async def monitor_trends(self) -> List[TrendOpportunity]:
-        """Monitor all sources and return scored opportunities."""
-        all_trends = []
+    async def monitor_trends(self) -> MonitorRun:
+        """
+        Monitor all sources and return scored opportunities.
         
-        for source in self.sources:
-            trends = await source.fetch_trends()
-            all_trends.extend(trends)
+        With incremental ingestion, unchanged feeds are skipped via their
+        stored ETag/Last-Modified, and only items missing from the seen-set
+        are scored, so a run costs work proportional to what's new. The
+        seen-set and fetch state are not updated here: the returned run
+        carries them, for mark_ingested once the opportunities are stored.
+        """
+        await self._load_source_states()
+        all_trends = await self.fetch_all()
+        new_trends, seen_keys = await self._filter_new(all_trends)
         
-        # Score and filter trends
-        opportunities = []
-        for trend in all_trends:
-            score = self._score_trend(trend)
-            if score > 0.6:  # Minimum threshold
-                opportunity = self._create_opportunity(trend, score)
-                opportunities.append(opportunity)
+        self.last_run_summary = {
+            "fetched": len(all_trends),
+            "new": len(new_trends),
+            "seen": len(all_trends) - len(new_trends),
+            "new_ratio": len(new_trends) / len(all_trends) if all_trends else 0.0,
+        }
+        logger.info(
+            "Trend monitoring: %(new)d new / %(seen)d seen of %(fetched)d fetched",
+            self.last_run_summary,
+        )
         
-        # Sort by score and return top opportunities
-        opportunities.sort(key=lambda x: x.score, reverse=True)
-        return opportunities[:10]
+        # Score the whole batch at once and keep the top k above threshold
+        scores = self.scoring_engine().score(new_trends, population=all_trends)
+        top = TrendScoringEngine.select_top(scores, self.top_k, self.score_threshold)
+        return MonitorRun(
+            opportunities=[self._create_opportunity(new_trends[i], float(scores[i])) for i in top],
+            seen_keys=seen_keys,
+            source_states={
+                source.name: source.state
+                for source in self.sources
+                if source.state is not None
+            },
+        )
+    
+    def scoring_engine(self) -> TrendScoringEngine:
+        """Build the scoring engine for the current scoring_weights."""
+        return TrendScoringEngine(
+            self.scoring_weights,
+            half_life_hours=settings.TREND_TIMELINESS_HALF_LIFE_HOURS,
+        )
+    
+    async def refresh(self, db: AsyncSession) -> List[TrendOpportunity]:
+        """
+        Run monitoring, persist the opportunities found and invalidate cached trend reads.
+        
+        Items are marked seen and source cursors saved only after the commit,
+        so a failed commit or a crash re-ingests them on the next run.
+        """
+        run = await self.monitor_trends()
+        if run.opportunities:
+            db.add_all(run.opportunities)
+            await db.commit()
+            await invalidate(TRENDS)
+        await self.mark_ingested(run)
+        return run.opportunities
+    
+    async def fetch_all(self) -> List[Dict[str, Any]]:
+        """
+        Fetch every source concurrently and return the combined trends.
+        
+        Each source is bounded by its own timeout and at most max_concurrency
+        run at once, so a run takes as long as the slowest source rather than
+        the sum of all of them. Failed or timed-out sources are skipped and
+        recorded in last_run_stats.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        
+        async def fetch(source: TrendSource):
+            async with semaphore:
+                timeout = source.timeout or self.source_timeout
+                trends, error, timed_out = [], None, False
+                started = time.perf_counter()
+                try:
+                    trends = await asyncio.wait_for(source.fetch_trends(), timeout)
+                    if source.state is not None:
+                        advance_cursor(source.state, trends)
+                except asyncio.TimeoutError:
+                    error, timed_out = f"Timed out after {timeout:.1f}s", True
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                
+                return trends, SourceFetchStats(
+                    source=source.name,
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                    items=len(trends),
+                    error=error,
+                    timed_out=timed_out,
+                    not_modified=bool(source.state and source.state.not_modified),
+                )
+        
+        results = await asyncio.gather(*(fetch(source) for source in self.sources))
+        
+        all_trends = []
+        self.last_run_stats = []
+        for trends, stats in results:
+            if not stats.ok:
+                logger.warning("Trend source %s failed: %s", stats.source, stats.error)
+            all_trends.extend(trends)
+            self.last_run_stats.append(stats)
+        return all_trends
+    
+    async def _load_source_states(self):
+        """Hand each source its stored conditional-fetch state."""
+        states = {}
+        if self.state_store is not None:
+            try:
+                states = await self.state_store.load(source.name for source in self.sources)
+            except RedisError as e:
+                logger.warning("Could not load trend source state: %s", e)
+        for source in self.sources:
+            source.state = states.get(source.name) or SourceState()
+    
+    async def mark_ingested(self, run: MonitorRun):
+        """Record a stored run's items in the seen-set and persist its ETags and cursors."""
+        if self.seen_set is not None:
+            try:
+                await self.seen_set.mark_seen(run.seen_keys)
+            except RedisError as e:
+                logger.warning("Could not update trend seen-set: %s", e)
+        if self.state_store is not None:
+            try:
+                await self.state_store.save(run.source_states)
+            except RedisError as e:
+                logger.warning("Could not save trend source state: %s", e)
+    
+    async def _filter_new(self, trends: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Drop trends already ingested by an earlier run; also return the new ones' seen-set keys."""
+        if self.seen_set is None:
+            return trends, []
+        try:
+            new_trends, _, keys = await self.seen_set.filter_new(trends)
+        except RedisError as e:
+            # Better to re-score everything than to lose a run
+            logger.warning("Seen-set unavailable, processing all trends: %s", e)
+            return trends, []
+        return new_trends, keys
     
     def _score_trend(self, trend: Dict[str, Any]) -> float:
-        """Score a trend based on Based Labs criteria."""
-        # Placeholder scoring logic
-        # TODO: Implement actual scoring based on:
-        # - System friction points
-        # - Permission barriers
-        # - Gatekeeping mechanisms
-        # - Individual workarounds
-        return 0.7
+        """Score a single trend based on Based Labs criteria."""
+        return float(self.scoring_engine().score([trend])[0])
     
     def _create_opportunity(self, trend: Dict[str, Any], score: float) -> TrendOpportunity:
         """Create a TrendOpportunity from trend data."""
@@ -71,5 +253,5 @@ class TrendMonitorService:
             source=trend.get("source", ""),
             url=trend.get("url", ""),
             score=score,
-            metadata=trend,
+            trend_metadata=trend,
         )
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+NewsAPI and Reddit trend sources.
+
+Both go through the shared pooled HTTP client, so pages and runs reuse
+keep-alive connections and share each host's rate limiter. Pagination is an
+async generator per source; fetch_trends drains it.
+"""
+
+import time
+from abc import abstractmethod
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.http import HttpClient, get_http_client
+from app.services.trend_monitor import TrendSource
+
+
+class PaginatedTrendSource(TrendSource):
+    """
+    A source whose upstream is paged.
+
+    Subclasses implement pages(). The first page is sent with the stored
+    ETag/Last-Modified, and new validators are kept only once every page has
+    been read, so a run that fails halfway is retried in full next time.
+    """
+
+    def __init__(self):
+        self._validators: Dict[str, Optional[str]] = {}
+
+    @abstractmethod
+    def pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield one list of trends per upstream page."""
+
+    async def fetch_trends(self) -> List[Dict[str, Any]]:
+        self._validators = {}
+        trends = []
+        async for page in self.pages():
+            trends.extend(page)
+        if self.state is not None and self._validators:
+            self.state.etag = self._validators.get("etag") or self.state.etag
+            self.state.last_modified = self._validators.get("last_modified") or self.state.last_modified
+        return trends
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.state is not None:
+            if self.state.etag:
+                headers["If-None-Match"] = self.state.etag
+            if self.state.last_modified:
+                headers["If-Modified-Since"] = self.state.last_modified
+        return headers
+
+    def check_response(self, response: httpx.Response, first_page: bool) -> bool:
+        """Raise on errors; return False when the feed is unchanged (304)."""
+        if response.status_code == 304:
+            if self.state is not None:
+                self.state.not_modified = True
+            return False
+        response.raise_for_status()
+        if first_page:
+            self._validators = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+            }
+        return True
+
+
+class NewsAPISource(PaginatedTrendSource):
+    """Articles matching the brand query from NewsAPI /v2/everything, newest first."""
+
+    def __init__(
+        self,
+        api_key: str = settings.NEWS_API_KEY,
+        query: str = settings.NEWS_API_QUERY,
+        base_url: str = settings.NEWS_API_BASE_URL,
+        page_size: int = settings.NEWS_API_PAGE_SIZE,
+        max_pages: int = settings.NEWS_API_MAX_PAGES,
+    ):
+        super().__init__()
+        self.api_key = api_key
+        self.query = query
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+    async def pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        http = get_http_client()
+        params = {"q": self.query, "sortBy": "publishedAt", "language": "en", "pageSize": self.page_size}
+        if self.state is not None and self.state.cursor:
+            # Only articles published since the last run
+            params["from"] = self.state.cursor
+
+        for page in range(1, self.max_pages + 1):
+            headers = {"X-Api-Key": self.api_key}
+            if page == 1:
+                headers.update(self.conditional_headers())
+            response = await http.get(
+                f"{self.base_url}/v2/everything",
+                params={**params, "page": page},
+                headers=headers,
+            )
+            if not self.check_response(response, first_page=page == 1):
+                return
+
+            payload = response.json()
+            articles = payload.get("articles") or []
+            yield [self._to_trend(article) for article in articles if article.get("title")]
+            if len(articles) < self.page_size or page * self.page_size >= payload.get("totalResults", 0):
+                return
+
+    @staticmethod
+    def _to_trend(article: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "title": article.get("title") or "",
+            "description": article.get("description") or "",
+            "url": article.get("url") or "",
+            "source": f"newsapi/{(article.get('source') or {}).get('name') or 'unknown'}",
+            "published_at": article.get("publishedAt"),
+        }
+
+
+# Application-only OAuth tokens, keyed by client id, shared across runs
+_reddit_tokens: Dict[str, Tuple[str, float]] = {}
+
+
+class RedditSource(PaginatedTrendSource):
+    """Posts from a combined subreddit listing via the Reddit OAuth API."""
+
+    def __init__(
+        self,
+        client_id: str = settings.REDDIT_CLIENT_ID,
+        client_secret: str = settings.REDDIT_CLIENT_SECRET,
+        subreddits: Sequence[str] = tuple(settings.REDDIT_SUBREDDITS),
+        listing: str = "hot",
+        auth_url: str = settings.REDDIT_AUTH_URL,
+        base_url: str = settings.REDDIT_BASE_URL,
+        page_size: int = 100,
+        max_pages: int = settings.REDDIT_MAX_PAGES,
+    ):
+        super().__init__()
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.subreddits = list(subreddits)
+        self.listing = listing
+        self.auth_url = auth_url
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+    async def pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        http = get_http_client()
+        # One multi-subreddit listing instead of a request per subreddit
+        url = f"{self.base_url}/r/{'+'.join(self.subreddits)}/{self.listing}"
+        cursor = self.state.cursor if self.state is not None else None
+        after = None
+
+        for page in range(self.max_pages):
+            params = {"limit": self.page_size, "raw_json": 1}
+            if after:
+                params["after"] = after
+            headers = self.conditional_headers() if page == 0 else {}
+            response = await self._get(http, url, params, headers)
+            if not self.check_response(response, first_page=page == 0):
+                return
+
+            listing = response.json().get("data") or {}
+            posts = [
+                child["data"] for child in listing.get("children", [])
+                if child.get("kind") == "t3" and not child["data"].get("stickied")
+            ]
+            trends = [self._to_trend(post) for post in posts]
+            yield trends
+
+            after = listing.get("after")
+            if not after:
+                return
+            # "new" is time-ordered, so stop once a page reaches the last run's cursor
+            stamps = [trend["published_at"] for trend in trends if trend["published_at"]]
+            if self.listing == "new" and cursor and stamps and min(stamps) <= cursor:
+                return
+
+    async def _get(self, http: HttpClient, url: str, params: Dict[str, Any], headers: Dict[str, str]) -> httpx.Response:
+        token = await self._access_token(http)
+        response = await http.get(url, params=params, headers={**headers, "Authorization": f"Bearer {token}"})
+        if response.status_code == 401:
+            # Token revoked or expired early; fetch a new one and retry once
+            _reddit_tokens.pop(self.client_id, None)
+            token = await self._access_token(http)
+            response = await http.get(url, params=params, headers={**headers, "Authorization": f"Bearer {token}"})
+        return response
+
+    async def _access_token(self, http: HttpClient) -> str:
+        cached = _reddit_tokens.get(self.client_id)
+        if cached and cached[1] > time.time():
+            return cached[0]
+        response = await http.post(
+            self.auth_url,
+            auth=(self.client_id, self.client_secret),
+            data={"grant_type": "client_credentials"},
+        )
+        response.raise_for_status()
+        payload = response.json()
+        token = payload["access_token"]
+        # Refresh a minute before the upstream expiry
+        _reddit_tokens[self.client_id] = (token, time.time() + float(payload.get("expires_in", 3600)) - 60)
+        return token
+
+    @staticmethod
+    def _to_trend(post: Dict[str, Any]) -> Dict[str, Any]:
+        permalink = f"https://www.reddit.com{post.get('permalink', '')}"
+        created = post.get("created_utc")
+        return {
+            "title": post.get("title") or "",
+            "description": (post.get("selftext") or "")[:1000],
+            "url": permalink if post.get("is_self") else (post.get("url") or permalink),
+            "source": f"reddit/r/{post.get('subreddit', '')}",
+            "published_at": datetime.fromtimestamp(created, tz=timezone.utc).isoformat() if created else None,
+            "ups": post.get("ups") or 0,
+            "num_comments": post.get("num_comments") or 0,
+        }
+
+
+def configured_sources() -> List[TrendSource]:
+    """Return a source for each upstream that has credentials configured."""
+    sources: List[TrendSource] = []
+    if settings.NEWS_API_KEY:
+        sources.append(NewsAPISource())
+    if settings.REDDIT_CLIENT_ID and settings.REDDIT_CLIENT_SECRET:
+        sources.append(RedditSource())
+    return sources
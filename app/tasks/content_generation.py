@@ -1,23 +1,98 @@
 """
-Celery tasks for content generation.
+Celery tasks for content generation and image rendering.
+
+generate_content_task claims identified opportunities and fans them out as
+a chord of generate_batch_task calls, with finish_generation_task as the
+callback. Each batch enqueues generate_image_task for every row it stored.
 """
 
-from celery import current_app as celery_app
-from app.services.content_generator import ContentGeneratorService
-from app.services.image_generator import ImageGeneratorService
+import logging
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List
+
+from celery import chord, current_app as celery_app
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.response_cache import CONTENT, REVIEW, invalidate
+from app.core.task_loop import run_async
+from app.core.telemetry import record_pipeline
+from app.services.content_pipeline import ContentPipelineService
+
+logger = logging.getLogger(__name__)
 
 
 @celery_app.task
 def generate_content_task():
-    """Background task for content generation."""
-    # TODO: Implement automated content generation
-    print("Content generation task executed")
-    return "Content generation completed"
+    """Claim identified trend opportunities and generate their content in batches."""
+    return run_async(_dispatch_generation())
+
+
+async def _dispatch_generation() -> Dict[str, Any]:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        claimed = await ContentPipelineService(db).claim_opportunities(settings.PIPELINE_MAX_OPPORTUNITIES_PER_RUN)
+    await record_pipeline("claim", {"claimed": len(claimed)}, time.perf_counter() - started)
+    if not claimed:
+        return {"claimed": 0, "batches": 0}
+
+    size = settings.PIPELINE_GENERATION_BATCH_SIZE
+    batches = [claimed[start:start + size] for start in range(0, len(claimed), size)]
+    chord([generate_batch_task.s(batch) for batch in batches])(finish_generation_task.s())
+    logger.info("Claimed %d opportunities for generation in %d batches", len(claimed), len(batches))
+    return {"claimed": len(claimed), "batches": len(batches)}
+
+
+@celery_app.task
+def generate_batch_task(opportunity_ids: List[str]):
+    """Generate content for a batch of claimed opportunities and queue their renders."""
+    result = run_async(_generate_batch(opportunity_ids))
+    for content_id in result["content_ids"]:
+        generate_image_task.delay(content_id)
+    return result
+
+
+async def _generate_batch(opportunity_ids: List[str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        batch = await ContentPipelineService(db).generate_batch(opportunity_ids)
+    if batch.content_ids:
+        await invalidate(CONTENT, REVIEW)
+    result = asdict(batch)
+    await record_pipeline(
+        "generation",
+        {key: result[key] for key in ("generated", "duplicates", "skipped", "failed")},
+        time.perf_counter() - started,
+    )
+    return result
+
+
+@celery_app.task
+def finish_generation_task(results: List[Dict[str, Any]]):
+    """Chord callback: summarize the run's batches."""
+    summary = {
+        key: sum(result[key] for result in results)
+        for key in ("generated", "duplicates", "skipped", "failed")
+    }
+    summary["batches"] = len(results)
+    logger.info("Content generation run finished: %s", summary)
+    return summary
 
 
 @celery_app.task
 def generate_image_task(content_id: str):
-    """Background task for image generation."""
-    # TODO: Implement automated image generation
-    print(f"Image generation task executed for content {content_id}")
-    return f"Image generated for content {content_id}"
\ No newline at end of file
+    """Render a content row's image, unless it already has one."""
+    return run_async(_render_image(content_id))
+
+
+async def _render_image(content_id: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            outcome = await ContentPipelineService(db).render_image(content_id) or "missing"
+    except Exception:
+        await record_pipeline("render", {"failed": 1}, time.perf_counter() - started)
+        raise
+    await record_pipeline("render", {outcome: 1}, time.perf_counter() - started)
+    return {"content_id": content_id, "result": outcome}
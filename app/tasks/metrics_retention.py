@@ -0,0 +1,32 @@
+"""
+Celery tasks for post metrics retention.
+"""
+
+import logging
+from dataclasses import asdict
+from typing import Any, Dict
+
+from celery import current_app as celery_app
+
+from app.core.database import AsyncSessionLocal
+from app.core.task_loop import run_async
+from app.services.metrics_retention import MetricsRetentionService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def enforce_metrics_retention_task():
+    """Create upcoming metrics partitions, downsample old ones and drop expired ones."""
+    return run_async(_enforce_metrics_retention())
+
+
+async def _enforce_metrics_retention() -> Dict[str, Any]:
+    async with AsyncSessionLocal() as db:
+        summary = await MetricsRetentionService(db).run()
+
+    logger.info(
+        "Metrics retention: created %s, downsampled %s, dropped %s, pruned %d hourly rollups",
+        summary.created, summary.downsampled, summary.dropped, summary.hourly_rollups_pruned,
+    )
+    return asdict(summary)
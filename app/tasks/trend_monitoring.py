@@ -2,13 +2,71 @@
 Celery tasks for trend monitoring.
 """
 
+import logging
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
 from celery import current_app as celery_app
-from app.services.trend_monitor import TrendMonitorService
+from redis.exceptions import RedisError, WatchError
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis import get_redis
+from app.core.task_loop import run_async
+from app.core.telemetry import record_pipeline
+from app.services.trend_monitor import REFRESH_LOCK_KEY, TrendMonitorService
+from app.services.trend_sources import configured_sources
+from app.tasks.content_generation import generate_content_task
+
+logger = logging.getLogger(__name__)
 
 
 @celery_app.task
-def monitor_trends_task():
-    """Background task for trend monitoring."""
-    # TODO: Implement automated trend monitoring
-    print("Trend monitoring task executed")
-    return "Trend monitoring completed"
\ No newline at end of file
+def monitor_trends_task(lock_token: Optional[str] = None):
+    """
+    Monitor trend sources, persist new opportunities and queue their generation.
+
+    lock_token is the refresh lock value set by POST /trends/monitor; the
+    lock is released only if it still holds it, so a run that outlived the
+    lock's expiry cannot drop a newer run's lock. Scheduled runs pass none.
+    """
+    result = run_async(_monitor_trends(lock_token))
+    if result["opportunities"]:
+        generate_content_task.delay()
+    return result
+
+
+async def _monitor_trends(lock_token: Optional[str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    trend_service = TrendMonitorService()
+    for source in configured_sources():
+        trend_service.add_source(source)
+    try:
+        async with AsyncSessionLocal() as db:
+            opportunities = await trend_service.refresh(db)
+    finally:
+        if lock_token is not None:
+            await _release_refresh_lock(lock_token)
+
+    logger.info("Trend monitoring stored %d opportunities", len(opportunities))
+    await record_pipeline("monitor", {"stored": len(opportunities)}, time.perf_counter() - started)
+    return {
+        "opportunities": len(opportunities),
+        "ingestion": trend_service.last_run_summary,
+        "sources": [asdict(stats) for stats in trend_service.last_run_stats],
+    }
+
+
+async def _release_refresh_lock(token: str):
+    """Delete the refresh lock only while it still holds this run's token."""
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            await pipe.watch(REFRESH_LOCK_KEY)
+            if await pipe.get(REFRESH_LOCK_KEY) == token.encode():
+                pipe.multi()
+                pipe.delete(REFRESH_LOCK_KEY)
+                await pipe.execute()
+    except WatchError:
+        pass  # Expired and taken by a newer run in the meantime; it is theirs
+    except RedisError as e:
+        logger.warning("Could not release trend refresh lock: %s", e)
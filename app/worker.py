@@ -2,17 +2,54 @@
 Celery worker configuration for background tasks.
 """
 
+import time
+
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_init
 from app.core.config import settings
+from app.core.profiling import capture_name, finish_capture, should_profile_task, start_capture
+from app.core.telemetry import record_task_run
 
 # Create Celery app
 celery_app = Celery(
     "content_pipeline",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.tasks.trend_monitoring", "app.tasks.content_generation"]
+    include=["app.tasks.trend_monitoring", "app.tasks.content_generation", "app.tasks.metrics_retention"]
 )
 
+IO_QUEUE = settings.CELERY_IO_QUEUE
+RENDER_QUEUE = settings.CELERY_RENDER_QUEUE
+
+# LLM, HTTP and database work waits on the network; renders hold a core
+TASK_QUEUES = {
+    "app.tasks.trend_monitoring.monitor_trends_task": IO_QUEUE,
+    "app.tasks.content_generation.generate_content_task": IO_QUEUE,
+    "app.tasks.content_generation.generate_batch_task": IO_QUEUE,
+    "app.tasks.content_generation.finish_generation_task": IO_QUEUE,
+    "app.tasks.content_generation.generate_image_task": RENDER_QUEUE,
+    "app.tasks.metrics_retention.enforce_metrics_retention_task": IO_QUEUE,
+}
+
+QUEUE_TIME_LIMITS = {
+    IO_QUEUE: (settings.CELERY_IO_SOFT_TIME_LIMIT_SECONDS, settings.CELERY_IO_TIME_LIMIT_SECONDS),
+    RENDER_QUEUE: (settings.CELERY_RENDER_SOFT_TIME_LIMIT_SECONDS, settings.CELERY_RENDER_TIME_LIMIT_SECONDS),
+}
+
+QUEUE_PREFETCH = {
+    IO_QUEUE: settings.CELERY_IO_PREFETCH_MULTIPLIER,
+    RENDER_QUEUE: settings.CELERY_RENDER_PREFETCH_MULTIPLIER,
+}
+
+
+def _task_annotations():
+    annotations = {}
+    for name, queue in TASK_QUEUES.items():
+        soft_limit, hard_limit = QUEUE_TIME_LIMITS[queue]
+        annotations[name] = {"soft_time_limit": soft_limit, "time_limit": hard_limit}
+    return annotations
+
+
 # Configure Celery
 celery_app.conf.update(
     task_serializer="json",
@@ -20,6 +57,13 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_default_queue=IO_QUEUE,
+    task_routes={name: {"queue": queue} for name, queue in TASK_QUEUES.items()},
+    task_annotations=_task_annotations(),
+    # Every task is idempotent, so redeliver rather than lose work to a crashed worker
+    task_acks_late=settings.CELERY_ACKS_LATE,
+    task_reject_on_worker_lost=settings.CELERY_ACKS_LATE,
+    worker_prefetch_multiplier=QUEUE_PREFETCH.get(settings.CELERY_WORKER_QUEUE, settings.CELERY_IO_PREFETCH_MULTIPLIER),
     beat_schedule={
         "monitor-trends": {
             "task": "app.tasks.trend_monitoring.monitor_trends_task",
@@ -27,7 +71,50 @@ celery_app.conf.update(
         },
         "generate-content": {
             "task": "app.tasks.content_generation.generate_content_task", 
+            # Monitoring queues generation itself; this picks up failed or stale claims
             "schedule": 7200.0,  # Run every 2 hours
         },
+        "enforce-metrics-retention": {
+            "task": "app.tasks.metrics_retention.enforce_metrics_retention_task",
+            "schedule": 86400.0,  # Run daily
+        },
     },
-)
\ No newline at end of file
+)
+
+
+@worker_process_init.connect
+def warm_worker_process(**kwargs):
+    """Load fonts, templates, prompts and indexes once per worker process."""
+    from app.core.startup import warm_sync_caches
+    warm_sync_caches()
+
+
+@worker_init.connect
+def warm_threaded_worker(sender=None, **kwargs):
+    """Threads and solo pools run tasks in the main process, so never see worker_process_init."""
+    if "prefork" not in getattr(sender.pool_cls, "__module__", ""):
+        warm_worker_process()
+
+
+_task_started = {}
+_task_samplers = {}
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    if should_profile_task():
+        sampler = start_capture()
+        if sampler is not None:
+            _task_samplers[task_id] = sampler
+
+
+@task_postrun.connect
+def record_task_timing(task_id=None, task=None, state=None, **kwargs):
+    """Add the run time to the histogram served by the API's /metrics."""
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        record_task_run(task.name, state or "UNKNOWN", time.perf_counter() - started)
+    sampler = _task_samplers.pop(task_id, None)
+    if sampler is not None:
+        finish_capture(sampler, capture_name("task", task.name))
@@ -0,0 +1,121 @@
+"""
+Offline throughput benchmark for the trend -> content -> image pipeline.
+
+Runs synthetic trend opportunities through ContentGeneratorService backed by
+the fake LLM provider, then renders each result with the image generator, and
+reports per-stage throughput and latency percentiles.
+
+Usage:
+    python scripts/benchmark_pipeline.py --items 200 --concurrency 20 --latency-ms 800
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.trend_opportunity import TrendOpportunity
+from app.services.content_generator import ContentGeneratorService
+from app.services.image_generator import BasedLabsImageGenerator
+from app.services.llm_providers import FakeLLMProvider, LLMProviderError
+
+
+def _synthetic_opportunities(count: int) -> List[TrendOpportunity]:
+    lengths = [60, 400, 1200]
+    return [
+        TrendOpportunity(
+            id=f"bench-{index}",
+            title=f"Credential gatekeeping story #{index}",
+            description="Licensing boards keep adding requirements. " * (lengths[index % 3] // 44 + 1),
+            source="benchmark",
+            score=0.7,
+        )
+        for index in range(count)
+    ]
+
+
+def _report(stage: str, durations: List[float], wall: float, failures: int = 0):
+    if not durations:
+        print(f"{stage:<10} no successful items ({failures} failed)")
+        return
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{stage:<10} {len(durations) / wall:8.1f} items/s  "
+        f"p50 {statistics.median(ordered) * 1000:7.1f} ms  "
+        f"p95 {p95 * 1000:7.1f} ms  "
+        f"wall {wall:6.2f} s  failed {failures}"
+    )
+
+
+async def run(args: argparse.Namespace):
+    provider = FakeLLMProvider(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    generator = ContentGeneratorService(provider=provider)
+    opportunities = _synthetic_opportunities(args.items)
+
+    # Stage 1: text generation, bounded concurrency
+    semaphore = asyncio.Semaphore(args.concurrency)
+    text_durations: List[float] = []
+    contents = []
+    failures = 0
+
+    async def generate(opportunity: TrendOpportunity):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                content = await generator.generate_content(opportunity)
+            except LLMProviderError:
+                failures += 1
+                return
+            text_durations.append(time.perf_counter() - started)
+            contents.append(content)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(generate(opportunity) for opportunity in opportunities))
+    _report("content", text_durations, time.perf_counter() - started, failures)
+
+    # Stage 2: CPU-bound rendering in worker threads
+    renderer = BasedLabsImageGenerator()
+    image_durations: List[float] = []
+
+    def render(content):
+        render_started = time.perf_counter()
+        renderer.generate_post(
+            {"main_text": content.text, "type": content.content_type, "platform": content.platform},
+            renderer._map_content_type_to_template(content.content_type),
+        )
+        image_durations.append(time.perf_counter() - render_started)
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.render_workers) as pool:
+        await asyncio.gather(*(loop.run_in_executor(pool, render, content) for content in contents))
+    _report("image", image_durations, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--render-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter-ms", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
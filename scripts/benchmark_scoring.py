@@ -0,0 +1,112 @@
+"""
+Microbenchmark for scoring trend batches.
+
+Compares brand alignment computed per text with tokenize() and a Counter
+(the previous path) against BrandIndex.score_batch, which tokenizes the
+whole batch with array operations, and times a full TrendScoringEngine
+pass. Texts are synthetic: a 10-word title and a 58-word description drawn
+from the brand docs mixed with common and filler words.
+
+Usage:
+    python scripts/benchmark_scoring.py --items 1000 30000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.brand_index import BrandIndex, get_brand_index, tokenize
+from app.services.trend_scoring import TrendScoringEngine
+
+COMMON_WORDS = "the a of and to in is for on with that this it as are be by from".split()
+WEIGHTS = {"brand_alignment": 0.4, "timeliness": 0.3, "engagement_potential": 0.2, "uniqueness": 0.1}
+
+
+def _synthetic_trends(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    brand_words = " ".join(path.read_text(encoding="utf-8") for path in Path(settings.BRAND_DOCS_DIR).glob("*.md")).split()
+    pool = brand_words + COMMON_WORDS * 200 + [f"filler{index}" for index in range(20000)]
+    return [
+        {
+            "title": " ".join(rng.choices(pool, k=10)),
+            "description": " ".join(rng.choices(pool, k=58)),
+            "published_at": f"2026-10-{rng.randint(1, 19):02d}T12:00:00Z",
+            "ups": rng.randint(0, 5000),
+            "num_comments": rng.randint(0, 500),
+        }
+        for _ in range(count)
+    ]
+
+
+def previous_brand_scores(index: BrandIndex, texts: Sequence[str]) -> np.ndarray:
+    doc_ids: List[int] = []
+    term_ids: List[int] = []
+    counts: List[int] = []
+    oov_norm_sq = np.zeros(len(texts))
+    for doc, text in enumerate(texts):
+        oov = 0
+        for token, count in Counter(tokenize(text)).items():
+            term = index.vocab.get(token)
+            if term is None:
+                oov += count * count
+            else:
+                doc_ids.append(doc)
+                term_ids.append(term)
+                counts.append(count)
+        oov_norm_sq[doc] = oov * index.default_idf ** 2
+    rows, terms = np.asarray(doc_ids, dtype=np.int64), np.asarray(term_ids, dtype=np.int64)
+    weights = np.asarray(counts, dtype=np.float64) * index.idf[terms]
+    dots = np.bincount(rows, weights=weights * index.profile[terms], minlength=len(texts))
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(texts)) + oov_norm_sq)
+    cosine = np.divide(dots, norms, out=np.zeros(len(texts)), where=norms > 0)
+    return np.clip(cosine / index.calibration, 0.0, 1.0)
+
+
+def _time(run: Callable[[], Any], repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 30000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    index = get_brand_index()
+    if index is None:
+        sys.exit(f"No brand documents in {settings.BRAND_DOCS_DIR}")
+    engine = TrendScoringEngine(WEIGHTS, brand_index=index)
+
+    for count in args.items:
+        trends = _synthetic_trends(count)
+        texts = [f"{t['title']} {t['description']}".lower() for t in trends]
+        # The batch tokenizer must reproduce the per-text scores
+        assert np.allclose(index.score_batch(texts), previous_brand_scores(index, texts)), "brand scores differ"
+        runs = {
+            "brand, per text": lambda: previous_brand_scores(index, texts),
+            "brand, batch": lambda: index.score_batch(texts),
+            "engine.score": lambda: engine.score(trends),
+        }
+        for name, run in runs.items():
+            median = _time(run, args.repeat)
+            print(f"{count:>6} items  {name:<16} {median * 1000:8.1f} ms  {count / median:10.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
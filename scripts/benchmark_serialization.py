@@ -0,0 +1,112 @@
+"""
+Microbenchmark for serializing ContentResponse lists.
+
+Compares the previous path (from_orm per row, then FastAPI's response_model
+re-validation, jsonable_encoder and json.dumps) with one TypeAdapter
+validation over the rows encoded by orjson, and with encoding trusted rows
+without validation. Rows are in-memory GeneratedContent objects, so no
+database is needed.
+
+Usage:
+    python scripts/benchmark_serialization.py --rows 1000 10000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import ORJSONResponse, model_list_response
+from app.models.generated_content import GeneratedContent
+from app.schemas.content import ContentResponse
+
+RESPONSE_FIELD = create_response_field(name="Response_get_review_queue", type_=List[ContentResponse])
+FIELDS = tuple(ContentResponse.model_fields)
+LOOP = asyncio.new_event_loop()
+
+
+def _synthetic_rows(count: int) -> List[GeneratedContent]:
+    now = datetime(2024, 6, 1, 12, 0, 0, 123456)
+    return [
+        GeneratedContent(
+            id=str(uuid4()),
+            trend_opportunity_id=str(uuid4()),
+            content_type=("hook", "quote", "article")[index % 3],
+            text="Licensing boards keep adding requirements. " * (index % 5 + 1),
+            platform=("instagram", "linkedin")[index % 2],
+            status="pending_review",
+            package_id=str(uuid4()) if index % 2 else None,
+            claimed_by="reviewer-1" if index % 4 == 0 else None,
+            claim_expires_at=now + timedelta(minutes=15) if index % 4 == 0 else None,
+            created_at=now - timedelta(seconds=index),
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+
+
+def previous_path(rows: List[GeneratedContent]) -> bytes:
+    content = [ContentResponse.from_orm(row) for row in rows]
+    encoded = LOOP.run_until_complete(serialize_response(field=RESPONSE_FIELD, response_content=content, is_coroutine=True))
+    return JSONResponse(encoded).body
+
+
+def adapter_path(rows: List[GeneratedContent]) -> bytes:
+    return model_list_response(ContentResponse, rows).body
+
+
+def trusted_path(rows: List[GeneratedContent]) -> bytes:
+    return ORJSONResponse([{field: getattr(row, field) for field in FIELDS} for row in rows]).body
+
+
+PATHS = {
+    "previous": previous_path,
+    "typeadapter+orjson": adapter_path,
+    "trusted+orjson": trusted_path,
+}
+
+
+def _time(path: Callable[[List[GeneratedContent]], bytes], rows: List[GeneratedContent], repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        path(rows)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for count in args.rows:
+        rows = _synthetic_rows(count)
+        # The fast paths must produce the same document as the previous one
+        expected = json.loads(previous_path(rows))
+        baseline = None
+        for name, path in PATHS.items():
+            assert json.loads(path(rows)) == expected, f"{name} output differs"
+            median = _time(path, rows, args.repeat)
+            baseline = baseline or median
+            print(
+                f"{count:>6} rows  {name:<20} {median * 1000:8.1f} ms  "
+                f"{count / median:10.0f} rows/s  {baseline / median:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
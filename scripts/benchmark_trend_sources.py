@@ -0,0 +1,77 @@
+"""
+Offline load test for the NewsAPI and Reddit trend sources.
+
+Points both sources at the local fake server and runs repeated monitoring
+fetches through the shared HTTP client, reporting run latency and how many
+TCP connections were opened for the requests made.
+
+Usage:
+    python scripts/benchmark_trend_sources.py --runs 20 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.http import close_http_client
+from app.services.trend_ingestion import SourceState
+from app.services.trend_monitor import TrendMonitorService
+from app.services.trend_sources import NewsAPISource, RedditSource
+from scripts.fake_trend_server import FakeTrendServer
+
+
+async def run(args, server: FakeTrendServer):
+    monitor = TrendMonitorService(incremental=False)
+    monitor.add_source(NewsAPISource(api_key="bench", base_url=server.base_url, max_pages=args.pages))
+    monitor.add_source(RedditSource(
+        client_id="bench",
+        client_secret="bench",
+        auth_url=f"{server.base_url}/api/v1/access_token",
+        base_url=server.base_url,
+        max_pages=args.pages,
+    ))
+
+    durations, items = [], 0
+    for _ in range(args.runs):
+        for source in monitor.sources:
+            # Without --conditional, start clean so every page is fetched rather than 304'd
+            if not args.conditional or source.state is None:
+                source.state = SourceState()
+            source.state.not_modified = False
+        started = time.perf_counter()
+        trends = await monitor.fetch_all()
+        durations.append((time.perf_counter() - started) * 1000)
+        items += len(trends)
+        failed = [stats for stats in monitor.last_run_stats if not stats.ok]
+        if failed:
+            print("  failures:", ", ".join(f"{s.source}: {s.error}" for s in failed))
+    await close_http_client()
+    return durations, items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test trend sources against a local fake server")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--conditional", action="store_true", help="Keep ETags between runs")
+    args = parser.parse_args()
+
+    with FakeTrendServer(latency_ms=args.latency_ms) as server:
+        durations, items = asyncio.run(run(args, server))
+        stats = server.stats()
+
+    durations.sort()
+    print(f"Runs: {args.runs}  items: {items}  requests: {stats['requests']}  "
+          f"connections: {stats['connections']}  304s: {stats['not_modified']}")
+    print(f"Run latency ms: p50={statistics.median(durations):.1f} "
+          f"p95={durations[int(0.95 * (len(durations) - 1))]:.1f} max={durations[-1]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Local stand-in for the NewsAPI and Reddit endpoints the trend sources call.
+
+Serves paged, deterministic data with ETags, Reddit-style rate limit headers
+and optional latency, and counts requests and TCP connections so connection
+reuse can be checked. Used by scripts/benchmark_trend_sources.py.
+
+Usage:
+    python scripts/fake_trend_server.py --port 8900 --latency-ms 50
+"""
+
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+TOPICS = [
+    "Licensing board blocks self-taught developers",
+    "New credential requirement for freelance designers",
+    "City permit backlog hits record high",
+    "Startup founders skip degrees and hire on portfolios",
+    "Regulators add another approval step for small clinics",
+    "Why gatekeeping in publishing is collapsing",
+    "Bureaucracy slows down housing construction again",
+    "Creators route around platform middlemen",
+]
+
+
+class FakeTrendServer:
+    """Threaded HTTP server faking NewsAPI /v2/everything and Reddit listings."""
+
+    def __init__(
+        self,
+        port: int = 0,
+        items: int = 250,
+        latency_ms: float = 0.0,
+        quota: Optional[int] = None,
+        quota_window_seconds: float = 60.0,
+    ):
+        self.items = items
+        self.latency = latency_ms / 1000
+        self.quota = quota
+        self.quota_window = quota_window_seconds
+        self.version = 1  # bump to change every ETag
+        self.requests = 0
+        self.connections = 0
+        self.not_modified = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_used = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeTrendServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeTrendServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "not_modified": self.not_modified,
+            "rate_limited": self.rate_limited,
+        }
+
+    # Data
+
+    def articles(self) -> List[Dict[str, Any]]:
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        return [
+            {
+                "source": {"id": None, "name": f"Outlet {i % 7}"},
+                "title": f"{TOPICS[i % len(TOPICS)]} ({i})",
+                "description": f"Story {i} about permission barriers and who gets to decide.",
+                "url": f"https://news.example.com/story/{i}?utm_source=feed",
+                "publishedAt": (now - timedelta(minutes=10 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+            for i in range(self.items)
+        ]
+
+    def posts(self) -> List[Dict[str, Any]]:
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+        return [
+            {
+                "id": f"p{i}",
+                "name": f"t3_p{i}",
+                "title": f"{TOPICS[(i + 3) % len(TOPICS)]} [{i}]",
+                "selftext": "Anyone else tired of needing permission for everything?",
+                "permalink": f"/r/Entrepreneur/comments/p{i}/",
+                "url": f"https://www.reddit.com/r/Entrepreneur/comments/p{i}/",
+                "is_self": True,
+                "subreddit": "Entrepreneur",
+                "created_utc": now - 300 * i,
+                "ups": 1000 - i,
+                "num_comments": i % 50,
+                "stickied": i == 0,
+            }
+            for i in range(self.items)
+        ]
+
+    def take_quota(self) -> Optional[Dict[str, str]]:
+        """Count a request against the quota; return rate limit headers."""
+        if self.quota is None:
+            return {}
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.quota_window:
+                self._window_start, self._window_used = now, 0
+            reset = self.quota_window - (now - self._window_start)
+            if self._window_used >= self.quota:
+                self.rate_limited += 1
+                return None
+            self._window_used += 1
+            return {
+                "X-Ratelimit-Used": str(self._window_used),
+                "X-Ratelimit-Remaining": str(self.quota - self._window_used),
+                "X-Ratelimit-Reset": str(int(reset)),
+            }
+
+
+def _handler_for(server: FakeTrendServer):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            super().setup()
+            with server._lock:
+                server.connections += 1
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self._dispatch()
+
+        def do_POST(self):
+            self._dispatch()
+
+        def _dispatch(self):
+            with server._lock:
+                server.requests += 1
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            if server.latency:
+                time.sleep(server.latency)
+
+            parts = urlsplit(self.path)
+            query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+            if parts.path == "/api/v1/access_token" and self.command == "POST":
+                return self._json({"access_token": "fake-token", "token_type": "bearer", "expires_in": 3600})
+            if parts.path == "/v2/everything":
+                return self._everything(query)
+            if parts.path.startswith("/r/"):
+                return self._listing(query)
+            self._json({"error": "not found"}, status=404)
+
+        def _everything(self, query: Dict[str, str]):
+            if not self.headers.get("X-Api-Key"):
+                return self._json({"status": "error", "code": "apiKeyMissing"}, status=401)
+            articles = server.articles()
+            if query.get("from"):
+                articles = [a for a in articles if a["publishedAt"] >= query["from"]]
+            page, size = int(query.get("page", 1)), int(query.get("pageSize", 100))
+            body = {
+                "status": "ok",
+                "totalResults": len(articles),
+                "articles": articles[(page - 1) * size:page * size],
+            }
+            self._conditional(body, f'"news-{server.version}-{query.get("from", "")}"')
+
+        def _listing(self, query: Dict[str, str]):
+            if not (self.headers.get("Authorization") or "").startswith("Bearer "):
+                return self._json({"message": "Unauthorized", "error": 401}, status=401)
+            posts = server.posts()
+            start = 0
+            if query.get("after"):
+                start = next((i + 1 for i, p in enumerate(posts) if p["name"] == query["after"]), len(posts))
+            limit = int(query.get("limit", 25))
+            window = posts[start:start + limit]
+            after = window[-1]["name"] if start + limit < len(posts) else None
+            body = {"kind": "Listing", "data": {
+                "after": after,
+                "children": [{"kind": "t3", "data": post} for post in window],
+            }}
+            self._conditional(body, f'"reddit-{server.version}"')
+
+        def _conditional(self, body: Dict[str, Any], etag: str):
+            quota_headers = server.take_quota()
+            if quota_headers is None:
+                return self._json({"error": 429}, status=429, headers={"Retry-After": "1"})
+            if self.headers.get("If-None-Match") == etag:
+                with server._lock:
+                    server.not_modified += 1
+                return self._send(304, b"", {**quota_headers, "ETag": etag})
+            self._json(body, headers={**quota_headers, "ETag": etag})
+
+        def _json(self, body: Dict[str, Any], status: int = 200, headers: Optional[Dict[str, str]] = None):
+            self._send(status, json.dumps(body).encode("utf-8"), {"Content-Type": "application/json", **(headers or {})})
+
+        def _send(self, status: int, payload: bytes, headers: Dict[str, str]):
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            if payload:
+                self.wfile.write(payload)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake NewsAPI/Reddit server for offline trend source testing")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--items", type=int, default=250)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--quota", type=int, default=None, help="Requests per 60s window before 429s")
+    args = parser.parse_args()
+
+    server = FakeTrendServer(port=args.port, items=args.items, latency_ms=args.latency_ms, quota=args.quota)
+    print(f"Fake trend server on {server.base_url}")
+    print(f"  NEWS_API_BASE_URL={server.base_url}")
+    print(f"  REDDIT_AUTH_URL={server.base_url}/api/v1/access_token REDDIT_BASE_URL={server.base_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()